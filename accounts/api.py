@@ -0,0 +1,20 @@
+"""
+API клиентов: /api/customers/ (только чтение)
+
+Менеджер видит всех клиентов, клиент - свой профиль, остальные - никого
+(как customer_list и профиль клиента на сайте).
+"""
+from jewelry_crm.api import ReadOnlyApiViewSet
+from .models import Customer
+from .serializers import CustomerSerializer
+
+
+class CustomerViewSet(ReadOnlyApiViewSet):
+    serializer_class = CustomerSerializer
+
+    def scoped_queryset(self, user):
+        if user.role == 'manager':
+            return Customer.objects.all()
+        if user.role == 'client':
+            return Customer.objects.filter(user=user)
+        return Customer.objects.none()
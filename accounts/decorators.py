@@ -7,27 +7,56 @@ from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction
+
 
 # ========================================
 # ЧАСТЬ 1: ДЕКОРАТОРЫ (для функций-views)
 # ========================================
 
+async def aload_user(request):
+    """
+    Пользователь запроса для async view. request.auser() загружает его без
+    блокировки цикла событий; результат подставляется в request.user, чтобы
+    шаблоны и синхронный код не обращались к БД повторно.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
 def role_required(*roles):
     """
     Декоратор для проверки роли пользователя
     Использование: @role_required('client', 'manager')
+    Подходит и для обычных, и для async views
     """
+    def denied(request, user):
+        if not user.is_authenticated:
+            messages.error(request, 'Необходимо войти в систему.')
+            return redirect('login')
+
+        if user.role not in roles:
+            messages.error(request, 'У вас нет прав для доступа к этой странице.')
+            return redirect('home')
+
+        return None
+
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                response = denied(request, await aload_user(request))
+                if response is not None:
+                    return response
+                return await view_func(request, *args, **kwargs)
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            if not request.user.is_authenticated:
-                messages.error(request, 'Необходимо войти в систему.')
-                return redirect('login')
-            
-            if request.user.role not in roles:
-                messages.error(request, 'У вас нет прав для доступа к этой странице.')
-                return redirect('home')
-            
+            response = denied(request, request.user)
+            if response is not None:
+                return response
             return view_func(request, *args, **kwargs)
         return wrapper
     return decorator
@@ -0,0 +1,30 @@
+"""
+Колонка customers.search_text и триграммный индекс для поиска клиентов
+
+    python manage.py install_customer_search
+
+Обычно колонку и индекс создаёт migrate (orders 0008_customer_search_text);
+команда нужна, если таблица customers появилась после миграций.
+
+Команда идемпотентна. Индекс строится CONCURRENTLY, без блокировки записи
+в таблицу (поэтому вне транзакции).
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts.search import INDEX_NAME, INDEX_SQL, INSTALL_SQL
+
+
+class Command(BaseCommand):
+    help = 'Создаёт колонку customers.search_text и GIN-индекс pg_trgm для поиска клиентов'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            for sql in INSTALL_SQL:
+                cursor.execute(sql)
+            self.stdout.write('Колонка search_text готова')
+
+            cursor.execute(INDEX_SQL)
+            cursor.execute('ANALYZE customers')
+
+        self.stdout.write(self.style.SUCCESS(f'Индекс {INDEX_NAME} готов'))
@@ -0,0 +1,67 @@
+"""
+Телефоны клиентов в E.164 и колонка phone_display
+
+    python manage.py normalize_phones
+    python manage.py normalize_phones --batch-size 5000
+
+Пересчитывает телефоны всех клиентов пачками (bulk_update, без сигналов).
+Колонку customers.phone_display и индекс по phone создаёт migrate (orders
+0009_customer_phone_display); команда повторяет это на случай, если таблица
+customers появилась после миграций.
+Команда идемпотентна: повторный запуск обновляет только изменившиеся строки.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from accounts.models import Customer
+from accounts.phones import INDEX_NAME, INDEX_SQL, INSTALL_SQL, display_phone, normalize_phone
+from accounts.profile import invalidate_all_profiles
+
+
+class Command(BaseCommand):
+    help = 'Приводит телефоны клиентов к E.164 и заполняет phone_display'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            for sql in INSTALL_SQL:
+                cursor.execute(sql)
+        self.stdout.write('Колонка phone_display готова')
+
+        batch_size = options['batch_size']
+        last_id, checked, updated = 0, 0, 0
+        while True:
+            # Пачки по первичному ключу: без OFFSET и без долгих транзакций
+            batch = list(
+                Customer.objects.filter(customer_id__gt=last_id)
+                .order_by('customer_id')
+                .only('customer_id', 'phone', 'phone_display')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].customer_id
+            checked += len(batch)
+
+            changed = []
+            for customer in batch:
+                phone = normalize_phone(customer.phone)
+                display = display_phone(phone)
+                if (phone, display) != (customer.phone, customer.phone_display):
+                    customer.phone, customer.phone_display = phone, display
+                    changed.append(customer)
+            if changed:
+                with transaction.atomic():
+                    Customer.objects.bulk_update(changed, ['phone', 'phone_display'])
+                updated += len(changed)
+            self.stdout.write(f'  проверено {checked}, обновлено {updated}')
+
+        if updated:
+            # bulk_update не вызывает сигналы - сбрасываем профили в сессиях
+            invalidate_all_profiles()
+
+        with connection.cursor() as cursor:
+            cursor.execute(INDEX_SQL)
+            cursor.execute('ANALYZE customers')
+        self.stdout.write(self.style.SUCCESS(f'Телефоны нормализованы, индекс {INDEX_NAME} готов'))
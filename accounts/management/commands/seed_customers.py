@@ -0,0 +1,59 @@
+"""
+Синтетические клиенты для замеров поиска
+
+ВНИМАНИЕ: только для тестовой/стейджинг-базы!
+    python manage.py seed_customers --count 500000
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Customer, User
+from accounts.phones import display_phone
+
+NAMES = ['Александр', 'Мария', 'Иван', 'Анна', 'Дмитрий', 'Елена', 'Сергей', 'Ольга',
+         'Андрей', 'Наталья', 'Гасан', 'Патимат', 'Магомед', 'Зарема', 'Артём', 'Дарья']
+SURNAMES = ['Иванов', 'Петров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Соколов',
+            'Михайлов', 'Новиков', 'Фёдоров', 'Абдурахманов', 'Магомедов', 'Алиев', 'Орлов']
+
+
+class Command(BaseCommand):
+    help = 'Создаёт синтетических клиентов для бенчмарков (не запускать на боевой базе)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Один хэш на всех: пароль синтетическим пользователям не нужен,
+        # а make_password на каждую строку занял бы часы
+        password = make_password(None)
+        prefix = f'bench{rng.randrange(10 ** 6):06d}'
+
+        created = 0
+        while created < options['count']:
+            size = min(options['batch_size'], options['count'] - created)
+            users, people = [], []
+            for i in range(created, created + size):
+                name, surname = rng.choice(NAMES), rng.choice(SURNAMES)
+                username = f'{prefix}_{i}'
+                users.append(User(username=username, password=password, role='client',
+                                  first_name=name, last_name=surname, email=f'{username}@example.com'))
+                people.append((name, surname, f'+79{rng.randrange(10 ** 9):09d}'))
+
+            with transaction.atomic():
+                # bulk_create не вызывает post_save, профили создаём сами
+                users = User.objects.bulk_create(users)
+                Customer.objects.bulk_create([
+                    Customer(user=user, name=name, surname=surname, phone=phone,
+                             phone_display=display_phone(phone), email=user.email)
+                    for user, (name, surname, phone) in zip(users, people)
+                ])
+            created += size
+            self.stdout.write(f'  создано {created}/{options["count"]}')
+
+        self.stdout.write(self.style.SUCCESS(f'Готово: {created} клиентов'))
@@ -0,0 +1,36 @@
+"""
+Middleware профиля клиента
+
+    MIDDLEWARE = [
+        ...
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'accounts.middleware.CustomerProfileMiddleware',
+        ...
+    ]
+
+request.customer - профиль Customer текущего пользователя или None
+(для анонимных посетителей и сотрудников). Профиль загружается лениво,
+не больше одного раза за запрос, и между запросами хранится в сессии
+(см. accounts.profile).
+
+Middleware поддерживает и синхронный, и асинхронный стек: под ASGI
+запрос не переключается ради неё в поток.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .profile import load_customer
+
+
+class CustomerProfileMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.customer = SimpleLazyObject(lambda: load_customer(request))
+        return self.get_response(request)
@@ -1,8 +1,12 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Func, Value
+from django.db.models.functions import Coalesce, Concat, Lower
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from .phones import display_phone, normalize_phone
+
 class User(AbstractUser):
     """Пользователь системы (клиенты, менеджеры, модельеры, ювелиры)"""
     
@@ -57,10 +61,30 @@ class Customer(models.Model):
     )
     surname = models.CharField(max_length=150, blank=True, null=True, verbose_name='Фамилия')
     name = models.CharField(max_length=150, blank=True, null=True, verbose_name='Имя')
+    # Телефон в E.164 и готовая форма для показа (см. accounts.phones)
     phone = models.CharField(max_length=20, blank=True, null=True, verbose_name='Телефон')
+    phone_display = models.CharField(max_length=25, blank=True, null=True, editable=False,
+                                     verbose_name='Телефон (для показа)')
     email = models.CharField(max_length=100, blank=True, null=True, verbose_name='Email')
     order_name = models.CharField(max_length=200, blank=True, null=True, verbose_name='Название заказа')
     role = models.CharField(max_length=150, blank=True, null=True)
+
+    # Нормализованный текст для поиска (генерируется в БД, см. accounts.search):
+    # фамилия, имя, email в нижнем регистре и телефон только цифрами
+    search_text = models.GeneratedField(
+        expression=Concat(
+            Lower(Concat(
+                Coalesce('surname', Value('')), Value(' '),
+                Coalesce('name', Value('')), Value(' '),
+                Coalesce('email', Value('')),
+            )),
+            Value(' '),
+            Func(Coalesce('phone', Value('')), Value('[^0-9]'), Value(''), Value('g'), function='REGEXP_REPLACE'),
+            output_field=models.TextField(),
+        ),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
     
     class Meta:
         managed = False
@@ -70,6 +94,15 @@ class Customer(models.Model):
     
     def __str__(self):
         return f"{self.surname} {self.name}" if self.surname else f"Клиент #{self.customer_id}"
+
+    def save(self, *args, **kwargs):
+        # Телефон нормализуется при записи, а не при каждом выводе
+        self.phone = normalize_phone(self.phone)
+        self.phone_display = display_phone(self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'phone_display'}
+        super().save(*args, **kwargs)
     
     def get_full_name(self):
         """Получить полное имя клиента"""
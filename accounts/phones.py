@@ -0,0 +1,53 @@
+"""
+Нормализация телефонов клиентов
+
+Телефон приводится к E.164 (+79640124733) при сохранении Customer, а рядом
+хранится готовая для показа форма (+7 (964) 012-47-33) - шаблоны просто
+выводят поле, а поиск по номеру становится точным совпадением по индексу.
+
+Номера, которые не удаётся распознать как российские, хранятся как
+введены и показываются без изменений.
+
+Колонка phone_display и индекс по phone создаются миграцией orders
+0009_customer_phone_display, а существующие записи приводятся к E.164
+командой normalize_phones.
+"""
+import re
+
+NON_DIGITS_RE = re.compile(r'\D')
+
+INSTALL_SQL = (
+    "ALTER TABLE customers ADD COLUMN IF NOT EXISTS phone_display varchar(25)",
+)
+INDEX_NAME = 'customers_phone_idx'
+INDEX_SQL = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON customers (phone)"
+
+
+def phone_digits(phone):
+    """11 цифр российского номера (7XXXXXXXXXX) или None"""
+    digits = NON_DIGITS_RE.sub('', str(phone or ''))
+    if len(digits) == 11 and digits[0] in '78':
+        return '7' + digits[1:]
+    if len(digits) == 10:
+        # Номер без кода страны: 9640124733
+        return '7' + digits
+    return None
+
+
+def normalize_phone(phone):
+    """Телефон в E.164 (+79640124733); нераспознанный номер - как введён"""
+    phone = (phone or '').strip()
+    if not phone:
+        return None
+    digits = phone_digits(phone)
+    return f'+{digits}' if digits else phone
+
+
+def display_phone(phone):
+    """Форма для показа: +7 (964) 012-47-33"""
+    if not phone:
+        return None
+    digits = phone_digits(phone)
+    if digits is None:
+        return phone
+    return f'+7 ({digits[1:4]}) {digits[4:7]}-{digits[7:9]}-{digits[9:11]}'
@@ -0,0 +1,89 @@
+"""
+Профиль клиента текущего пользователя, закэшированный в сессии
+
+Профиль (Customer) нужен во многих view, поэтому основные поля профиля
+хранятся в сессии вместе с версией. Версия профиля пользователя лежит в
+общем кэше и меняется при сохранении или удалении Customer (сигналы в
+accounts.signals) - тогда сессии всех устройств пользователя перечитают
+профиль из БД при следующем запросе.
+
+Результат доступен как request.customer (см. CustomerProfileMiddleware);
+view получают его через customer_for(request), который работает и без
+middleware в MIDDLEWARE.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Customer
+
+SESSION_KEY = '_customer_profile'
+
+# Поля профиля в сессии; остальные поля Customer загружаются при обращении
+PROFILE_FIELDS = ('customer_id', 'user_id', 'surname', 'name', 'phone', 'phone_display', 'email')
+
+ALL_PROFILES_KEY = 'customer_profile:version'
+
+
+def _cache():
+    return caches[getattr(settings, 'PROFILE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(user_id):
+    return f'customer_profile:version:{user_id}'
+
+
+def profile_version(user_id):
+    """Версия профиля: (общая версия, версия пользователя)"""
+    cache = _cache()
+    keys = (ALL_PROFILES_KEY, _version_key(user_id))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_profile(user_id):
+    """Профиль пользователя изменился - закэшированные в сессиях копии устарели"""
+    _cache().set(_version_key(user_id), time.time_ns(), timeout=None)
+
+
+def invalidate_all_profiles():
+    """Сброс после массовых изменений в обход сигналов (bulk_update и т.п.)"""
+    _cache().set(ALL_PROFILES_KEY, time.time_ns(), timeout=None)
+
+
+def _from_values(values):
+    return Customer.from_db('default', PROFILE_FIELDS, values) if values is not None else None
+
+
+def load_customer(request):
+    """Профиль клиента пользователя запроса (или None) - из сессии, если он не менялся"""
+    user = request.user
+    # Профиль создаётся только для клиентов (accounts.models.create_customer_profile)
+    if not user.is_authenticated or user.role != 'client':
+        return None
+
+    version = profile_version(user.pk)
+    cached = request.session.get(SESSION_KEY)
+    if cached and cached['user_id'] == user.pk and cached['version'] == version:
+        return _from_values(cached['values'])
+
+    values = Customer.objects.filter(user=user).values_list(*PROFILE_FIELDS).first()
+    request.session[SESSION_KEY] = {
+        'user_id': user.pk,
+        'version': version,
+        'values': list(values) if values is not None else None,
+    }
+    return _from_values(values)
+
+
+def customer_for(request):
+    """request.customer, а если CustomerProfileMiddleware не подключена - load_customer(request)"""
+    customer = getattr(request, 'customer', None)
+    if customer is None:
+        customer = request.customer = load_customer(request)
+    return customer
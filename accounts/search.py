@@ -0,0 +1,75 @@
+"""
+Поиск клиентов по нормализованной колонке customers.search_text
+
+search_text - генерируемая PostgreSQL колонка: фамилия, имя и email в
+нижнем регистре и телефон только цифрами. По ней построен GIN-индекс
+pg_trgm, поэтому поиск подстроки (LIKE '%...%') не сканирует всю таблицу,
+а результаты ранжируются по триграммному сходству.
+
+Колонка и индекс создаются миграцией orders 0008_customer_search_text
+(таблица customers не управляется миграциями accounts); команда
+install_customer_search делает то же для базы, где таблица появилась позже.
+
+Полный номер телефона ищется точным совпадением по нормализованной колонке
+phone (индекс customers_phone_idx, см. accounts.phones).
+"""
+import re
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.paginator import Paginator
+
+from .models import Customer
+from .phones import phone_digits
+
+SEARCH_PAGE_SIZE = 50
+
+# Выражение колонки должно совпадать с Customer.search_text и миграцией
+# orders 0008_customer_search_text
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(surname, '') || ' ' || coalesce(name, '') || ' ' || coalesce(email, ''))"
+    " || ' ' || regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')"
+)
+
+INSTALL_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE customers ADD COLUMN IF NOT EXISTS search_text text "
+    f"GENERATED ALWAYS AS ({SEARCH_TEXT_SQL}) STORED",
+)
+INDEX_NAME = 'customers_search_text_trgm'
+INDEX_SQL = (
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+    f"ON customers USING gin (search_text gin_trgm_ops)"
+)
+
+PHONE_QUERY_RE = re.compile(r'^[\d\s()+\-]+$')
+
+
+def normalize_query(query):
+    """Приводит запрос к виду search_text: нижний регистр, телефон - только цифры"""
+    query = ' '.join((query or '').split()).lower()
+    if PHONE_QUERY_RE.match(query):
+        query = re.sub(r'\D', '', query)
+    return query
+
+
+def search_customers(query):
+    """Клиенты, у которых search_text содержит запрос, лучшие совпадения первыми"""
+    term = normalize_query(query)
+    customers = Customer.objects.select_related('user')
+    if not term:
+        return customers.none()
+
+    # Полный номер (+7 964 ..., 8 964 ...) - точное совпадение по индексу,
+    # часть номера ищется как подстрока цифр в search_text
+    digits = phone_digits(term) if term.isdigit() and len(term) == 11 else None
+    if digits is not None:
+        return customers.filter(phone=f'+{digits}').order_by('surname', 'customer_id')
+
+    return customers.filter(search_text__contains=term).annotate(
+        rank=TrigramWordSimilarity(term, 'search_text'),
+    ).order_by('-rank', 'surname', 'customer_id')
+
+
+def search_page(query, page_number):
+    """Страница ранжированных результатов поиска"""
+    return Paginator(search_customers(query), SEARCH_PAGE_SIZE).get_page(page_number)
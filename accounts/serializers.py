@@ -0,0 +1,19 @@
+"""
+Сериализаторы API для пользователей и клиентов (см. jewelry_crm.api)
+"""
+from jewelry_crm.api import SparseFieldsSerializer
+from .models import Customer, User
+
+
+class UserSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = User
+        fields = ['user_id', 'username', 'first_name', 'last_name', 'role']
+        read_only_fields = fields
+
+
+class CustomerSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Customer
+        fields = ['customer_id', 'user', 'surname', 'name', 'phone', 'phone_display', 'email']
+        read_only_fields = fields
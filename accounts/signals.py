@@ -0,0 +1,16 @@
+"""
+Сигналы профиля клиента: сброс копий профиля, закэшированных в сессиях
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Customer
+from .profile import invalidate_profile
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_customer_profile(sender, instance, **kwargs):
+    """Профиль изменён или удалён - сессии перечитают его из БД"""
+    if instance.user_id is not None:
+        invalidate_profile(instance.user_id)
@@ -1,3 +1,176 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.sessions.backends.cache import SessionStore
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .models import Customer, User
+
+from .phones import display_phone, normalize_phone
+from .profile import customer_for, load_customer
+from .search import normalize_query, search_customers, search_page
+
+
+class CustomerSearchQueryTests(SimpleTestCase):
+    """Нормализация строки поиска под колонку search_text"""
+
+    def test_text_is_lowercased_and_collapsed(self):
+        self.assertEqual(normalize_query('  Иванов   Иван '), 'иванов иван')
+
+    def test_phone_keeps_digits_only(self):
+        self.assertEqual(normalize_query('+7 (964) 012-47'), '796401247')
+
+    def test_empty(self):
+        self.assertEqual(normalize_query(None), '')
+
+
+class CustomerSearchTests(TestCase):
+    """Поиск по search_text: ранжирование, полный номер, постраничный вывод"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        cls.ivanov = cls._customer('ivanov', 'Иванов', 'Пётр', '+7 (964) 012-47-33')
+        cls.ivanova = cls._customer('ivanova', 'Иванова', 'Мария', '8 916 123 45 67')
+        cls.petrov = cls._customer('petrov', 'Петров', 'Иван', '9031112233')
+
+    @classmethod
+    def _customer(cls, username, surname, name, phone):
+        user = User.objects.create_user(username=username, password='pass', role='client')
+        customer = Customer.objects.get(user=user)
+        customer.surname, customer.name, customer.phone = surname, name, phone
+        customer.save()
+        return customer
+
+    def test_best_match_first(self):
+        found = [c.pk for c in search_customers('Иванов')]
+        self.assertEqual(found, [self.ivanov.pk, self.ivanova.pk])
+
+    def test_name_and_surname_match(self):
+        found = {c.pk for c in search_customers('иван')}
+        self.assertEqual(found, {self.ivanov.pk, self.ivanova.pk, self.petrov.pk})
+
+    def test_full_phone_is_exact_match(self):
+        for query in ('8 (964) 012-47-33', '+79640124733'):
+            with self.subTest(query=query):
+                self.assertEqual([c.pk for c in search_customers(query)], [self.ivanov.pk])
+
+    def test_part_of_phone(self):
+        self.assertEqual([c.pk for c in search_customers('916-123')], [self.ivanova.pk])
+
+    def test_empty_query(self):
+        self.assertFalse(search_customers('   ').exists())
+
+    @mock.patch('accounts.search.SEARCH_PAGE_SIZE', 2)
+    def test_paging(self):
+        first, second = search_page('иван', 1), search_page('иван', 2)
+        self.assertEqual(first.paginator.count, 3)
+        self.assertEqual(len(first), 2)
+        self.assertEqual([c.pk for c in second], [c.pk for c in search_customers('иван')][2:])
+
+    @mock.patch('accounts.search.SEARCH_PAGE_SIZE', 2)
+    def test_customer_list_search(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('customer_list'), {'search': 'иван', 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total'], 3)
+        self.assertEqual(len(response.context['customers']), 1)
+
+
+class PhoneNormalizationTests(SimpleTestCase):
+    """Телефон в E.164 при записи и готовая форма для показа"""
+
+    def test_russian_formats_to_e164(self):
+        for raw in ('89640124733', '+7 (964) 012-47-33', '7 964 012 47 33', '9640124733'):
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize_phone(raw), '+79640124733')
+
+    def test_unrecognised_kept_as_entered(self):
+        self.assertEqual(normalize_phone(' 12-34 '), '12-34')
+        self.assertEqual(display_phone('12-34'), '12-34')
+
+    def test_empty(self):
+        self.assertIsNone(normalize_phone('   '))
+        self.assertIsNone(display_phone(None))
+
+    def test_display(self):
+        self.assertEqual(display_phone('+79640124733'), '+7 (964) 012-47-33')
+
+
+class CustomerProfileSessionTests(TestCase):
+    """Профиль клиента читается из сессии, пока не изменится"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='client', password='pass', role='client')
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+
+    def _request(self, user, session):
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = session
+        return request
+
+    def test_profile_cached_in_session(self):
+        session = SessionStore()
+        customer = load_customer(self._request(self.user, session))
+        self.assertEqual(customer.user_id, self.user.pk)
+
+        with self.assertNumQueries(0):
+            cached = load_customer(self._request(self.user, session))
+        self.assertEqual(cached.pk, customer.pk)
+
+    def test_profile_change_invalidates_session_copy(self):
+        session = SessionStore()
+        load_customer(self._request(self.user, session))
+
+        customer = Customer.objects.get(user=self.user)
+        customer.phone = '89640124733'
+        customer.save()
+
+        with self.assertNumQueries(1):
+            reloaded = load_customer(self._request(self.user, session))
+        self.assertEqual(reloaded.phone_display, '+7 (964) 012-47-33')
+
+    def test_staff_has_no_profile(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(load_customer(self._request(self.manager, SessionStore())))
+
+    def test_customer_without_middleware(self):
+        # CustomerProfileMiddleware не подключена - request.customer отсутствует
+        request = self._request(self.user, SessionStore())
+        self.assertEqual(customer_for(request).user_id, self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(customer_for(request).user_id, self.user.pk)
+
+
+class AsyncCustomerViewTests(TestCase):
+    """customer_list и customer_orders - async views с проверкой роли"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        cls.user = User.objects.create_user(username='client', password='pass', role='client')
+        cls.customer = Customer.objects.get(user=cls.user)
+
+    async def test_customer_list(self):
+        await self.async_client.aforce_login(self.manager)
+        response = await self.async_client.get(reverse('customer_list'))
+        self.assertEqual(response.status_code, 200)
+        customers = response.context['customers']
+        self.assertEqual([c.pk for c in customers], [self.customer.pk])
+        self.assertEqual(customers[0].orders_count, 0)
+
+    async def test_customer_orders(self):
+        await self.async_client.aforce_login(self.manager)
+        response = await self.async_client.get(reverse('customer_orders', args=[self.customer.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['orders'], [])
+
+        response = await self.async_client.get(reverse('customer_orders', args=[self.customer.pk + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_client_is_redirected(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('customer_list'))
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
@@ -1,11 +1,14 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render, redirect
 from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Count
 from .forms import UserRegistrationForm
 from .models import Customer, User
 from .decorators import client_required, manager_required
+from .search import search_page
+from orders.pagination import akeyset_paginate, parse_page_size
+from orders.customer_stats import astats_for
 from orders.models import Order
 
 def register(request):
@@ -91,34 +94,52 @@ def home_view(request):
 
 
 
+def _attach_order_counts(customers, stats):
+    """Количество заказов клиентов страницы из счётчиков customer_stats"""
+    for customer in customers:
+        customer_stats = stats.get(customer.customer_id)
+        customer.orders_count = customer_stats.orders_count if customer_stats else 0
+
+
+def _search_results(search, page_number):
+    """Страница поиска, её клиенты и общее число найденных (Paginator синхронный)"""
+    page = search_page(search, page_number)
+    return page, list(page), page.paginator.count
+
+
 @manager_required
-def customer_list(request):
+async def customer_list(request):
     """Список всех клиентов - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА"""
-    customers = Customer.objects.select_related('user').all()
-    
-    # Фильтрация
-    search = request.GET.get('search', '')
+    search = request.GET.get('search', '').strip()
+
     if search:
-        customers = customers.filter(
-            Q(name__icontains=search) |
-            Q(surname__icontains=search) |
-            Q(email__icontains=search) |
-            Q(phone__icontains=search)
+        # Ранжированный поиск по триграммному индексу, постраничный
+        page, customers, total = await sync_to_async(_search_results)(search, request.GET.get('page'))
+    else:
+        # Просмотр без поиска - keyset-пагинация по customer_id
+        page = await akeyset_paginate(
+            Customer.objects.select_related('user'),
+            request.GET.get('cursor'),
+            parse_page_size(request.GET.get('per_page')),
+            key='customer_id',
         )
-    
-    # Добавляем количество заказов для каждого клиента
-    customers = customers.annotate(orders_count=Count('order'))
-    
+        customers = page.items
+        total = None
+
+    _attach_order_counts(customers, await astats_for(c.customer_id for c in customers))
+
     return render(request, 'accounts/customer_list.html', {
         'customers': customers,
+        'page': page,
+        'total': total,
         'search': search
     })
 
 
 @manager_required
-def customer_orders(request, customer_id):
+async def customer_orders(request, customer_id):
     """Список заказов конкретного клиента - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА"""
-    customer = get_object_or_404(Customer, customer_id=customer_id)
+    customer = await aget_object_or_404(Customer, customer_id=customer_id)
     orders = Order.objects.filter(customer=customer).order_by('-order_id')
     
     # Фильтрация заказов
@@ -137,7 +158,7 @@ def customer_orders(request, customer_id):
     
     return render(request, 'accounts/customer_orders.html', {
         'customer': customer,
-        'orders': orders,
+        'orders': [order async for order in orders],
         'status_filter': status_filter,
         'order_type_filter': order_type_filter,
         'product_type_filter': product_type_filter
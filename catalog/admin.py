@@ -1,3 +1,31 @@
 from django.contrib import admin
+from .models import CollectionItem
 
-# Register your models here.
+
+@admin.register(CollectionItem)
+class CollectionItemAdmin(admin.ModelAdmin):
+    list_display = ['item_id', 'name', 'category', 'product_type', 'price', 'is_masterpiece', 'is_active', 'sort_order']
+    list_filter = ['product_type', 'is_active', 'is_masterpiece']
+    list_editable = ['is_active', 'sort_order']
+    search_fields = ['name', 'category']
+    readonly_fields = ['updated_at']
+
+    fieldsets = (
+        ('Основная информация', {
+            'fields': ('name', 'product_type', 'category', 'price', 'tagline', 'is_active', 'sort_order')
+        }),
+        ('Изображения', {
+            'fields': ('image_name', 'featured_image_name', 'is_masterpiece')
+        }),
+        ('Описание', {
+            'fields': ('card_description', 'materials_summary', 'main_description', 'story', 'craftsmanship')
+        }),
+        ('Характеристики', {
+            'fields': ('materials', 'specifications', 'care'),
+            'classes': ('collapse',)
+        }),
+        ('Системная информация', {
+            'fields': ('updated_at',),
+            'classes': ('collapse',)
+        }),
+    )
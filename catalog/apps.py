@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class CatalogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog'
+
+    def ready(self):
+        from . import signals
+
+        # Обращаться к БД в ready() нельзя, поэтому каталог прогревается
+        # в начале первого запроса процесса
+        request_started.connect(signals.warm_catalogue)
@@ -0,0 +1,104 @@
+"""
+Изделия коллекции с кэшем в памяти процесса
+
+Коллекция небольшая и меняется редко, поэтому каждый процесс держит её
+целиком в памяти и читает из БД только при первом обращении или после
+изменения. Изменение в любом процессе меняет версию каталога в общем кэше,
+и остальные процессы перечитывают данные при следующем запросе.
+"""
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+
+from jewelry_crm import page_cache
+from .models import CollectionItem
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'catalog:version'
+PAGE_CACHE_NAMESPACE = 'catalog'
+
+_lock = threading.Lock()
+_state = (None, None)  # (версия, {item_id: CollectionItem})
+
+
+def _cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def _current_version():
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _load(version):
+    global _state
+    with _lock:
+        loaded_version, items = _state
+        if items is None or loaded_version != version:
+            items = {item.item_id: item for item in CollectionItem.objects.filter(is_active=True)}
+            _state = (version, items)
+    return items
+
+
+def _items():
+    version = _current_version()
+    loaded_version, items = _state
+    if items is None or loaded_version != version:
+        items = _load(version)
+    return items
+
+
+async def _aitems():
+    """_items для async views: из БД (в потоке) только при смене версии"""
+    cache = _cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    loaded_version, items = _state
+    if items is None or loaded_version != version:
+        items = await sync_to_async(_load)(version)
+    return items
+
+
+def all_items():
+    """Изделия коллекции в порядке витрины"""
+    return list(_items().values())
+
+
+def get_item(item_id):
+    return _items().get(item_id)
+
+
+async def aget_item(item_id):
+    return (await _aitems()).get(item_id)
+
+
+def masterpiece():
+    return next((item for item in _items().values() if item.is_masterpiece), None)
+
+
+def warm():
+    """Загрузка каталога заранее (до первого запроса к витрине)"""
+    try:
+        _items()
+    except DatabaseError:
+        logger.warning('Каталог не загружен: таблица изделий недоступна', exc_info=True)
+
+
+def invalidate():
+    """Сбрасывает каталог во всех процессах и закэшированные страницы витрины"""
+    global _state
+    _cache().set(VERSION_KEY, time.time_ns(), timeout=None)
+    _state = (None, None)
+    page_cache.invalidate(PAGE_CACHE_NAMESPACE)
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionItem',
+            fields=[
+                ('item_id', models.AutoField(db_column='item_id', primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='Название')),
+                ('product_type', models.CharField(max_length=20, verbose_name='Тип изделия')),
+                ('category', models.CharField(max_length=50, verbose_name='Категория')),
+                ('image_name', models.CharField(max_length=100, verbose_name='Изображение')),
+                ('featured_image_name', models.CharField(blank=True, default='', max_length=100, verbose_name='Изображение шедевра')),
+                ('tagline', models.CharField(blank=True, default='', max_length=200, verbose_name='Слоган')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Цена')),
+                ('card_description', models.CharField(blank=True, default='', max_length=255, verbose_name='Описание в витрине')),
+                ('materials_summary', models.CharField(blank=True, default='', max_length=255, verbose_name='Материалы (кратко)')),
+                ('main_description', models.TextField(blank=True, default='', verbose_name='Описание')),
+                ('story', models.TextField(blank=True, default='', verbose_name='История')),
+                ('craftsmanship', models.TextField(blank=True, default='', verbose_name='Мастерство')),
+                ('materials', models.JSONField(blank=True, default=list, verbose_name='Материалы')),
+                ('specifications', models.JSONField(blank=True, default=list, verbose_name='Характеристики')),
+                ('care', models.JSONField(blank=True, default=list, verbose_name='Уход')),
+                ('is_masterpiece', models.BooleanField(default=False, verbose_name='Шедевр коллекции')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Показывать')),
+                ('sort_order', models.PositiveIntegerField(default=0, verbose_name='Порядок')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Изделие коллекции',
+                'verbose_name_plural': 'Изделия коллекции',
+                'db_table': 'collection_items',
+                'ordering': ['sort_order', 'item_id'],
+            },
+        ),
+    ]
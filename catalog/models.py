@@ -1,3 +1,46 @@
 from django.db import models
 
-# Create your models here.
+
+class CollectionItem(models.Model):
+    """Изделие коллекции (витрина каталога и предзаказ)"""
+    item_id = models.AutoField(primary_key=True, db_column='item_id')
+    name = models.CharField(max_length=100, verbose_name='Название')
+
+    # Тип изделия в терминах заказа (Order.product_type) и подпись для витрины
+    product_type = models.CharField(max_length=20, verbose_name='Тип изделия')
+    category = models.CharField(max_length=50, verbose_name='Категория')
+
+    image_name = models.CharField(max_length=100, verbose_name='Изображение')
+    featured_image_name = models.CharField(max_length=100, blank=True, default='', verbose_name='Изображение шедевра')
+    tagline = models.CharField(max_length=200, blank=True, default='', verbose_name='Слоган')
+    price = models.DecimalField(max_digits=12, decimal_places=2, verbose_name='Цена')
+
+    card_description = models.CharField(max_length=255, blank=True, default='', verbose_name='Описание в витрине')
+    materials_summary = models.CharField(max_length=255, blank=True, default='', verbose_name='Материалы (кратко)')
+    main_description = models.TextField(blank=True, default='', verbose_name='Описание')
+    story = models.TextField(blank=True, default='', verbose_name='История')
+    craftsmanship = models.TextField(blank=True, default='', verbose_name='Мастерство')
+
+    # Списки вида [{'name': ..., 'value': ...}] и ['...']
+    materials = models.JSONField(default=list, blank=True, verbose_name='Материалы')
+    specifications = models.JSONField(default=list, blank=True, verbose_name='Характеристики')
+    care = models.JSONField(default=list, blank=True, verbose_name='Уход')
+
+    is_masterpiece = models.BooleanField(default=False, verbose_name='Шедевр коллекции')
+    is_active = models.BooleanField(default=True, verbose_name='Показывать')
+    sort_order = models.PositiveIntegerField(default=0, verbose_name='Порядок')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата изменения')
+
+    class Meta:
+        db_table = 'collection_items'
+        ordering = ['sort_order', 'item_id']
+        verbose_name = 'Изделие коллекции'
+        verbose_name_plural = 'Изделия коллекции'
+
+    def __str__(self):
+        return f"{self.category} {self.name}"
+
+    @property
+    def price_display(self):
+        """Цена с разделителем разрядов: 385 000"""
+        return f"{int(self.price):,}".replace(',', ' ')
@@ -0,0 +1,27 @@
+"""
+Сигналы каталога: сброс кэша коллекции при изменении изделий
+"""
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import catalogue
+from .models import CollectionItem
+
+
+@receiver(post_save, sender=CollectionItem)
+@receiver(post_delete, sender=CollectionItem)
+def invalidate_catalogue(sender, **kwargs):
+    """
+    Изменение изделия (в т.ч. из админки) сбрасывает каталог и страницы витрины -
+    после фиксации транзакции, чтобы другой процесс не закэшировал под новой
+    версией ещё прежний каталог
+    """
+    transaction.on_commit(catalogue.invalidate)
+
+
+def warm_catalogue(sender, **kwargs):
+    """Загружает каталог перед первым запросом процесса"""
+    request_started.disconnect(warm_catalogue)
+    catalogue.warm()
@@ -1,3 +1,55 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from . import catalogue
+from .models import CollectionItem
+
+
+class CatalogueCacheTests(TestCase):
+    """Каталог коллекции читается из БД один раз и сбрасывается при изменении"""
+
+    def setUp(self):
+        cache.clear()
+        catalogue.invalidate()
+
+    def test_items_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            catalogue.all_items()
+            catalogue.get_item(1)
+            catalogue.masterpiece()
+
+    def test_save_invalidates(self):
+        item = catalogue.get_item(1)
+        CollectionItem.objects.filter(pk=item.pk).update(name='Изменено')
+        self.assertEqual(catalogue.get_item(1).name, item.name)
+
+        old_name, item.name = item.name, 'Étoile II'
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save()
+            # До фиксации транзакции каталог прежний
+            self.assertEqual(catalogue.get_item(1).name, old_name)
+        self.assertEqual(catalogue.get_item(1).name, 'Étoile II')
+
+
+class CatalogPageCacheTests(TestCase):
+    """Страницы витрины кэшируются для анонимных посетителей"""
+
+    def setUp(self):
+        cache.clear()
+        catalogue.invalidate()
+
+    def test_product_detail_is_cached_until_edit(self):
+        url = reverse('product_detail', args=[1])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        item = CollectionItem.objects.get(pk=1)
+        item.tagline = 'Новый слоган'
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save()
+        self.assertContains(self.client.get(url), 'Новый слоган')
+
+    def test_unknown_product_is_404(self):
+        self.assertEqual(self.client.get(reverse('product_detail', args=[999])).status_code, 404)
@@ -0,0 +1,121 @@
+"""
+Общая основа REST API (Django REST Framework, только чтение)
+
+- Курсорная пагинация по первичному ключу: страница выбирается условием
+  по ключу + LIMIT, её стоимость не зависит от номера. Размер страницы -
+  ?page_size= (до API_MAX_PAGE_SIZE).
+- ?fields=a,b,c оставляет в ответе только перечисленные поля; запрос к БД
+  строится по тем же полям: only() для колонок, select_related() для
+  вложенных объектов. Неизвестное поле - ответ 400.
+- Ответы GET получают ETag (md5 тела); запрос с совпадающим If-None-Match
+  получает 304 без тела.
+
+Настройки:
+    API_PAGE_SIZE      - размер страницы по умолчанию (50)
+    API_MAX_PAGE_SIZE  - наибольший ?page_size= (10000)
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework import serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+
+API_PAGE_SIZE = getattr(settings, 'API_PAGE_SIZE', 50)
+API_MAX_PAGE_SIZE = getattr(settings, 'API_MAX_PAGE_SIZE', 10000)
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """ModelSerializer с аргументом fields - список оставляемых полей"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def queryset_columns(serializer):
+    """
+    Поля сериализатора -> (колонки для only(), связи для select_related()).
+    Вложенные сериализаторы загружаются тем же запросом через JOIN.
+    """
+    only, related = [], []
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        path = field.source.replace('.', '__')
+        if isinstance(field, serializers.BaseSerializer):
+            nested_only, nested_related = queryset_columns(field)
+            related.append(path)
+            related += [f'{path}__{name}' for name in nested_related]
+            only.append(path)
+            only += [f'{path}__{name}' for name in nested_only]
+        else:
+            if '__' in path:
+                related.append(path.rsplit('__', 1)[0])
+            only.append(path)
+    return only, related
+
+
+class KeyCursorPagination(CursorPagination):
+    """Курсор по первичному ключу, новые записи первыми"""
+    page_size = API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return (f'-{queryset.model._meta.pk.attname}',)
+
+
+class ReadOnlyApiViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Базовый viewset API: права через scoped_queryset(user), ?fields=,
+    курсорная пагинация и ETag.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeyCursorPagination
+    fields_query_param = 'fields'
+
+    def scoped_queryset(self, user):
+        """Записи, доступные пользователю"""
+        raise NotImplementedError
+
+    @cached_property
+    def sparse_fields(self):
+        """Поля из ?fields= или None (все поля)"""
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = set(fields) - set(self.get_serializer_class()().fields)
+        if unknown:
+            raise ValidationError({self.fields_query_param: [f'Неизвестные поля: {", ".join(sorted(unknown))}']})
+        return fields or None
+
+    def get_queryset(self):
+        only, related = queryset_columns(self.get_serializer_class()(fields=self.sparse_fields))
+        queryset = self.scoped_queryset(self.request.user)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+            return response
+
+        response.render()
+        etag = f'"{hashlib.md5(response.content).hexdigest()}"'
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Cookie', 'Authorization'))
+        return get_conditional_response(request, etag=etag, response=response)
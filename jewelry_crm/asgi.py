@@ -5,6 +5,17 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Запуск (см. README, "Запуск под ASGI"):
+
+    gunicorn jewelry_crm.asgi:application -k uvicorn.workers.UvicornWorker --workers 4
+
+Страницы order_list, order_detail, customer_list, customer_orders и
+product_detail_view - async views: под ASGI ожидание БД не занимает поток.
+Остальные views синхронные, Django выполняет их в пуле потоков.
+
+Websocket /ws/orders/ (orders.consumers) рассылает изменения заказов;
+пользователь берётся из сессии (AuthMiddlewareStack).
 """
 
 import os
@@ -13,4 +24,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jewelry_crm.settings')
 
-application = get_asgi_application()
+# Django настраивается до импорта consumers и моделей
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from orders.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(
+        AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
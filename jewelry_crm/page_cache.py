@@ -0,0 +1,173 @@
+"""
+Кэш готовых страниц для анонимных посетителей
+
+Страница кэшируется целиком по полному пути запроса и языку внутри
+"пространства" (например, 'catalog'). У пространства есть версия в общем
+кэше: invalidate() меняет её, и все страницы пространства перестают
+находиться - сразу во всех воркерах, без перебора ключей.
+
+Анонимным посетителям страница отдаётся с Cache-Control: public, ETag и
+Last-Modified, поэтому браузер и CDN могут перепроверять её условным
+запросом и получать 304 без тела. Авторизованным пользователям страница
+рендерится каждый раз и помечается как private.
+
+Запросы не GET/HEAD, ответы с cookies, страницы с CSRF-токеном (он
+привязан к cookie конкретного посетителя) и страницы с непрочитанными
+сообщениями в кэш не попадают - для них подходит кэширование фрагментов
+шаблона ({% cache %}).
+
+Декоратор подходит и для async views: пользователь загружается через
+request.auser(), кэш читается асинхронным API.
+
+Настройки:
+    PAGE_CACHE_ALIAS    - алиас кэша (по умолчанию 'default')
+    PAGE_CACHE_TIMEOUT  - время жизни страницы в кэше, сек (по умолчанию 10 минут)
+    PAGE_CACHE_MAX_AGE  - max-age для браузеров и CDN, сек (по умолчанию 60)
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 10 * 60)
+PAGE_CACHE_MAX_AGE = getattr(settings, 'PAGE_CACHE_MAX_AGE', 60)
+
+
+def _cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(namespace):
+    return f'page:{namespace}:version'
+
+
+def _namespace_version(cache, namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _anamespace_version(cache, namespace):
+    key = _version_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def invalidate(namespace):
+    """Сбрасывает все закэшированные страницы пространства"""
+    _cache().set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def _page_key(request, namespace, version):
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page:{namespace}:{version}:{translation.get_language() or "-"}:{digest}'
+
+
+def _cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    return not len(get_messages(request))
+
+
+def _cacheable_response(request, response):
+    return (
+        not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        and response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    )
+
+
+def _entry(response):
+    """Данные страницы для кэша (сам объект ответа не храним)"""
+    return {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+        'last_modified': int(time.time()),
+    }
+
+
+def _respond(request, entry):
+    """Ответ из записи кэша: 304 по If-None-Match/If-Modified-Since или страница"""
+    response = get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified'],
+    )
+    if response is None:
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_cache_control(response, public=True, max_age=PAGE_CACHE_MAX_AGE)
+    patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+    return response
+
+
+def cached_page(namespace, timeout=None):
+    """Декоратор view: кэширует страницу для анонимных посетителей"""
+    def decorator(view):
+        page_timeout = PAGE_CACHE_TIMEOUT if timeout is None else timeout
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Сессия загружается здесь же, до проверки сообщений
+                request.user = await request.auser()
+                if not _cacheable_request(request):
+                    response = await view(request, *args, **kwargs)
+                    if request.user.is_authenticated:
+                        patch_cache_control(response, private=True)
+                    return response
+
+                cache = _cache()
+                key = _page_key(request, namespace, await _anamespace_version(cache, namespace))
+
+                entry = await cache.aget(key)
+                if entry is None:
+                    response = await view(request, *args, **kwargs)
+                    if not _cacheable_response(request, response):
+                        return response
+                    entry = _entry(response)
+                    await cache.aset(key, entry, page_timeout)
+
+                return _respond(request, entry)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                response = view(request, *args, **kwargs)
+                if request.user.is_authenticated:
+                    patch_cache_control(response, private=True)
+                return response
+
+            cache = _cache()
+            key = _page_key(request, namespace, _namespace_version(cache, namespace))
+
+            entry = cache.get(key)
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                if not _cacheable_response(request, response):
+                    return response
+                entry = _entry(response)
+                cache.set(key, entry, page_timeout)
+
+            return _respond(request, entry)
+        return wrapper
+    return decorator
@@ -0,0 +1,51 @@
+"""
+Индексы для таблиц, которые не управляются миграциями Django
+
+Для моделей с managed = False Django не создаёт ни таблиц, ни индексов,
+но Meta.indexes у них объявить можно - это описание путей доступа рядом с
+моделью. Функции ниже находят объявленные индексы, которых ещё нет в БД,
+и создают их CREATE INDEX CONCURRENTLY (без блокировки записи в таблицу).
+"""
+from django.apps import apps
+from django.db import connections
+
+
+def declared_indexes(app_labels=None):
+    """(model, index) для всех индексов неуправляемых моделей"""
+    for model in apps.get_models():
+        opts = model._meta
+        if opts.managed or opts.proxy:
+            continue
+        if app_labels and opts.app_label not in app_labels:
+            continue
+        for index in opts.indexes:
+            yield model, index
+
+
+def existing_names(model, using='default'):
+    """Имена индексов и ограничений таблицы модели в БД"""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        return set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+
+
+def missing_indexes(app_labels=None, using='default'):
+    """Объявленные индексы, которых нет в БД"""
+    known = {}
+    for model, index in declared_indexes(app_labels):
+        if model not in known:
+            known[model] = existing_names(model, using)
+        if index.name not in known[model]:
+            yield model, index
+
+
+def create_sql(model, index, using='default'):
+    """SQL создания индекса (для --dry-run)"""
+    with connections[using].schema_editor(collect_sql=True, atomic=False) as editor:
+        return str(index.create_sql(model, editor, concurrently=True))
+
+
+def create_index(model, index, using='default'):
+    """CREATE INDEX CONCURRENTLY - вне транзакции"""
+    with connections[using].schema_editor(atomic=False) as editor:
+        editor.add_index(model, index, concurrently=True)
@@ -1,6 +1,16 @@
 from django.contrib import admin
 from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from accounts import views as accounts_views
+from accounts.api import CustomerViewSet
+from orders.api import DocumentViewSet, OrderViewSet, PaymentViewSet
+
+# REST API только для чтения (см. jewelry_crm.api)
+api_router = DefaultRouter()
+api_router.register('orders', OrderViewSet, basename='api-order')
+api_router.register('customers', CustomerViewSet, basename='api-customer')
+api_router.register('documents', DocumentViewSet, basename='api-document')
+api_router.register('payments', PaymentViewSet, basename='api-payment')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -19,6 +29,8 @@ urlpatterns = [
     path('orders/', include('orders.urls')),
     
     path('catalog/', include('catalog.urls')),
+
+    path('api/', include(api_router.urls)),
     
     path('', include('pages.urls')),
 ]
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, Order, OrderProduct, Payment, Document
+from .models import Product, Order, OrderEvent, OrderProduct, Payment, PricingRates, Document
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
@@ -39,6 +39,41 @@ class OrderAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        obj.changed_by_id = request.user.pk  # для журнала изменений
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(OrderEvent)
+class OrderEventAdmin(admin.ModelAdmin):
+    """Журнал только для просмотра: события не меняются и не удаляются"""
+    list_display = ['order_id', 'ts', 'kind', 'old_value', 'new_value', 'actor_id']
+    list_filter = ['kind']
+    search_fields = ['order_id']
+    date_hierarchy = 'ts'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PricingRates)
+class PricingRatesAdmin(admin.ModelAdmin):
+    """Версии тарифов не редактируются - изменение тарифов = новая версия"""
+    list_display = ['version', 'created_at', 'template_coefficient', 'labor_cost', 'comment']
+    readonly_fields = ['version', 'created_at']
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
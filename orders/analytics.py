@@ -0,0 +1,152 @@
+"""
+Сроки выполнения заказов и просрочки
+
+Цикл заказа - время от создания (статус 'new') до первого перехода в
+'delivered' по журналу order_events. Для заказов, доставленных в период,
+среднее, медиана (p50) и p90 считаются в БД одним запросом с GROUPING
+SETS: в целом, по типу изделия и по исполнителю. Длительности отдельных
+этапов берутся из orders.events.stage_durations (оконная функция LEAD).
+
+Просроченные - незавершённые заказы с required_by в прошлом (частичный
+индекс orders_overdue_idx); опоздавшие - доставленные позже required_by.
+"""
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from .events import stage_durations
+from .models import Order, OrderEvent
+from .rollup import day_bounds
+
+CycleStats = namedtuple('CycleStats', ['key', 'label', 'count', 'avg', 'p50', 'p90', 'late'])
+
+
+@dataclass(frozen=True)
+class CycleTimeReport:
+    """Сроки выполнения заказов, доставленных в период"""
+    overall: CycleStats = None
+    by_product_type: tuple = ()
+    by_worker: tuple = ()
+    stages: tuple = ()
+    overdue_open: int = 0
+
+
+# GROUPING(product_type, user_id): 1 в разряде - колонка свёрнута
+GROUP_TOTAL = 0b11
+GROUP_PRODUCT_TYPE = 0b01
+GROUP_WORKER = 0b10
+
+CYCLE_TIME_SQL = """
+    WITH delivered AS (
+        SELECT order_id, MIN(ts) AS delivered_at
+        FROM order_events
+        WHERE kind = %s AND new_value = %s AND ts >= %s AND ts < %s
+        GROUP BY order_id
+    ),
+    cycles AS (
+        SELECT
+            o.product_type,
+            o.user_id,
+            EXTRACT(EPOCH FROM d.delivered_at - o.created_at) AS seconds,
+            d.delivered_at > o.required_by AS late
+        FROM delivered d
+        JOIN orders o ON o.order_id = d.order_id
+    ),
+    grouped AS (
+        SELECT
+            GROUPING(product_type, user_id) AS grp,
+            product_type,
+            user_id,
+            COUNT(*) AS orders_count,
+            AVG(seconds) AS avg_seconds,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds) AS p50,
+            percentile_cont(0.9) WITHIN GROUP (ORDER BY seconds) AS p90,
+            COUNT(*) FILTER (WHERE late) AS late_count
+        FROM cycles
+        GROUP BY GROUPING SETS ((), (product_type), (user_id))
+    )
+    SELECT
+        g.grp, g.product_type, g.user_id,
+        g.orders_count, g.avg_seconds, g.p50, g.p90, g.late_count,
+        u.username, u.first_name, u.last_name
+    FROM grouped g
+    LEFT JOIN users u ON u.user_id = g.user_id
+"""
+
+
+def _duration(seconds):
+    return timedelta(seconds=float(seconds)) if seconds is not None else None
+
+
+def _worker_label(user_id, username, first_name, last_name):
+    if user_id is None:
+        return 'Не назначен'
+    return f'{first_name or ""} {last_name or ""}'.strip() or username
+
+
+def overdue_count(now=None):
+    """Незавершённые заказы с прошедшим сроком required_by"""
+    return Order.objects.filter(
+        required_by__lt=now or timezone.now(),
+    ).exclude(order_status='delivered').count()
+
+
+def cycle_time_report(start_date, end_date):
+    """Сроки выполнения заказов, доставленных в период (включительно), и просрочки"""
+    period_start, period_end = day_bounds(start_date, end_date)
+    with connection.cursor() as cursor:
+        cursor.execute(CYCLE_TIME_SQL, [
+            OrderEvent.KIND_STATUS, 'delivered', period_start, period_end,
+        ])
+        rows = cursor.fetchall()
+
+    product_types = dict(Order.PRODUCT_TYPE_CHOICES)
+    statuses = dict(Order.ORDER_STATUS_CHOICES)
+    stage_order = {code: position for position, code in enumerate(statuses)}
+    overall, by_product_type, by_worker = None, [], []
+    for (grp, product_type, user_id, count, avg, p50, p90, late,
+         username, first_name, last_name) in rows:
+        durations = (count, _duration(avg), _duration(p50), _duration(p90), late)
+        if grp == GROUP_TOTAL:
+            overall = CycleStats(None, 'Все заказы', *durations)
+        elif grp == GROUP_PRODUCT_TYPE:
+            label = product_types.get(product_type, product_type or 'Не указано')
+            by_product_type.append(CycleStats(product_type, label, *durations))
+        elif grp == GROUP_WORKER:
+            label = _worker_label(user_id, username, first_name, last_name)
+            by_worker.append(CycleStats(user_id, label, *durations))
+
+    def slowest_first(items):
+        return tuple(sorted(items, key=lambda item: -item.p50.total_seconds()))
+
+    return CycleTimeReport(
+        overall=overall,
+        by_product_type=slowest_first(by_product_type),
+        by_worker=slowest_first(by_worker),
+        stages=tuple(
+            CycleStats(stage.stage, statuses.get(stage.stage, stage.stage), stage.count,
+                       stage.avg, stage.median, stage.p90, None)
+            for stage in sorted(
+                stage_durations(start_date=start_date, end_date=end_date),
+                key=lambda stage: stage_order.get(stage.stage, len(stage_order)),
+            )
+        ),
+        overdue_open=overdue_count(),
+    )
+
+
+def format_duration(value):
+    """Длительность для отчёта: '3 д 4 ч', '5 ч 10 мин', '—'"""
+    if value is None:
+        return '—'
+    minutes = int(value.total_seconds() // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f'{days} д {hours} ч'
+    if hours:
+        return f'{hours} ч {minutes} мин'
+    return f'{minutes} мин'
@@ -0,0 +1,38 @@
+"""
+API заказов, документов и платежей: /api/orders/, /api/documents/,
+/api/payments/ (только чтение)
+
+Доступ - по тем же правилам, что на сайте (Order.objects.for_user):
+документы и платежи видны вместе с заказом.
+"""
+from jewelry_crm.api import ReadOnlyApiViewSet
+from .models import Document, Order, Payment
+from .serializers import DocumentSerializer, OrderSerializer, PaymentSerializer
+
+
+def _with_visible_orders(queryset, user):
+    """Записи заказов, доступных пользователю (менеджеру - все, без подзапроса)"""
+    if user.role == 'manager':
+        return queryset
+    return queryset.filter(order__in=Order.objects.for_user(user).values('pk'))
+
+
+class OrderViewSet(ReadOnlyApiViewSet):
+    serializer_class = OrderSerializer
+
+    def scoped_queryset(self, user):
+        return Order.objects.for_user(user)
+
+
+class DocumentViewSet(ReadOnlyApiViewSet):
+    serializer_class = DocumentSerializer
+
+    def scoped_queryset(self, user):
+        return _with_visible_orders(Document.objects.all(), user)
+
+
+class PaymentViewSet(ReadOnlyApiViewSet):
+    serializer_class = PaymentSerializer
+
+    def scoped_queryset(self, user):
+        return _with_visible_orders(Payment.objects.all(), user)
@@ -0,0 +1,189 @@
+"""
+Пакетная выгрузка документов (счета, акты, договоры, чеки) за период
+
+Документы вместе с заказом и клиентом выбираются одним запросом и
+рендерятся параллельно в пуле процессов (ReportLab держит GIL, поэтому
+потоки здесь не помогают). Результат отдаётся потоком: ZIP-архив
+собирается по мере готовности файлов, в памяти одновременно находится
+не больше BATCH_EXPORT_WORKERS * 2 готовых PDF.
+
+Объединённый PDF требует пакета pypdf (необязательная зависимость);
+страницы при этом накапливаются в одном файле, поэтому для больших
+выгрузок лучше ZIP.
+
+Настройки:
+    BATCH_EXPORT_WORKERS  - число процессов рендеринга (по умолчанию 2,
+                            0 или 1 - рендеринг в текущем процессе)
+"""
+import os
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+
+from . import pdf_jobs
+from .document_generator import document_filename, generate_document_pdf
+from .models import Document
+
+FORMAT_ZIP = 'zip'
+FORMAT_PDF = 'pdf'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def workers():
+    return getattr(settings, 'BATCH_EXPORT_WORKERS', 2)
+
+
+def _init_worker():
+    """Инициализация процесса пула (spawn): поднимаем Django"""
+    import django
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, а не fork: процесс веб-сервера многопоточный и держит
+            # соединения с БД, которые нельзя разделять с дочерним процессом
+            _executor = ProcessPoolExecutor(
+                max_workers=workers(),
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def merge_available():
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ========================================
+# ВЫБОРКА
+# ========================================
+def batch_documents(start_date=None, end_date=None, document_type=None):
+    """Документы за период (по дате документа) со связанными заказом и клиентом"""
+    documents = Document.objects.select_related('order__customer').order_by('document_date', 'document_id')
+    if start_date:
+        documents = documents.filter(document_date__gte=start_date)
+    if end_date:
+        documents = documents.filter(document_date__lte=end_date)
+    if document_type:
+        documents = documents.filter(document_type=document_type)
+    return documents
+
+
+# ========================================
+# РЕНДЕРИНГ
+# ========================================
+def render_document(document):
+    """Рендерит документ (в процессе пула). Связанные объекты уже загружены"""
+    buffer, _ = generate_document_pdf(document)
+    return buffer.getvalue()
+
+
+def _cached(document):
+    """Готовый PDF из хранилища фоновой генерации, если он актуален"""
+    try:
+        with open(pdf_jobs.result_path(pdf_jobs.document_job_id(document)), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def render_documents(documents):
+    """
+    Генератор (имя файла, содержимое PDF) в порядке документов.
+    Одновременно в работе не больше workers() * 2 документов.
+    """
+    if workers() <= 1:
+        for document in documents:
+            data = _cached(document)
+            yield document_filename(document), data if data is not None else render_document(document)
+        return
+
+    executor = _get_executor()
+    window = workers() * 2
+    pending = deque()
+    for document in documents:
+        data = _cached(document)
+        pending.append((document_filename(document), data if data is not None else executor.submit(render_document, document)))
+        if len(pending) >= window:
+            yield _result(pending.popleft())
+    while pending:
+        yield _result(pending.popleft())
+
+
+def _result(item):
+    filename, data = item
+    return filename, data if isinstance(data, bytes) else data.result()
+
+
+# ========================================
+# ПОТОКОВАЯ УПАКОВКА
+# ========================================
+class _StreamBuffer:
+    """Файлоподобный объект без seek: накопленное забирается через drain()"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _unique_names(items):
+    """Одинаковые имена файлов в архиве получают суффикс _2, _3, ..."""
+    seen = {}
+    for filename, data in items:
+        count = seen.get(filename, 0) + 1
+        seen[filename] = count
+        if count > 1:
+            stem, ext = os.path.splitext(filename)
+            filename = f'{stem}_{count}{ext}'
+        yield filename, data
+
+
+def zip_stream(items):
+    """Потоковый ZIP из пар (имя, содержимое): каждый файл отдаётся сразу после записи"""
+    buffer = _StreamBuffer()
+    # PDF уже сжаты внутри, повторное сжатие почти ничего не даёт
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for filename, data in _unique_names(items):
+            archive.writestr(filename, data)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def merged_pdf(items):
+    """Объединяет PDF в один файл (нужен pypdf)"""
+    from io import BytesIO
+
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for _, data in items:
+        for page in PdfReader(BytesIO(data)).pages:
+            writer.add_page(page)
+    output = BytesIO()
+    writer.write(output)
+    output.seek(0)
+    return output
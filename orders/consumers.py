@@ -0,0 +1,50 @@
+"""
+Websocket изменений заказов: /ws/orders/
+
+После подключения пользователь подписан на группы своих заказов (см.
+orders.updates) и получает JSON с текущим статусом, ценой и исполнителем
+заказа при каждом изменении. Подключение без доступа (анонимный
+пользователь, нет профиля клиента) принимается и сразу закрывается с кодом
+4403: отказ в рукопожатии браузер видит как обрыв (1006) и переподключался
+бы, а по 4403 страница прекращает попытки.
+"""
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .updates import groups_for_user
+
+CLOSE_FORBIDDEN = 4403
+
+
+class OrderUpdatesConsumer(AsyncJsonWebsocketConsumer):
+    subscriptions = ()
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self._reject()
+            return
+
+        subscriptions = await database_sync_to_async(groups_for_user)(user)
+        if not subscriptions:
+            await self._reject()
+            return
+        self.subscriptions = subscriptions
+        for group in self.subscriptions:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def _reject(self):
+        await self.accept()
+        await self.close(code=CLOSE_FORBIDDEN)
+
+    async def disconnect(self, code):
+        for group in self.subscriptions:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Канал только для рассылки, сообщения клиента игнорируются
+        pass
+
+    async def order_changed(self, event):
+        await self.send_json(event['order'])
@@ -0,0 +1,139 @@
+"""
+Поддержка счётчиков заказов клиента (CustomerStats)
+
+Сигналы Order вызывают apply_stats_change() с прежним и новым состоянием
+заказа (в транзакции сохранения заказа), и счётчики изменяются на разницу.
+rebuild_customer_stats() пересчитывает их с нуля по таблице orders
+(команда reconcile_customer_stats).
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import CustomerStats, Order
+
+
+# Поля заказа, от которых зависит статистика клиента
+STATS_FIELDS = ('customer_id', 'final_price', 'created_at')
+
+
+def stats_snapshot(order):
+    """Вклад заказа в статистику: (customer_id, сумма, дата создания) или None"""
+    if order.customer_id is None or order.created_at is None:
+        return None
+    return order.customer_id, order.final_price or Decimal('0'), order.created_at
+
+
+def _apply_delta(customer_id, count, total, created_at=None):
+    stats = CustomerStats.objects.filter(customer_id=customer_id)
+    changes = {
+        'orders_count': F('orders_count') + count,
+        'total_spent': F('total_spent') + total,
+    }
+    if created_at is not None:
+        # GREATEST в PostgreSQL пропускает NULL
+        changes['last_order_at'] = Greatest('last_order_at', Value(created_at))
+
+    if stats.update(**changes) or count <= 0:
+        return
+    try:
+        with transaction.atomic():
+            CustomerStats.objects.create(
+                customer_id=customer_id, orders_count=count, total_spent=total, last_order_at=created_at,
+            )
+    except IntegrityError:
+        # Строку успели создать параллельно - повторяем инкремент
+        stats.update(**changes)
+
+
+def _refresh_last_order(customer_id, removed_created_at):
+    """Если убран самый поздний заказ клиента - берём дату предыдущего"""
+    stats = CustomerStats.objects.filter(customer_id=customer_id, last_order_at=removed_created_at)
+    if stats.exists():
+        last = Order.objects.filter(customer_id=customer_id).aggregate(last=Max('created_at'))['last']
+        stats.update(last_order_at=last)
+
+
+def apply_stats_change(before, after):
+    """Переносит вклад заказа из состояния before в after (любое может быть None)"""
+    if before == after:
+        return
+
+    if before is not None and after is not None and before[0] == after[0]:
+        # Тот же клиент - меняется только сумма (и, возможно, дата)
+        _apply_delta(after[0], 0, after[1] - before[1], after[2])
+        if after[2] != before[2]:
+            _refresh_last_order(before[0], before[2])
+        return
+
+    if before is not None:
+        _apply_delta(before[0], -1, -before[1])
+        _refresh_last_order(before[0], before[2])
+    if after is not None:
+        _apply_delta(after[0], 1, after[1], after[2])
+
+
+def aggregate_orders(customer_ids=None):
+    """Счётчики по таблице orders: {customer_id: (кол-во, сумма, последний заказ)}"""
+    orders = Order.objects.filter(customer__isnull=False)
+    if customer_ids is not None:
+        orders = orders.filter(customer_id__in=customer_ids)
+    rows = orders.order_by().values('customer_id').annotate(
+        orders_count=Count('order_id'),
+        total_spent=Coalesce(Sum('final_price'), Value(Decimal('0'))),
+        last_order_at=Max('created_at'),
+    )
+    return {
+        row['customer_id']: (row['orders_count'], row['total_spent'], row['last_order_at'])
+        for row in rows.iterator(chunk_size=5000)
+    }
+
+
+def find_drift():
+    """Клиенты, у которых сохранённые счётчики расходятся с таблицей orders"""
+    expected = aggregate_orders()
+    # Строка с нулём заказов равнозначна отсутствию строки
+    stored = {
+        row[0]: row[1:]
+        for row in CustomerStats.objects.filter(orders_count__gt=0).values_list(
+            'customer_id', 'orders_count', 'total_spent', 'last_order_at',
+        ).iterator(chunk_size=5000)
+    }
+    return sorted(
+        customer_id for customer_id in expected.keys() | stored.keys()
+        if expected.get(customer_id) != stored.get(customer_id)
+    )
+
+
+def rebuild_customer_stats(customer_ids=None):
+    """Пересчитывает счётчики клиентов (всех или перечисленных) по таблице orders"""
+    expected = aggregate_orders(customer_ids)
+    stats = CustomerStats.objects.all()
+    if customer_ids is not None:
+        stats = stats.filter(customer_id__in=customer_ids)
+
+    with transaction.atomic():
+        stats.delete()
+        CustomerStats.objects.bulk_create(
+            (
+                CustomerStats(
+                    customer_id=customer_id, orders_count=count,
+                    total_spent=total, last_order_at=last_order_at,
+                )
+                for customer_id, (count, total, last_order_at) in expected.items()
+            ),
+            batch_size=5000,
+        )
+    return len(expected)
+
+
+def stats_for(customer_ids):
+    """Счётчики для списка клиентов одним запросом по первичному ключу"""
+    return CustomerStats.objects.in_bulk(list(customer_ids))
+
+
+async def astats_for(customer_ids):
+    """Асинхронный stats_for (для async views)"""
+    return await CustomerStats.objects.ain_bulk(list(customer_ids))
@@ -1,24 +1,16 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
 from io import BytesIO
 from datetime import datetime
-import os
-
-# Регистрируем шрифты
-try:
-    windows_fonts_path = r'C:\Windows\Fonts'
-    pdfmetrics.registerFont(TTFont('Arial', os.path.join(windows_fonts_path, 'arial.ttf')))
-    pdfmetrics.registerFont(TTFont('Arial-Bold', os.path.join(windows_fonts_path, 'arialbd.ttf')))
-    FONT_NAME = 'Arial'
-    FONT_NAME_BOLD = 'Arial-Bold'
-except:
-    FONT_NAME = 'Helvetica'
-    FONT_NAME_BOLD = 'Helvetica-Bold'
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from .pdf_styles import registry
+
+# Версия макетов документов: увеличьте при изменении вёрстки,
+# чтобы сохранённые PDF сгенерировались заново
+GENERATOR_VERSION = '2'
 
 # Реквизиты компании
 COMPANY_NAME = "ООО «JEWEllUX»"
@@ -36,80 +28,88 @@ DIRECTOR_NAME = "Генеральный директор"
 DIRECTOR_FIO = "АБдурахманов Г.Г."
 
 
+# ========================================
+# СУММА ПРОПИСЬЮ
+# ========================================
+UNITS = ('', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять')
+UNITS_FEM = ('', 'одна', 'две', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять')
+TEENS = ('десять', 'одиннадцать', 'двенадцать', 'тринадцать', 'четырнадцать',
+         'пятнадцать', 'шестнадцать', 'семнадцать', 'восемнадцать', 'девятнадцать')
+TENS = ('', '', 'двадцать', 'тридцать', 'сорок', 'пятьдесят',
+        'шестьдесят', 'семьдесят', 'восемьдесят', 'девяносто')
+HUNDREDS = ('', 'сто', 'двести', 'триста', 'четыреста',
+            'пятьсот', 'шестьсот', 'семьсот', 'восемьсот', 'девятьсот')
+
+# Разряды: (множитель, формы для 1 / 2-4 / 5-20, женский род)
+SCALES = (
+    (10 ** 9, ('миллиард', 'миллиарда', 'миллиардов'), False),
+    (10 ** 6, ('миллион', 'миллиона', 'миллионов'), False),
+    (10 ** 3, ('тысяча', 'тысячи', 'тысяч'), True),
+)
+RUBLE_FORMS = ('рубль', 'рубля', 'рублей')
+KOPEK_FORMS = ('копейка', 'копейки', 'копеек')
+MAX_NUMBER = 10 ** 12 - 1
+
+
+def _triad(num, units):
+    """Число 0..999 словами"""
+    words = [HUNDREDS[num // 100]]
+    remainder = num % 100
+    if 10 <= remainder <= 19:
+        words.append(TEENS[remainder - 10])
+    else:
+        words += [TENS[remainder // 10], units[remainder % 10]]
+    return ' '.join(word for word in words if word)
+
+
+# Все трёхзначные группы в мужском и женском роде - собираются один раз
+TRIADS = tuple(_triad(num, UNITS) for num in range(1000))
+TRIADS_FEM = tuple(_triad(num, UNITS_FEM) for num in range(1000))
+
+
+def plural_ru(number, forms):
+    """Форма слова для числа: (1 рубль, 2 рубля, 5 рублей)"""
+    number = abs(number) % 100
+    if 11 <= number <= 19:
+        return forms[2]
+    number %= 10
+    if number == 1:
+        return forms[0]
+    if 2 <= number <= 4:
+        return forms[1]
+    return forms[2]
+
+
+@lru_cache(maxsize=4096)
 def num_to_words_ru(number):
-    """Конвертирует число в пропись на русском"""
-    if number == 0:
-        return 'ноль'
-    
-    units = ['', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять']
-    units_fem = ['', 'одна', 'две', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять']
-    teens = ['десять', 'одиннадцать', 'двенадцать', 'тринадцать', 'четырнадцать', 
-             'пятнадцать', 'шестнадцать', 'семнадцать', 'восемнадцать', 'девятнадцать']
-    tens = ['', '', 'двадцать', 'тридцать', 'сорок', 'пятьдесят', 
-            'шестьдесят', 'семьдесят', 'восемьдесят', 'девяносто']
-    hundreds = ['', 'сто', 'двести', 'триста', 'четыреста', 
-                'пятьсот', 'шестьсот', 'семьсот', 'восемьсот', 'девятьсот']
-    
-    def convert_below_thousand(num, use_feminine=False):
-        """Конвертирует числа до 999"""
-        result = []
-        
-        # Сотни
-        h = num // 100
-        if h > 0:
-            result.append(hundreds[h])
-        
-        # Десятки и единицы
-        remainder = num % 100
-        
-        if 10 <= remainder <= 19:
-            # От 10 до 19
-            result.append(teens[remainder - 10])
-        else:
-            # Десятки
-            t = remainder // 10
-            if t > 0:
-                result.append(tens[t])
-            
-            # Единицы
-            u = remainder % 10
-            if u > 0:
-                unit_list = units_fem if use_feminine else units
-                result.append(unit_list[u])
-        
-        return ' '.join(result)
-    
+    """Конвертирует целое число (до триллиона) в пропись на русском"""
     num = int(number)
+    if num == 0:
+        return 'ноль'
+    if num < 0:
+        return 'минус ' + num_to_words_ru(-num)
+    if num > MAX_NUMBER:
+        raise ValueError(f'Число {num} слишком большое для прописи')
+
     result = []
-    
-    # Миллионы
-    millions = num // 1000000
-    if millions > 0:
-        result.append(convert_below_thousand(millions))
-        if millions % 10 == 1 and millions % 100 != 11:
-            result.append('миллион')
-        elif 2 <= millions % 10 <= 4 and not (11 <= millions % 100 <= 14):
-            result.append('миллиона')
-        else:
-            result.append('миллионов')
-    
-    # Тысячи
-    thousands = (num % 1000000) // 1000
-    if thousands > 0:
-        result.append(convert_below_thousand(thousands, use_feminine=True))
-        if thousands % 10 == 1 and thousands % 100 != 11:
-            result.append('тысяча')
-        elif 2 <= thousands % 10 <= 4 and not (11 <= thousands % 100 <= 14):
-            result.append('тысячи')
-        else:
-            result.append('тысяч')
-    
-    # Остаток
-    remainder = num % 1000
-    if remainder > 0:
-        result.append(convert_below_thousand(remainder))
-    
-    return ' '.join(result).strip() if result else 'ноль'
+    for scale, forms, feminine in SCALES:
+        group = num // scale % 1000
+        if group:
+            result.append((TRIADS_FEM if feminine else TRIADS)[group])
+            result.append(plural_ru(group, forms))
+
+    if num % 1000:
+        result.append(TRIADS[num % 1000])
+
+    return ' '.join(result)
+
+
+def amount_to_words_ru(amount):
+    """Сумма прописью: "одна тысяча двести рублей 50 копеек" """
+    kopeks_total = int((Decimal(str(amount or 0)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+    rubles, kopeks = divmod(kopeks_total, 100)
+    return (f'{num_to_words_ru(rubles)} {plural_ru(rubles, RUBLE_FORMS)} '
+            f'{kopeks:02d} {plural_ru(kopeks, KOPEK_FORMS)}')
 
 
 def generate_invoice_pdf(order, document):
@@ -120,17 +120,12 @@ def generate_invoice_pdf(order, document):
                             topMargin=10*mm, bottomMargin=15*mm)
     
     elements = []
-    styles = getSampleStyleSheet()
+    styles = registry()
     
     # Стили
-    normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'],
-                                   fontName=FONT_NAME, fontSize=9, leading=11)
-    
-    bold_style = ParagraphStyle('CustomBold', parent=styles['Normal'],
-                                 fontName=FONT_NAME_BOLD, fontSize=9, leading=11)
-    
-    small_style = ParagraphStyle('Small', parent=styles['Normal'],
-                                  fontName=FONT_NAME, fontSize=8, leading=10)
+    normal_style = styles.paragraph['invoice.normal']
+    bold_style = styles.paragraph['invoice.bold']
+    small_style = styles.paragraph['invoice.small']
     
     # === БАНКОВСКИЕ РЕКВИЗИТЫ (верхняя таблица) ===
     bank_data = [
@@ -150,29 +145,12 @@ def generate_invoice_pdf(order, document):
     ]
     
     bank_table = Table(bank_data, colWidths=[90*mm, 30*mm, 60*mm])
-    bank_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('SPAN', (0, 0), (0, 1)),
-        ('SPAN', (1, 0), (2, 0)),
-        ('SPAN', (1, 1), (2, 1)),
-        ('SPAN', (0, 2), (2, 2)),
-        ('SPAN', (0, 3), (0, 4)),
-        ('SPAN', (1, 3), (1, 4)),
-        ('SPAN', (2, 3), (2, 3)),
-        ('SPAN', (0, 5), (2, 5)),
-        ('SPAN', (0, 6), (2, 6)),
-    ]))
+    bank_table.setStyle(styles.table['invoice.bank'])
     elements.append(bank_table)
     elements.append(Spacer(1, 10*mm))
     
     # === ЗАГОЛОВОК СЧЁТА ===
-    title_style = ParagraphStyle('Title', parent=styles['Normal'],
-                                  fontName=FONT_NAME_BOLD, fontSize=16, 
-                                  alignment=1, spaceAfter=10)
+    title_style = styles.paragraph['invoice.title']
     
     elements.append(Paragraph(f"Счет № {document.document_number} от {document.document_date.strftime('%d.%m.%Y')} г.", title_style))
     elements.append(Spacer(1, 5*mm))
@@ -186,13 +164,7 @@ def generate_invoice_pdf(order, document):
     ]
     
     info_table = Table(info_data, colWidths=[30*mm, 150*mm])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 2),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-    ]))
+    info_table.setStyle(styles.table['invoice.info'])
     elements.append(info_table)
     elements.append(Spacer(1, 5*mm))
     
@@ -228,16 +200,7 @@ def generate_invoice_pdf(order, document):
     ]
     
     services_table = Table(services_data, colWidths=[10*mm, 80*mm, 20*mm, 15*mm, 30*mm, 30*mm])
-    services_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-    ]))
+    services_table.setStyle(styles.table['invoice.services'])
     elements.append(services_table)
     elements.append(Spacer(1, 3*mm))
     
@@ -249,24 +212,15 @@ def generate_invoice_pdf(order, document):
     ]
     
     total_table = Table(total_data, colWidths=[10*mm, 80*mm, 20*mm, 15*mm, 30*mm, 30*mm])
-    total_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
-        ('SPAN', (0, 0), (3, 0)),
-        ('SPAN', (0, 1), (3, 1)),
-        ('SPAN', (0, 2), (3, 2)),
-    ]))
+    total_table.setStyle(styles.table['invoice.total'])
     elements.append(total_table)
     elements.append(Spacer(1, 5*mm))
     
     # === СУММА ПРОПИСЬЮ ===
-    rubles = int(price)
-    kopeks = int((price - rubles) * 100)
-    amount_words = num_to_words_ru(rubles).capitalize()
+    amount_words = amount_to_words_ru(price).capitalize()
     
     elements.append(Paragraph(f"Всего наименований 1, на сумму {price:.2f} руб.", normal_style))
-    elements.append(Paragraph(f"<b>{amount_words} рублей {kopeks:02d} копеек</b>", bold_style))
+    elements.append(Paragraph(f"<b>{amount_words}</b>", bold_style))
     elements.append(Spacer(1, 10*mm))
     
     # === ПОДПИСИ ===
@@ -276,11 +230,7 @@ def generate_invoice_pdf(order, document):
     ]
     
     signature_table = Table(signature_data, colWidths=[40*mm, 100*mm, 45*mm])
-    signature_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    signature_table.setStyle(styles.table['invoice.signature'])
     elements.append(signature_table)
     
     doc.build(elements)
@@ -296,18 +246,12 @@ def generate_act_pdf(order, document):
                             topMargin=15*mm, bottomMargin=15*mm)
     
     elements = []
-    styles = getSampleStyleSheet()
+    styles = registry()
     
     # Стили
-    normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'],
-                                   fontName=FONT_NAME, fontSize=10, leading=14)
-    
-    bold_style = ParagraphStyle('CustomBold', parent=styles['Normal'],
-                                 fontName=FONT_NAME_BOLD, fontSize=10, leading=14)
-    
-    title_style = ParagraphStyle('Title', parent=styles['Normal'],
-                                  fontName=FONT_NAME_BOLD, fontSize=14, 
-                                  alignment=1, spaceAfter=15)
+    normal_style = styles.paragraph['act.normal']
+    bold_style = styles.paragraph['act.bold']
+    title_style = styles.paragraph['act.title']
     
     # === ЗАГОЛОВОК ===
     elements.append(Paragraph(f"Акт № {document.document_number} от «{document.document_date.strftime('%d')}» {document.document_date.strftime('%B')} {document.document_date.year} г.", title_style))
@@ -357,16 +301,7 @@ def generate_act_pdf(order, document):
     ]
     
     services_table = Table(services_data, colWidths=[10*mm, 80*mm, 20*mm, 15*mm, 30*mm, 30*mm])
-    services_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-    ]))
+    services_table.setStyle(styles.table['act.services'])
     elements.append(services_table)
     elements.append(Spacer(1, 3*mm))
     
@@ -377,23 +312,15 @@ def generate_act_pdf(order, document):
     ]
     
     total_table = Table(total_data, colWidths=[10*mm, 80*mm, 20*mm, 15*mm, 30*mm, 30*mm])
-    total_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
-        ('SPAN', (0, 0), (3, 0)),
-        ('SPAN', (0, 1), (3, 1)),
-    ]))
+    total_table.setStyle(styles.table['act.total'])
     elements.append(total_table)
     elements.append(Spacer(1, 5*mm))
     
     # === СУММА ПРОПИСЬЮ ===
-    rubles = int(price)
-    kopeks = int((price - rubles) * 100)
-    amount_words = num_to_words_ru(rubles).capitalize()
+    amount_words = amount_to_words_ru(price).capitalize()
     
     elements.append(Paragraph(f"Всего оказано услуг 1, на сумму {price:.2f} руб.", normal_style))
-    elements.append(Paragraph(f"<b>{amount_words} рублей {kopeks:02d} копеек</b>", bold_style))
+    elements.append(Paragraph(f"<b>{amount_words}</b>", bold_style))
     elements.append(Spacer(1, 10*mm))
     
     # === ЗАКЛЮЧЕНИЕ ===
@@ -410,12 +337,7 @@ def generate_act_pdf(order, document):
     ]
     
     signature_table = Table(signature_data, colWidths=[80*mm, 10*mm, 80*mm])
-    signature_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('SPAN', (0, 1), (1, 1)),
-    ]))
+    signature_table.setStyle(styles.table['act.signature'])
     elements.append(signature_table)
     
     doc.build(elements)
@@ -431,19 +353,13 @@ def generate_contract_pdf(order, document):
                             topMargin=15*mm, bottomMargin=15*mm)
     
     elements = []
-    styles = getSampleStyleSheet()
+    styles = registry()
     price = document.amount if document.amount is not None else (order.final_price or order.budget or 0)
     
     # Стили
-    normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'],
-                                   fontName=FONT_NAME, fontSize=11, leading=15)
-    
-    bold_style = ParagraphStyle('CustomBold', parent=styles['Normal'],
-                                 fontName=FONT_NAME_BOLD, fontSize=11, leading=15)
-    
-    title_style = ParagraphStyle('Title', parent=styles['Normal'],
-                                  fontName=FONT_NAME_BOLD, fontSize=14, 
-                                  alignment=1, spaceAfter=20)
+    normal_style = styles.paragraph['contract.normal']
+    bold_style = styles.paragraph['contract.bold']
+    title_style = styles.paragraph['contract.title']
     
     # === ЗАГОЛОВОК ===
     elements.append(Paragraph("ДОГОВОР", title_style))
@@ -486,7 +402,7 @@ def generate_contract_pdf(order, document):
     
     subject_text += f"""
     1.3. Стоимость работ по изготовлению Изделия составляет <b>{price or 0:.2f} (
-    {num_to_words_ru(int(price or 0))} рублей 00 копеек)</b>.
+    {amount_to_words_ru(price)})</b>.
     """
     
     elements.append(Paragraph(subject_text, normal_style))
@@ -551,11 +467,7 @@ def generate_contract_pdf(order, document):
     ]
     
     details_table = Table(details_data, colWidths=[85*mm, 85*mm])
-    details_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    details_table.setStyle(styles.table['contract.details'])
     elements.append(details_table)
     
     doc.build(elements)
@@ -570,26 +482,12 @@ def generate_receipt_pdf(order, document):
                             topMargin=15*mm, bottomMargin=15*mm)
     
     elements = []
-    styles = getSampleStyleSheet()
+    styles = registry()
 
     # Стили
-    normal_style = ParagraphStyle('CustomNormal',
-        parent=styles['Normal'],
-        fontName=FONT_NAME,
-        fontSize=10,
-        leading=13
-    )
-    bold_style = ParagraphStyle('CustomBold',
-        parent=styles['Normal'],
-        fontName=FONT_NAME_BOLD,
-        fontSize=10,
-        leading=13
-    )
-    center_style = ParagraphStyle('CenterBold',
-        parent=bold_style,
-        alignment=1,
-        spaceAfter=10
-    )
+    normal_style = styles.paragraph['receipt.normal']
+    bold_style = styles.paragraph['receipt.bold']
+    center_style = styles.paragraph['receipt.center']
 
     # === ЗАГОЛОВОК ===
     elements.append(Paragraph("КАССОВЫЙ ЧЕК", center_style))
@@ -632,24 +530,13 @@ def generate_receipt_pdf(order, document):
          Paragraph(f'{price:.2f}', normal_style), Paragraph(f'{price:.2f}', normal_style)]
     ]
     items_table = Table(items_data, colWidths=[85*mm, 20*mm, 35*mm, 35*mm])
-    items_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-    ]))
+    items_table.setStyle(styles.table['receipt.items'])
     elements.append(items_table)
     elements.append(Spacer(1, 5*mm))
 
     # === ИТОГО ===
     elements.append(Paragraph(f"<b>Итого к оплате:</b> {price:.2f} руб.", bold_style))
-    rubles = int(price)
-    kopeks = int((price - rubles) * 100)
-    amount_words = num_to_words_ru(rubles).capitalize()
-    elements.append(Paragraph(f"{amount_words} рублей {kopeks:02d} копеек", normal_style))
+    elements.append(Paragraph(amount_to_words_ru(price).capitalize(), normal_style))
     elements.append(Spacer(1, 5*mm))
 
     # === СПОСОБ ОПЛАТЫ ===
@@ -677,38 +564,10 @@ def generate_brief_pdf(order):
                            topMargin=15*mm, bottomMargin=15*mm)
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # ========================================
-    # СТИЛИ С ИСПОЛЬЗОВАНИЕМ ГЛОБАЛЬНЫХ ШРИФТОВ
-    # ========================================
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontName=FONT_NAME_BOLD,
-        fontSize=18,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=12,
-        alignment=1  # Центр
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontName=FONT_NAME_BOLD,
-        fontSize=14,
-        textColor=colors.HexColor('#d4af37'),
-        spaceAfter=10,
-        spaceBefore=15
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontName=FONT_NAME,
-        fontSize=11,
-        leading=16
-    )
+    styles = registry()
+    title_style = styles.paragraph['brief.title']
+    heading_style = styles.paragraph['brief.heading']
+    normal_style = styles.paragraph['brief.normal']
     
     # ========================================
     # ЗАГОЛОВОК
@@ -733,18 +592,7 @@ def generate_brief_pdf(order):
         info_data.append(['Исполнитель:', order.user.get_full_name() or order.user.username])
     
     info_table = Table(info_data, colWidths=[60*mm, 110*mm])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), FONT_NAME_BOLD),
-        ('FONTNAME', (1, 0), (1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    info_table.setStyle(styles.table['brief.key_value'])
     story.append(info_table)
     story.append(Spacer(1, 8*mm))
     
@@ -763,17 +611,7 @@ def generate_brief_pdf(order):
         client_data.append(['Email:', customer.email])
     
     client_table = Table(client_data, colWidths=[60*mm, 110*mm])
-    client_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), FONT_NAME_BOLD),
-        ('FONTNAME', (1, 0), (1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    client_table.setStyle(styles.table['brief.key_value'])
     story.append(client_table)
     story.append(Spacer(1, 8*mm))
     
@@ -809,17 +647,7 @@ def generate_brief_pdf(order):
     ]
     
     spec_table = Table(spec_data, colWidths=[60*mm, 110*mm])
-    spec_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), FONT_NAME_BOLD),
-        ('FONTNAME', (1, 0), (1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    spec_table.setStyle(styles.table['brief.key_value'])
     story.append(spec_table)
     story.append(Spacer(1, 8*mm))
     
@@ -850,17 +678,7 @@ def generate_brief_pdf(order):
     
     if params_data:
         params_table = Table(params_data, colWidths=[60*mm, 110*mm])
-        params_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), FONT_NAME_BOLD),
-            ('FONTNAME', (1, 0), (1, -1), FONT_NAME),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
+        params_table.setStyle(styles.table['brief.key_value'])
         story.append(params_table)
     else:
         story.append(Paragraph("Параметры не указаны", normal_style))
@@ -884,4 +702,34 @@ def generate_brief_pdf(order):
     # Генерация PDF
     doc.build(story)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
+
+
+# ========================================
+# ВЫБОР ГЕНЕРАТОРА ПО ТИПУ ДОКУМЕНТА
+# ========================================
+DOCUMENT_GENERATORS = {
+    'invoice': (generate_invoice_pdf, 'Счёт'),
+    'act': (generate_act_pdf, 'Акт'),
+    'contract': (generate_contract_pdf, 'Договор'),
+    'receipt': (generate_receipt_pdf, 'Чек'),
+}
+
+
+def generate_document_pdf(document):
+    """Генерирует PDF документа по его типу. Возвращает (buffer, имя файла)"""
+    generator, _ = DOCUMENT_GENERATORS.get(document.document_type, (generate_invoice_pdf, None))
+    return generator(document.order, document), document_filename(document)
+
+
+def document_filename(document):
+    """Имя файла документа для скачивания"""
+    _, prefix = DOCUMENT_GENERATORS.get(document.document_type, (None, 'Документ'))
+    return f"{prefix}_{document.document_number}.pdf"
+
+
+def brief_filename(order, on_date=None):
+    """Имя файла ТЗ для модельера"""
+    on_date = on_date or datetime.now()
+    return f"ТЗ_Заказ_{order.order_id}_{on_date.strftime('%Y%m%d')}.pdf"
+
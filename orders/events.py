@@ -0,0 +1,143 @@
+"""
+Журнал изменений заказа (OrderEvent) и длительность этапов
+
+Сигналы Order сравнивают статус, окончательную цену и исполнителя до и
+после сохранения и добавляют в order_events по строке на каждое изменение
+(одним bulk_create, в транзакции сохранения заказа). Строки журнала не
+изменяются и не удаляются.
+
+Этап заказа - интервал между событием статуса и следующим событием
+статуса того же заказа. Длительности считаются в БД оконной функцией LEAD
+по индексу (order_id, ts), поэтому сводка по тысячам заказов - один запрос.
+Этапы до начала ведения журнала в расчёт не попадают.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import Lead
+from django.utils import timezone
+
+from .models import OrderEvent
+from .rollup import day_bounds
+
+# Поле заказа -> вид события
+EVENT_FIELDS = {
+    'order_status': OrderEvent.KIND_STATUS,
+    'final_price': OrderEvent.KIND_PRICE,
+    'user_id': OrderEvent.KIND_ASSIGNEE,
+}
+
+StageInterval = namedtuple('StageInterval', ['order_id', 'stage', 'entered_at', 'left_at'])
+StageDuration = namedtuple('StageDuration', ['stage', 'count', 'avg', 'median', 'p90', 'max'])
+
+
+def event_snapshot(order):
+    """Значения отслеживаемых полей заказа"""
+    return {field: getattr(order, field) for field in EVENT_FIELDS}
+
+
+def _as_text(value):
+    return None if value is None else str(value)
+
+
+def record_changes(order_id, before, after, actor_id=None):
+    """
+    Добавляет события для изменившихся полей (before=None - заказ создан:
+    пишутся заполненные поля). Возвращает список созданных событий.
+    """
+    ts = timezone.now()
+    events = []
+    for field, kind in EVENT_FIELDS.items():
+        old = before[field] if before is not None else None
+        new = after[field]
+        if old == new:
+            continue
+        events.append(OrderEvent(
+            order_id=order_id, ts=ts, kind=kind,
+            old_value=_as_text(old), new_value=_as_text(new), actor_id=actor_id,
+        ))
+    if events:
+        OrderEvent.objects.bulk_create(events)
+    return events
+
+
+def order_timeline(order_id):
+    """События заказа по времени"""
+    return OrderEvent.objects.filter(order_id=order_id).order_by('ts', 'id')
+
+
+def stage_intervals(order_ids, chunk_size=5000):
+    """
+    Этапы перечисленных заказов: (order_id, статус, вход, выход или None
+    для текущего этапа). Потоково, без загрузки всего результата в память.
+    """
+    rows = OrderEvent.objects.filter(
+        kind=OrderEvent.KIND_STATUS, order_id__in=list(order_ids),
+    ).annotate(
+        left_at=Window(Lead('ts'), partition_by=[F('order_id')], order_by=[F('ts').asc(), F('id').asc()]),
+    ).order_by('order_id', 'ts', 'id').values_list('order_id', 'new_value', 'ts', 'left_at')
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield StageInterval(*row)
+
+
+STAGE_DURATIONS_SQL = """
+    WITH transitions AS (
+        SELECT
+            new_value AS stage,
+            ts AS entered_at,
+            LEAD(ts) OVER (PARTITION BY order_id ORDER BY ts, id) AS left_at
+        FROM order_events
+        WHERE kind = %s {order_filter}
+    ),
+    durations AS (
+        SELECT stage, EXTRACT(EPOCH FROM left_at - entered_at) AS seconds
+        FROM transitions
+        WHERE left_at IS NOT NULL {period_filter}
+    )
+    SELECT
+        stage,
+        COUNT(*),
+        AVG(seconds),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY seconds),
+        MAX(seconds)
+    FROM durations
+    GROUP BY stage
+"""
+
+
+def _seconds(value):
+    return timedelta(seconds=float(value)) if value is not None else None
+
+
+def stage_durations(order_ids=None, start_date=None, end_date=None):
+    """
+    Сводка по завершённым этапам: количество, среднее, медиана, 90-й
+    перцентиль и максимум длительности (timedelta) для каждого статуса.
+
+    order_ids - только эти заказы; start_date/end_date - этапы,
+    завершившиеся в период (включительно).
+    """
+    params = [OrderEvent.KIND_STATUS]
+    order_filter = period_filter = ''
+    if order_ids is not None:
+        order_filter = 'AND order_id = ANY(%s)'
+        params.append(list(order_ids))
+    if start_date is not None:
+        period_filter += ' AND left_at >= %s'
+        params.append(day_bounds(start_date, start_date)[0])
+    if end_date is not None:
+        period_filter += ' AND left_at < %s'
+        params.append(day_bounds(end_date, end_date)[1])
+
+    sql = STAGE_DURATIONS_SQL.format(order_filter=order_filter, period_filter=period_filter)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        StageDuration(stage, count, _seconds(avg), _seconds(median), _seconds(p90), _seconds(longest))
+        for stage, count, avg, median, p90, longest in rows
+    ]
@@ -120,6 +120,18 @@ class OrderCreateForm(forms.ModelForm):
         ]
 
 
+class PriceQuoteForm(forms.Form):
+    """Параметры предварительного расчёта цены (GET-запрос формы создания заказа)"""
+    order_type = forms.ChoiceField(choices=Order.ORDER_TYPE_CHOICES)
+    product_type = forms.ChoiceField(choices=Order.PRODUCT_TYPE_CHOICES)
+    material = forms.ChoiceField(choices=OrderCreateForm.MATERIAL_CHOICES[1:])
+    ring_size = forms.CharField(max_length=10, required=False)
+    desired_weight = forms.DecimalField(max_digits=6, decimal_places=2, required=False)
+
+    def clean_ring_size(self):
+        return self.cleaned_data['ring_size'] or None
+
+
 class OrderUpdateForm(forms.ModelForm):
     ORDER_STATUS_CHOICES = [
         ('new', 'Новый'),
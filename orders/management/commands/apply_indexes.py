@@ -0,0 +1,43 @@
+"""
+Создание индексов, объявленных в Meta.indexes неуправляемых моделей
+
+    python manage.py apply_indexes                # создать недостающие
+    python manage.py apply_indexes --dry-run      # только показать SQL
+    python manage.py apply_indexes orders         # только для приложения orders
+
+Индексы строятся CONCURRENTLY, без блокировки записи. Команда идемпотентна:
+уже существующие индексы (по имени) пропускаются.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jewelry_crm.schema import create_index, create_sql, missing_indexes
+
+
+class Command(BaseCommand):
+    help = 'Создаёт индексы из Meta.indexes для таблиц, не управляемых миграциями'
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_labels', nargs='*', help='Приложения (по умолчанию все)')
+        parser.add_argument('--dry-run', action='store_true', help='Только вывести SQL')
+
+    def handle(self, *args, **options):
+        pending = list(missing_indexes(options['app_labels'] or None))
+        if not pending:
+            self.stdout.write(self.style.SUCCESS('Все объявленные индексы уже созданы'))
+            return
+
+        tables = set()
+        for model, index in pending:
+            if options['dry_run']:
+                self.stdout.write(f'{create_sql(model, index)};')
+                continue
+            self.stdout.write(f'  {model._meta.db_table}: {index.name} ...')
+            create_index(model, index)
+            tables.add(model._meta.db_table)
+
+        if tables:
+            with connection.cursor() as cursor:
+                for table in sorted(tables):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+            self.stdout.write(self.style.SUCCESS(f'Создано индексов: {len(pending)}'))
@@ -0,0 +1,307 @@
+"""
+Замеры производительности: количество запросов и время выполнения
+
+Использование:
+    python manage.py benchmark reports --start 2024-01-01 --end 2024-12-31
+    python manage.py benchmark pdf_setup --repeat 50
+    python manage.py benchmark num_to_words
+    python manage.py benchmark customer_search --query иванов
+    python manage.py benchmark customer_stats
+    python manage.py benchmark stage_durations --start 2024-01-01 --end 2024-12-31
+    python manage.py benchmark cycle_times   # после seed_orders --count 1000000 --with-events
+    python manage.py benchmark reprice --repeat 1   # после seed_orders --count 500000
+    python manage.py benchmark price_quote --repeat 20
+    python manage.py benchmark api --page-size 10000   # после seed_orders
+    python manage.py benchmark batch_export --start 2024-01-01 --end 2024-01-31 --repeat 1
+"""
+import itertools
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Document, Order
+
+
+def measure(func, repeat):
+    """Запускает func repeat раз, возвращает (запросов за прогон, список времён в мс)"""
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(ctx.captured_queries)
+    return queries, timings
+
+
+# ========================================
+# СЦЕНАРИИ
+# ========================================
+
+def _legacy_report(orders):
+    """Прежняя реализация отчёта (семь отдельных запросов) - для сравнения"""
+    orders.count()
+    orders.filter(final_price__isnull=False).aggregate(total=Sum('final_price'))
+    list(orders.values('order_status').annotate(count=Count('order_id')).order_by('-count'))
+    list(orders.values('product_type').annotate(count=Count('order_id')).order_by('-count'))
+    list(orders.values('order_type').annotate(count=Count('order_id')).order_by('-count'))
+    list(orders.values('customer__name', 'customer__surname').annotate(
+        count=Count('order_id'), total_spent=Sum('final_price')
+    ).order_by('-total_spent')[:5])
+    orders.filter(final_price__isnull=False, final_price__gt=0).count()
+
+
+def bench_reports(options):
+    from orders.reports import generate_period_report, generate_report_data
+
+    start, end = options['start'], options['end']
+    orders = Order.objects.filter(created_at__date__gte=start, created_at__date__lte=end)
+
+    yield 'legacy (7 запросов)', lambda: _legacy_report(orders)
+    yield 'generate_report_data (orders)', lambda: generate_report_data(orders)
+    yield 'generate_period_report (rollup)', lambda: generate_period_report(start, end)
+
+
+def _legacy_pdf_setup(font, bold):
+    """Прежняя подготовка к генерации: таблица стилей и все стили на каждый документ"""
+    from orders import pdf_styles
+    pdf_styles._build_paragraph_styles(font, bold)
+    pdf_styles._build_table_styles(font, bold)
+
+
+def bench_pdf_setup(options):
+    from orders.document_generator import generate_document_pdf
+    from orders.pdf_styles import registry
+
+    styles = registry()
+    yield 'стили на каждый документ (прежде)', lambda: _legacy_pdf_setup(styles.font, styles.font_bold)
+    yield 'общий реестр стилей', registry
+
+    document = Document.objects.select_related('order__customer').first()
+    if document is not None:
+        yield f'generate_document_pdf ({document.document_type})', lambda: generate_document_pdf(document)
+
+
+def bench_batch_export(options):
+    from orders import batch_export
+
+    documents = batch_export.batch_documents(options['start'], options['end'])
+
+    def export():
+        for _ in batch_export.zip_stream(batch_export.render_documents(documents.iterator())):
+            pass
+
+    yield f'ZIP, процессов: {batch_export.workers()}', export
+
+
+def bench_num_to_words(options):
+    import random
+
+    from orders.document_generator import amount_to_words_ru, num_to_words_ru
+
+    rng = random.Random(0)
+    amounts = [rng.randint(0, 5000000) / 100 for _ in range(10000)]
+
+    def convert():
+        for amount in amounts:
+            amount_to_words_ru(amount)
+
+    def convert_cold():
+        num_to_words_ru.cache_clear()
+        convert()
+
+    yield 'сумма прописью x10000 (без кэша)', convert_cold
+    yield 'сумма прописью x10000 (кэш)', convert
+
+
+def bench_customer_search(options):
+    from django.db.models import Q
+
+    from accounts.models import Customer
+    from accounts.search import SEARCH_PAGE_SIZE, search_customers
+
+    query = options['query']
+
+    def legacy():
+        list(Customer.objects.filter(
+            Q(name__icontains=query) | Q(surname__icontains=query) |
+            Q(email__icontains=query) | Q(phone__icontains=query)
+        ).annotate(orders_count=Count('order')))
+
+    yield 'icontains x4 + Count (прежде)', legacy
+    yield 'search_text + pg_trgm, 1 страница', lambda: list(search_customers(query)[:SEARCH_PAGE_SIZE])
+
+
+def bench_customer_stats(options):
+    from orders.customer_stats import stats_for
+
+    customer_ids = list(
+        Order.objects.filter(customer__isnull=False).order_by()
+        .values_list('customer_id', flat=True).distinct()[:50]
+    )
+
+    def legacy():
+        dict(
+            Order.objects.filter(customer_id__in=customer_ids)
+            .values_list('customer_id').annotate(count=Count('order_id')).order_by()
+        )
+
+    yield 'Count по orders, 50 клиентов (прежде)', legacy
+    yield 'customer_stats по ключу, 50 клиентов', lambda: stats_for(customer_ids)
+
+
+def bench_stage_durations(options):
+    from orders.events import stage_durations, stage_intervals
+
+    order_ids = list(
+        Order.objects.filter(created_at__date__gte=options['start'], created_at__date__lte=options['end'])
+        .values_list('order_id', flat=True)
+    )
+
+    yield f'сводка по этапам, {len(order_ids)} заказов', lambda: stage_durations(order_ids)
+    yield 'сводка по этапам за период', lambda: stage_durations(start_date=options['start'], end_date=options['end'])
+    yield f'интервалы этапов, {len(order_ids)} заказов', lambda: sum(1 for _ in stage_intervals(order_ids))
+
+
+def bench_cycle_times(options):
+    from orders.analytics import cycle_time_report
+    from orders.models import OrderEvent
+    from orders.rollup import day_bounds
+
+    start, end = options['start'], options['end']
+
+    def python_percentiles():
+        # Выгрузка переходов в Python и расчёт перцентилей на стороне приложения
+        period_start, period_end = day_bounds(start, end)
+        delivered = dict(
+            OrderEvent.objects.filter(
+                kind=OrderEvent.KIND_STATUS, new_value='delivered',
+                ts__gte=period_start, ts__lt=period_end,
+            ).values_list('order_id', 'ts')
+        )
+        by_type = {}
+        for order_id, product_type, created_at in Order.objects.filter(
+            order_id__in=list(delivered),
+        ).values_list('order_id', 'product_type', 'created_at').iterator(chunk_size=5000):
+            by_type.setdefault(product_type, []).append((delivered[order_id] - created_at).total_seconds())
+        return {key: statistics.quantiles(values, n=10) for key, values in by_type.items() if len(values) > 1}
+
+    yield 'перцентили в Python (прежде)', python_percentiles
+    yield 'cycle_time_report (SQL)', lambda: cycle_time_report(start, end)
+
+
+def bench_reprice(options):
+    from orders.pricing import current_rates, reprice_orders, repriceable_orders
+    from orders.views import calculate_order_price
+
+    rates = current_rates()
+
+    def per_order():
+        # Как раньше: модель на каждый заказ и расчёт по одному
+        for order in repriceable_orders().iterator(chunk_size=2000):
+            calculate_order_price(order)
+
+    yield 'расчёт по одному заказу (прежде)', per_order
+    yield 'reprice_orders --dry-run', lambda: reprice_orders(rates=rates, dry_run=True)
+    yield 'reprice_orders (с записью)', lambda: reprice_orders(rates=rates)
+
+
+def bench_price_quote(options):
+    from decimal import Decimal
+
+    from orders.forms import OrderCreateForm
+    from orders.pricing import current_rates, price, quote
+
+    # Типичный поток запросов формы: одни и те же сочетания параметров
+    params = [
+        (order_type, product_type, material, ring_size, weight)
+        for order_type, product_type, material, (ring_size, weight) in itertools.product(
+            ('template', 'custom'),
+            [code for code, _ in Order.PRODUCT_TYPE_CHOICES],
+            [code for code, _ in OrderCreateForm.MATERIAL_CHOICES if code],
+            [('17', None), ('18', None), (None, Decimal('4.5')), (None, Decimal('7'))],
+        )
+    ] * 50
+
+    def per_request():
+        # Без запоминания: тарифы и расчёт на каждый запрос
+        for args in params:
+            price(*args, current_rates())
+
+    def memoised():
+        for args in params:
+            quote(*args)
+
+    yield f'расчёт на каждый запрос ({len(params)})', per_request
+    yield f'pricing.quote ({len(params)})', memoised
+
+
+def bench_api(options):
+    from rest_framework.renderers import JSONRenderer
+
+    from jewelry_crm.api import queryset_columns
+    from orders.serializers import OrderSerializer
+
+    size = options['page_size']
+    sparse = ['order_id', 'order_status', 'final_price', 'created_at']
+    renderer = JSONRenderer()
+
+    def api_page(fields=None):
+        # Как OrderViewSet: запрос по полям сериализатора, затем JSON
+        only, related = queryset_columns(OrderSerializer(fields=fields))
+        orders = Order.objects.select_related(*related).only(*only).order_by('-order_id')[:size]
+        return renderer.render(OrderSerializer(orders, many=True, fields=fields).data)
+
+    def values_page():
+        return renderer.render(list(Order.objects.order_by('-order_id').values(*sparse)[:size]))
+
+    yield f'values() + JSON, {size} строк (нижняя граница)', values_page
+    yield f'OrderSerializer, все поля, {size} строк', api_page
+    yield f'OrderSerializer, ?fields= (4 поля), {size} строк', lambda: api_page(sparse)
+
+
+SCENARIOS = {
+    'reports': bench_reports,
+    'pdf_setup': bench_pdf_setup,
+    'batch_export': bench_batch_export,
+    'num_to_words': bench_num_to_words,
+    'customer_search': bench_customer_search,
+    'customer_stats': bench_customer_stats,
+    'stage_durations': bench_stage_durations,
+    'cycle_times': bench_cycle_times,
+    'reprice': bench_reprice,
+    'price_quote': bench_price_quote,
+    'api': bench_api,
+}
+
+
+class Command(BaseCommand):
+    help = 'Замеры производительности отдельных подсистем CRM'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--start', type=date.fromisoformat,
+                            default=date.today() - timedelta(days=365))
+        parser.add_argument('--end', type=date.fromisoformat, default=date.today())
+        parser.add_argument('--query', default='иванов', help='Строка поиска для customer_search')
+        parser.add_argument('--page-size', type=int, default=10000, help='Строк на страницу для api')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть >= 1')
+
+        self.stdout.write(f"Сценарий: {options['scenario']}, повторов: {options['repeat']}")
+        for label, func in SCENARIOS[options['scenario']](options):
+            queries, timings = measure(func, options['repeat'])
+            self.stdout.write(
+                f'  {label:<40} запросов: {queries:>4}   '
+                f'медиана: {statistics.median(timings):9.1f} мс   '
+                f'мин: {min(timings):9.1f} мс'
+            )
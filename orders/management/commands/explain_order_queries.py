@@ -0,0 +1,105 @@
+"""
+Планы запросов к orders: какие пути доступа читают таблицу целиком
+
+    python manage.py explain_order_queries
+    python manage.py explain_order_queries --analyze --verbose
+
+Строит те же запросы, что выполняют order_list, customer_orders и отчёты
+(для реальных клиента и исполнителя из БД), и выводит EXPLAIN для каждого.
+Запросы, в плане которых есть Seq Scan по orders, отмечаются - для них
+нужен индекс (см. Order.Meta.indexes и команду apply_indexes).
+"""
+import json
+from datetime import date, timedelta
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.models import Order
+from orders.pagination import DEFAULT_PAGE_SIZE
+from orders.rollup import day_bounds
+
+# Фильтры customer_orders: (параметр, поле, пример значения)
+CUSTOMER_ORDER_FILTERS = (
+    ('status', 'order_status', 'new'),
+    ('order_type', 'order_type', 'custom'),
+    ('product_type', 'product_type', 'ring'),
+)
+
+
+def access_paths(customer_id, user_id, start, end):
+    """(название, queryset) для основных путей доступа к orders"""
+    page = DEFAULT_PAGE_SIZE + 1
+    orders = Order.objects.all()
+
+    yield 'order_list: менеджер', orders.order_by('-order_id')[:page]
+    yield 'order_list: клиент', orders.filter(customer_id=customer_id).order_by('-order_id')[:page]
+    yield 'order_list: исполнитель', orders.filter(user_id=user_id).order_by('-order_id')[:page]
+
+    by_customer = orders.filter(customer_id=customer_id).order_by('-order_id')
+    for size in range(len(CUSTOMER_ORDER_FILTERS) + 1):
+        for combo in combinations(CUSTOMER_ORDER_FILTERS, size):
+            label = '+'.join(param for param, _, _ in combo) or 'без фильтров'
+            yield f'customer_orders: {label}', by_customer.filter(
+                **{field: value for _, field, value in combo}
+            )
+
+    period_start, period_end = day_bounds(start, end)
+    period = orders.filter(created_at__gte=period_start, created_at__lt=period_end)
+    yield 'report_view: заказы периода', period.order_by('-order_id')[:20]
+    yield 'отчёт: новые заказы периода', period.filter(order_status='new')
+
+
+def seq_scans(plan, table):
+    """Узлы Seq Scan по таблице в JSON-плане PostgreSQL"""
+    found = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') == table:
+            found.append(node)
+        stack.extend(node.get('Plans', ()))
+    return found
+
+
+class Command(BaseCommand):
+    help = 'Показывает, какие запросы к orders выполняются полным чтением таблицы (EXPLAIN)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true',
+                            help='EXPLAIN ANALYZE (запросы выполняются)')
+        parser.add_argument('--verbose', action='store_true', help='Выводить план целиком')
+        parser.add_argument('--days', type=int, default=30, help='Длина периода для отчётов')
+
+    def handle(self, *args, **options):
+        customer_id = (Order.objects.exclude(customer__isnull=True)
+                       .order_by('-order_id').values_list('customer_id', flat=True).first())
+        user_id = (Order.objects.exclude(user__isnull=True)
+                   .order_by('-order_id').values_list('user_id', flat=True).first())
+        if customer_id is None:
+            raise CommandError('В таблице orders нет заказов с клиентом')
+
+        end = date.today()
+        start = end - timedelta(days=options['days'] - 1)
+        table = Order._meta.db_table
+
+        flagged = 0
+        for label, queryset in access_paths(customer_id, user_id, start, end):
+            raw = queryset.explain(format='json', analyze=options['analyze'])
+            plan = json.loads(raw)[0]['Plan']
+            scans = seq_scans(plan, table)
+            cost = plan.get('Total Cost')
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'SEQ SCAN  {label:<45} cost={cost}'))
+            else:
+                self.stdout.write(f'ok        {label:<45} cost={cost}')
+            if options['verbose']:
+                self.stdout.write(queryset.explain(analyze=options['analyze']))
+
+        if flagged:
+            self.stdout.write(self.style.WARNING(
+                f'Полное чтение {table}: {flagged} запрос(ов). Проверьте apply_indexes --dry-run'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Все запросы используют индексы {table}'))
@@ -0,0 +1,154 @@
+"""
+Нагрузочный тест HTTP: запросы в секунду и задержки (p50/p99) запущенного сервера
+
+Сравнение WSGI и ASGI на одной машине - оба сервера запускаются с одной
+БД и одинаковым числом воркеров (см. README, "Запуск под ASGI"):
+
+    gunicorn jewelry_crm.wsgi:application --workers 4 --threads 8 --bind 127.0.0.1:8000
+    gunicorn jewelry_crm.asgi:application -k uvicorn.workers.UvicornWorker --workers 4 --bind 127.0.0.1:8001
+
+    python manage.py loadtest /orders/ /customers/ /catalog/collection/product/1/ \\
+        --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 \\
+        --user manager --concurrency 64 --duration 30
+
+--user создаёт сессию этого пользователя (сервер и команда должны
+использовать одну БД/хранилище сессий) и удаляет её после теста. Клиент -
+потоки с постоянными соединениями; при сотнях соединений запускайте
+команду на отдельных ядрах (taskset), чтобы упираться в сервер, а не в неё.
+Ошибкой считается любой ответ не 2xx (в том числе редирект на вход).
+"""
+import http.client
+import statistics
+import threading
+import time
+from collections import defaultdict
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_target(value):
+    """'имя=http://host:port' (или просто URL) -> (имя, host, port)"""
+    name, _, url = value.rpartition('=')
+    parts = urlsplit(url)
+    if parts.scheme != 'http' or not parts.hostname:
+        raise ValueError(value)
+    return name or parts.netloc, parts.hostname, parts.port or 80
+
+
+def _login_session(username):
+    """Сессия пользователя для заголовка Cookie"""
+    user = get_user_model().objects.get(username=username)
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return session
+
+
+def _worker(host, port, paths, headers, deadline, offset, results):
+    """Запросы по кругу до deadline; results[path] - задержки в секундах или None (ошибка)"""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    step = offset
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[step % len(paths)]
+            step += 1
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = 200 <= response.status < 300
+                if response.will_close:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            results[path].append(time.perf_counter() - started if ok else None)
+    finally:
+        connection.close()
+
+
+def run(host, port, paths, headers, concurrency, duration):
+    """Нагрузка в concurrency потоков. Возвращает {path: [задержка или None]}"""
+    per_thread = [defaultdict(list) for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, paths, headers, deadline, i, per_thread[i]))
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = defaultdict(list)
+    for thread_results in per_thread:
+        for path, timings in thread_results.items():
+            results[path].extend(timings)
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Нагрузочный тест запущенного сервера: RPS и p50/p99 по страницам (WSGI и ASGI)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Пути страниц, например /orders/')
+        parser.add_argument('--target', action='append', required=True,
+                            help='имя=http://host:port, можно несколько')
+        parser.add_argument('--user', help='Выполнять запросы от имени пользователя')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--duration', type=float, default=20, help='Секунд на каждый сервер')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency и --duration должны быть положительными')
+        try:
+            targets = [parse_target(value) for value in options['target']]
+        except ValueError as e:
+            raise CommandError(f'Неверный --target: {e}')
+
+        headers = {'Connection': 'keep-alive'}
+        session = None
+        if options['user']:
+            try:
+                session = _login_session(options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Пользователь {options['user']} не найден")
+            headers['Cookie'] = f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+
+        paths = options['paths']
+        try:
+            for name, host, port in targets:
+                # Прогрев: кэши процессов (каталог, тарифы) и соединения с БД
+                run(host, port, paths, headers, min(options['concurrency'], 4), 1)
+                results = run(host, port, paths, headers, options['concurrency'], options['duration'])
+                self._report(name, options, paths, results)
+        finally:
+            if session is not None:
+                session.delete()
+
+    def _report(self, name, options, paths, results):
+        self.stdout.write(
+            f"{name}: {options['concurrency']} соединений, {options['duration']:g} с"
+        )
+        total = 0
+        for path in paths:
+            timings = results.get(path, [])
+            ok = sorted(t * 1000 for t in timings if t is not None)
+            errors = len(timings) - len(ok)
+            total += len(timings)
+            if len(ok) < 2:
+                self.stdout.write(f'  {path:<40} успешных ответов: {len(ok)}   ошибок: {errors}')
+                continue
+            p99 = statistics.quantiles(ok, n=100)[98]
+            self.stdout.write(
+                f'  {path:<40} {len(timings) / options["duration"]:8.1f} запр/с   '
+                f'p50: {statistics.median(ok):7.1f} мс   p99: {p99:7.1f} мс   ошибок: {errors}'
+            )
+        self.stdout.write(f'  {"всего":<40} {total / options["duration"]:8.1f} запр/с')
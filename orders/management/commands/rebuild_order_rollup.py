@@ -0,0 +1,37 @@
+"""
+Полный или частичный пересчёт дневной сводки заказов
+
+    python manage.py rebuild_order_rollup
+    python manage.py rebuild_order_rollup --start 2024-01-01 --end 2024-01-31
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from orders.models import OrderDailyRollup
+from orders.report_cache import invalidate_days
+from orders.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает таблицу order_daily_rollup по таблице orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, default=None)
+        parser.add_argument('--end', type=date.fromisoformat, default=None)
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if start and end and start > end:
+            raise CommandError('--start не может быть позже --end')
+
+        buckets = rebuild_rollup(start, end)
+
+        # Закэшированные отчёты за пересчитанные дни больше не актуальны
+        first_day = start or OrderDailyRollup.objects.aggregate(day=Min('day'))['day']
+        last_day = end or date.today()
+        if first_day:
+            invalidate_days(first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1))
+        period = f"{start or 'начала'} — {end or 'сегодня'}"
+        self.stdout.write(self.style.SUCCESS(f'Сводка за период {period} пересчитана: {buckets} строк'))
@@ -0,0 +1,35 @@
+"""
+Сверка счётчиков клиентов (customer_stats) с таблицей orders
+
+    python manage.py reconcile_customer_stats          # только отчёт о расхождениях
+    python manage.py reconcile_customer_stats --fix    # пересчитать расходящихся клиентов
+    python manage.py reconcile_customer_stats --full   # пересчитать всех
+"""
+from django.core.management.base import BaseCommand
+
+from orders.customer_stats import find_drift, rebuild_customer_stats
+
+
+class Command(BaseCommand):
+    help = 'Сверяет и при необходимости пересчитывает таблицу customer_stats по таблице orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Пересчитать клиентов с расхождениями')
+        parser.add_argument('--full', action='store_true', help='Пересчитать всех клиентов')
+
+    def handle(self, *args, **options):
+        if options['full']:
+            count = rebuild_customer_stats()
+            self.stdout.write(self.style.SUCCESS(f'Счётчики пересчитаны: {count} клиентов'))
+            return
+
+        drift = find_drift()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Расхождений нет'))
+            return
+
+        sample = ', '.join(map(str, drift[:20])) + (' ...' if len(drift) > 20 else '')
+        self.stdout.write(self.style.WARNING(f'Расхождения у {len(drift)} клиентов: {sample}'))
+        if options['fix']:
+            rebuild_customer_stats(drift)
+            self.stdout.write(self.style.SUCCESS('Счётчики расходящихся клиентов пересчитаны'))
@@ -0,0 +1,33 @@
+"""
+Пересчёт estimated_price заказов без подтверждённой цены по действующим тарифам
+
+    python manage.py reprice_orders
+    python manage.py reprice_orders --dry-run
+    python manage.py reprice_orders --batch-size 5000
+
+Запускается после добавления новой версии тарифов (pricing_rates).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.pricing import reprice_orders
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает предполагаемые цены неподтверждённых заказов по последней версии тарифов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать, без записи')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = reprice_orders(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        action = 'изменилась бы цена' if options['dry_run'] else 'обновлено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Тарифы v{result.version}: проверено {result.checked}, {action} {result.changed} '
+            f'за {elapsed:.1f} с'
+        ))
@@ -0,0 +1,107 @@
+"""
+Синтетические заказы для замеров производительности
+
+ВНИМАНИЕ: только для тестовой/стейджинг-базы!
+    python manage.py seed_orders --count 1000000 --days 365
+    python manage.py seed_orders --count 1000000 --with-events   # и журнал статусов
+"""
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import Customer, User
+from orders.models import Order, OrderEvent
+
+# Журнал статусов синтетических заказов: путь new -> ... -> текущий статус,
+# этапы длятся от 1 до 7 дней (в зависимости от order_id) плюс разброс
+SEED_EVENTS_SQL = """
+    WITH path(step, status) AS (
+        VALUES (0, 'new'), (1, 'confirmed'), (2, 'in_work'), (3, 'ready'), (4, 'delivered')
+    )
+    INSERT INTO order_events (order_id, ts, kind, old_value, new_value, actor_id)
+    SELECT
+        o.order_id,
+        o.created_at
+            + p.step * (1 + o.order_id %% 7) * INTERVAL '1 day'
+            + CASE WHEN p.step > 0 THEN random() * INTERVAL '12 hours' ELSE INTERVAL '0' END,
+        %s, prev.status, p.status, NULL
+    FROM orders o
+    JOIN path cur ON cur.status = o.order_status
+    JOIN path p ON p.step <= cur.step
+    LEFT JOIN path prev ON prev.step = p.step - 1
+    WHERE o.order_id > %s
+"""
+
+
+class Command(BaseCommand):
+    help = 'Создаёт синтетические заказы для бенчмарков (не запускать на боевой базе)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=365,
+                            help='Разброс created_at в днях назад от текущего момента')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--with-events', action='store_true',
+                            help='Заполнить журнал статусов, исполнителей и сроки required_by')
+
+    def handle(self, *args, **options):
+        customer_ids = list(Customer.objects.values_list('customer_id', flat=True))
+        if not customer_ids:
+            raise CommandError('Нет ни одного клиента - сначала создайте клиентов.')
+
+        rng = random.Random(options['seed'])
+        statuses = [code for code, _ in Order.ORDER_STATUS_CHOICES]
+        product_types = [code for code, _ in Order.PRODUCT_TYPE_CHOICES]
+        order_types = ['template', 'custom']
+        assigned_statuses = {'in_work', 'ready', 'delivered'}
+        worker_ids = []
+        if options['with_events']:
+            worker_ids = list(User.objects.filter(role__in=['modeler', 'jeweler']).values_list('user_id', flat=True))
+        materials = ['gold_585', 'gold_750', 'silver_925', 'platinum']
+
+        first_id = (Order.objects.order_by('-order_id').values_list('order_id', flat=True).first() or 0)
+        created = 0
+        while created < options['count']:
+            size = min(options['batch_size'], options['count'] - created)
+            batch = []
+            for _ in range(size):
+                priced = rng.random() < 0.6
+                status = rng.choice(statuses)
+                batch.append(Order(
+                    customer_id=rng.choice(customer_ids),
+                    user_id=rng.choice(worker_ids) if worker_ids and status in assigned_statuses else None,
+                    order_status=status,
+                    product_type=rng.choice(product_types),
+                    order_type=rng.choice(order_types),
+                    material=rng.choice(materials),
+                    desired_weight=Decimal(rng.randint(2, 30)),
+                    final_price=Decimal(rng.randint(5000, 500000)) if priced else None,
+                    price_confirmed=priced,
+                ))
+            with transaction.atomic():
+                Order.objects.bulk_create(batch)
+            created += size
+            self.stdout.write(f'  создано {created}/{options["count"]}')
+
+        # auto_now_add всегда ставит текущее время - размазываем даты одним UPDATE
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE orders SET created_at = NOW() - random() * (%s * INTERVAL '1 day') "
+                "WHERE order_id > %s",
+                [options['days'], first_id],
+            )
+            if options['with_events']:
+                cursor.execute(
+                    "UPDATE orders SET required_by = created_at + (14 + random() * 21) * INTERVAL '1 day' "
+                    "WHERE order_id > %s",
+                    [first_id],
+                )
+                cursor.execute(SEED_EVENTS_SQL, [OrderEvent.KIND_STATUS, first_id])
+                self.stdout.write(f'  журнал статусов: {cursor.rowcount} событий')
+
+        self.stdout.write(self.style.SUCCESS(f'Готово: {created} заказов'))
+        self.stdout.write('bulk_create не вызывает сигналы - выполните rebuild_order_rollup '
+                          'и reconcile_customer_stats --full')
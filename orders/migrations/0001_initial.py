@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('order_status', models.CharField(max_length=20, verbose_name='Статус')),
+                ('product_type', models.CharField(blank=True, default='', max_length=20, verbose_name='Тип изделия')),
+                ('order_type', models.CharField(blank=True, default='', max_length=20, verbose_name='Тип заказа')),
+                ('orders_count', models.IntegerField(default=0, verbose_name='Заказов')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сумма final_price')),
+                ('confirmed_count', models.IntegerField(default=0, verbose_name='С установленной ценой')),
+            ],
+            options={
+                'verbose_name': 'Дневная сводка заказов',
+                'verbose_name_plural': 'Дневные сводки заказов',
+                'db_table': 'order_daily_rollup',
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('day', 'order_status', 'product_type', 'order_type'),
+                        name='order_daily_rollup_bucket_uniq',
+                    ),
+                ],
+            },
+        ),
+    ]
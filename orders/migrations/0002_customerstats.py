@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerStats',
+            fields=[
+                ('customer_id', models.IntegerField(primary_key=True, serialize=False, verbose_name='Клиент')),
+                ('orders_count', models.IntegerField(default=0, verbose_name='Заказов')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сумма final_price')),
+                ('last_order_at', models.DateTimeField(blank=True, null=True, verbose_name='Последний заказ')),
+            ],
+            options={
+                'verbose_name': 'Статистика клиента',
+                'verbose_name_plural': 'Статистика клиентов',
+                'db_table': 'customer_stats',
+                'indexes': [models.Index(fields=['-total_spent'], name='customer_stats_spent_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_customerstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('order_id', models.IntegerField(verbose_name='Заказ')),
+                ('ts', models.DateTimeField(verbose_name='Время')),
+                ('kind', models.CharField(choices=[('status', 'Статус'), ('price', 'Цена'), ('assignee', 'Исполнитель')], max_length=10, verbose_name='Что изменилось')),
+                ('old_value', models.CharField(blank=True, max_length=50, null=True, verbose_name='Было')),
+                ('new_value', models.CharField(blank=True, max_length=50, null=True, verbose_name='Стало')),
+                ('actor_id', models.IntegerField(blank=True, null=True, verbose_name='Кто изменил')),
+            ],
+            options={
+                'verbose_name': 'Событие заказа',
+                'verbose_name_plural': 'События заказов',
+                'db_table': 'order_events',
+                'indexes': [models.Index(fields=['order_id', 'ts'], name='order_events_order_ts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_orderevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderevent',
+            index=models.Index(fields=['kind', 'new_value', 'ts'], name='order_events_kind_value_ts_idx'),
+        ),
+    ]
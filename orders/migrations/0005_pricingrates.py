@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+# Тарифы, ранее заданные словарём PRICING_CONFIG в calculate_order_price
+INITIAL_RATES = {
+    'materials': {
+        'gold_585': 3500,
+        'gold_750': 4200,
+        'silver_925': 45,
+        'platinum': 8500,
+    },
+    'product_complexity': {
+        'ring': 1.0,
+        'brooch': 1.3,
+        'bracelet': 1.1,
+        'earrings': 0.9,
+    },
+    'template_coefficient': 1.5,
+    'labor_cost': 0.35,
+}
+
+
+def seed_rates(apps, schema_editor):
+    PricingRates = apps.get_model('orders', 'PricingRates')
+    if not PricingRates.objects.exists():
+        PricingRates.objects.create(comment='Начальные тарифы', **INITIAL_RATES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_orderevent_kind_value_ts_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingRates',
+            fields=[
+                ('version', models.AutoField(primary_key=True, serialize=False, verbose_name='Версия')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата')),
+                ('materials', models.JSONField(verbose_name='Цены металлов за грамм')),
+                ('product_complexity', models.JSONField(verbose_name='Коэффициенты сложности')),
+                ('template_coefficient', models.FloatField(default=1.5, verbose_name='Коэффициент шаблона')),
+                ('labor_cost', models.FloatField(default=0.35, verbose_name='Доля трудозатрат')),
+                ('comment', models.CharField(blank=True, default='', max_length=200, verbose_name='Комментарий')),
+            ],
+            options={
+                'verbose_name': 'Тарифы',
+                'verbose_name_plural': 'Тарифы',
+                'db_table': 'pricing_rates',
+                'ordering': ['-version'],
+            },
+        ),
+        migrations.RunPython(seed_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# Сводка по существующим заказам. Order нет в состоянии миграций (таблица
+# не управляется ими), поэтому запрос написан на SQL и не зависит от
+# текущих моделей; день считается в поясе сайта, как в rollup.local_day
+BACKFILL_SQL = """
+    INSERT INTO order_daily_rollup
+        (day, order_status, product_type, order_type, orders_count, revenue, confirmed_count)
+    SELECT {day}, order_status, COALESCE(product_type, ''), COALESCE(order_type, ''),
+           COUNT(*), COALESCE(SUM(final_price), 0), COUNT(*) FILTER (WHERE final_price > 0)
+    FROM orders
+    WHERE created_at IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def backfill_rollup(apps, schema_editor):
+    # На новой установке таблицы orders может ещё не быть
+    if 'orders' not in schema_editor.connection.introspection.table_names():
+        return
+    if settings.USE_TZ:
+        sql = BACKFILL_SQL.format(day='(created_at AT TIME ZONE %s)::date')
+        params = [timezone.get_current_timezone_name()]
+    else:
+        sql, params = BACKFILL_SQL.format(day='created_at::date'), []
+    schema_editor.execute('DELETE FROM order_daily_rollup')
+    schema_editor.execute(sql, params)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_pricingrates'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+# Счётчики клиентов по существующим заказам - на SQL, как и сводка в 0006
+BACKFILL_SQL = """
+    INSERT INTO customer_stats (customer_id, orders_count, total_spent, last_order_at)
+    SELECT customer_id, COUNT(*), COALESCE(SUM(final_price), 0), MAX(created_at)
+    FROM orders
+    WHERE customer_id IS NOT NULL
+    GROUP BY customer_id
+"""
+
+
+def backfill_customer_stats(apps, schema_editor):
+    # На новой установке таблицы orders может ещё не быть
+    if 'orders' not in schema_editor.connection.introspection.table_names():
+        return
+    schema_editor.execute('DELETE FROM customer_stats')
+    schema_editor.execute(BACKFILL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_backfill_order_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_customer_stats, migrations.RunPython.noop),
+    ]
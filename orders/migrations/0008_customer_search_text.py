@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Колонка customers.search_text (Customer.search_text) и триграммный индекс
+# для поиска клиентов. Таблица customers не управляется миграциями, а у
+# accounts их нет (добавить их теперь - значит сломать историю admin/auth),
+# поэтому колонка создаётся здесь, на SQL. Выражение должно совпадать с
+# Customer.search_text и accounts.search.SEARCH_TEXT_SQL
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(surname, '') || ' ' || coalesce(name, '') || ' ' || coalesce(email, ''))"
+    " || ' ' || regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')"
+)
+
+INSTALL_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE customers ADD COLUMN IF NOT EXISTS search_text text "
+    f"GENERATED ALWAYS AS ({SEARCH_TEXT_SQL}) STORED",
+    # CONCURRENTLY - без блокировки записи в таблицу, поэтому миграция
+    # выполняется вне транзакции
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS customers_search_text_trgm "
+    "ON customers USING gin (search_text gin_trgm_ops)",
+    "ANALYZE customers",
+)
+
+
+def install_customer_search(apps, schema_editor):
+    # На новой установке таблицы customers может ещё не быть
+    if 'customers' not in schema_editor.connection.introspection.table_names():
+        return
+    for sql in INSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0007_backfill_customer_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_customer_search, migrations.RunPython.noop, atomic=False),
+    ]
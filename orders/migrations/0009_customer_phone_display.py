@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Колонка customers.phone_display (Customer.phone_display) и индекс по phone
+# для точного поиска по номеру, см. accounts.phones. Как и 0008, на SQL:
+# таблица customers не управляется миграциями. Существующие телефоны
+# приводятся к E.164 командой normalize_phones
+INSTALL_SQL = (
+    "ALTER TABLE customers ADD COLUMN IF NOT EXISTS phone_display varchar(25)",
+    # CONCURRENTLY - без блокировки записи, поэтому вне транзакции
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS customers_phone_idx ON customers (phone)",
+)
+
+
+def install_phone_display(apps, schema_editor):
+    # На новой установке таблицы customers может ещё не быть
+    if 'customers' not in schema_editor.connection.introspection.table_names():
+        return
+    for sql in INSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0008_customer_search_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_phone_display, migrations.RunPython.noop, atomic=False),
+    ]
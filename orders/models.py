@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from accounts.models import User, Customer
 
 class Product(models.Model):
@@ -18,6 +18,25 @@ class Product(models.Model):
         return self.product_name
 
 
+class OrderQuerySet(models.QuerySet):
+    """Заказы с учётом роли пользователя - права проверяются в SQL, а не в Python"""
+
+    def for_user(self, user):
+        """
+        Заказы, доступные пользователю:
+        менеджер - все, клиент - свои, модельер/ювелир - назначенные ему
+        """
+        if not user.is_authenticated:
+            return self.none()
+        if user.role == 'manager':
+            return self
+        if user.role == 'client':
+            return self.filter(customer__user=user)
+        if user.role in ('modeler', 'jeweler'):
+            return self.filter(user=user)
+        return self.none()
+
+
 class Order(models.Model):
     order_id = models.AutoField(primary_key=True, db_column='order_id')
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, db_column='customer_id', null=True, blank=True)
@@ -89,15 +108,36 @@ class Order(models.Model):
     collection_product_name = models.CharField(max_length=200, null=True, blank=True, verbose_name='Название товара')
     collection_product_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name='Цена из коллекции')
     
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         managed = False
         db_table = 'orders'
         verbose_name = 'Заказ'
         verbose_name_plural = 'Заказы'
+        # Таблица не управляется миграциями - индексы создаёт команда apply_indexes
+        indexes = [
+            # Заказы клиента (order_list, customer_orders), новые первыми
+            models.Index(fields=['customer', '-order_id'], name='orders_customer_recent_idx'),
+            # Заказы исполнителя (order_list для модельера/ювелира)
+            models.Index(fields=['user', '-order_id'], name='orders_user_recent_idx'),
+            # Заказы в статусе за период и заказы периода (отчёты, сводка)
+            models.Index(fields=['order_status', 'created_at'], name='orders_status_created_idx'),
+            models.Index(fields=['created_at'], name='orders_created_idx'),
+            # Просроченные незавершённые заказы (orders.analytics)
+            models.Index(fields=['required_by'], name='orders_overdue_idx',
+                         condition=~models.Q(order_status='delivered')),
+        ]
 
     def __str__(self):
         return f"Заказ #{self.order_id}"
 
+    def save(self, *args, **kwargs):
+        # Производные данные (сводка, статистика клиента) обновляются в
+        # сигналах - сохраняем заказ и их в одной транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def get_status_display_ru(self):
         status_map = {
             'new': 'Новый',
@@ -183,3 +223,119 @@ class Document(models.Model):
             'contract': '📝',
         }
         return icons.get(self.document_type, '📄')
+
+
+class OrderDailyRollup(models.Model):
+    """
+    Предагрегированная статистика заказов по дням
+    (день × статус × тип изделия × тип заказа).
+    Поддерживается сигналами Order и командой rebuild_order_rollup.
+    """
+    day = models.DateField(verbose_name='День')
+    order_status = models.CharField(max_length=20, verbose_name='Статус')
+    # Пустая строка вместо NULL, чтобы уникальный ключ работал для незаполненных типов
+    product_type = models.CharField(max_length=20, blank=True, default='', verbose_name='Тип изделия')
+    order_type = models.CharField(max_length=20, blank=True, default='', verbose_name='Тип заказа')
+    orders_count = models.IntegerField(default=0, verbose_name='Заказов')
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Сумма final_price')
+    confirmed_count = models.IntegerField(default=0, verbose_name='С установленной ценой')
+
+    class Meta:
+        db_table = 'order_daily_rollup'
+        verbose_name = 'Дневная сводка заказов'
+        verbose_name_plural = 'Дневные сводки заказов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'order_status', 'product_type', 'order_type'],
+                name='order_daily_rollup_bucket_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.order_status}/{self.product_type}/{self.order_type}: {self.orders_count}"
+
+
+class CustomerStats(models.Model):
+    """
+    Счётчики заказов клиента (количество, сумма final_price, последний заказ).
+    Поддерживается сигналами Order и командой reconcile_customer_stats.
+    customer_id - ссылка на customers без FK: таблица клиентов не управляется миграциями.
+    """
+    customer_id = models.IntegerField(primary_key=True, verbose_name='Клиент')
+    orders_count = models.IntegerField(default=0, verbose_name='Заказов')
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Сумма final_price')
+    last_order_at = models.DateTimeField(null=True, blank=True, verbose_name='Последний заказ')
+
+    class Meta:
+        db_table = 'customer_stats'
+        verbose_name = 'Статистика клиента'
+        verbose_name_plural = 'Статистика клиентов'
+        indexes = [
+            models.Index(fields=['-total_spent'], name='customer_stats_spent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Клиент #{self.customer_id}: {self.orders_count} заказ(ов)"
+
+
+class OrderEvent(models.Model):
+    """
+    Журнал изменений заказа (только добавление): статус, цена, исполнитель.
+    Пишется сигналами Order (см. orders.events), по нему считается время
+    нахождения заказов на каждом этапе.
+    order_id - ссылка на orders без FK: события переживают удаление заказа.
+    """
+    KIND_STATUS = 'status'
+    KIND_PRICE = 'price'
+    KIND_ASSIGNEE = 'assignee'
+    KIND_CHOICES = [
+        (KIND_STATUS, 'Статус'),
+        (KIND_PRICE, 'Цена'),
+        (KIND_ASSIGNEE, 'Исполнитель'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    order_id = models.IntegerField(verbose_name='Заказ')
+    ts = models.DateTimeField(verbose_name='Время')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name='Что изменилось')
+    old_value = models.CharField(max_length=50, null=True, blank=True, verbose_name='Было')
+    new_value = models.CharField(max_length=50, null=True, blank=True, verbose_name='Стало')
+    actor_id = models.IntegerField(null=True, blank=True, verbose_name='Кто изменил')
+
+    class Meta:
+        db_table = 'order_events'
+        verbose_name = 'Событие заказа'
+        verbose_name_plural = 'События заказов'
+        indexes = [
+            models.Index(fields=['order_id', 'ts'], name='order_events_order_ts_idx'),
+            # Переходы в статус за период (сроки выполнения в orders.analytics)
+            models.Index(fields=['kind', 'new_value', 'ts'], name='order_events_kind_value_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"Заказ #{self.order_id} {self.ts:%d.%m.%Y %H:%M} {self.kind}: {self.old_value} -> {self.new_value}"
+
+
+class PricingRates(models.Model):
+    """
+    Версия тарифов для расчёта estimated_price (orders.pricing).
+    Версии не изменяются: новые тарифы - новая запись, действует последняя.
+    """
+    version = models.AutoField(primary_key=True, verbose_name='Версия')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата')
+    # {'gold_585': 3500, ...} - цена металла за грамм, ₽
+    materials = models.JSONField(verbose_name='Цены металлов за грамм')
+    # {'ring': 1.0, ...} - коэффициент сложности типа изделия
+    product_complexity = models.JSONField(verbose_name='Коэффициенты сложности')
+    template_coefficient = models.FloatField(default=1.5, verbose_name='Коэффициент шаблона')
+    labor_cost = models.FloatField(default=0.35, verbose_name='Доля трудозатрат')
+    comment = models.CharField(max_length=200, blank=True, default='', verbose_name='Комментарий')
+
+    class Meta:
+        db_table = 'pricing_rates'
+        ordering = ['-version']
+        verbose_name = 'Тарифы'
+        verbose_name_plural = 'Тарифы'
+
+    def __str__(self):
+        return f"Тарифы v{self.version} от {self.created_at:%d.%m.%Y}"
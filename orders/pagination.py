@@ -0,0 +1,118 @@
+"""
+Keyset-пагинация (seek по первичному ключу)
+
+В отличие от OFFSET, каждая страница выбирается условием
+"order_id < последний показанный" + LIMIT, поэтому страница N
+стоит столько же, сколько первая.
+"""
+import base64
+import binascii
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(direction, pk):
+    """Кодирует направление ('a' - дальше, 'b' - назад) и ключ в токен для URL"""
+    raw = f'{direction}:{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Разбирает токен курсора. Возвращает (direction, pk) или None"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, pk = base64.urlsafe_b64decode(padded.encode()).decode().split(':', 1)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if direction not in ('a', 'b') or pk < 0:
+        return None
+    return direction, pk
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Размер страницы из GET-параметра с ограничением сверху"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """Страница результатов с токенами соседних страниц"""
+
+    def __init__(self, items, next_cursor, prev_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+
+def _page_query(queryset, position, page_size, key):
+    """Запрос страницы: page_size + 1 строк от курсора"""
+    if position and position[0] == 'b':
+        # Назад: берём записи "выше" курсора по возрастанию и разворачиваем
+        return queryset.filter(**{f'{key}__gt': position[1]}).order_by(key)[:page_size + 1]
+    qs = queryset.order_by(f'-{key}')
+    if position:
+        qs = qs.filter(**{f'{key}__lt': position[1]})
+    return qs[:page_size + 1]
+
+
+def _make_page(rows, position, page_size, key):
+    if position and position[0] == 'b':
+        has_more = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+        has_prev = has_more
+        has_next = True
+    else:
+        items = rows[:page_size]
+        has_next = len(rows) > page_size
+        has_prev = position is not None
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor('a', getattr(items[-1], key))
+        if has_prev:
+            prev_cursor = encode_cursor('b', getattr(items[0], key))
+
+    return KeysetPage(items, next_cursor, prev_cursor)
+
+
+def keyset_paginate(queryset, cursor, page_size, key='order_id'):
+    """
+    Возвращает KeysetPage для queryset, отсортированного по убыванию key.
+    Выполняет ровно один запрос (LIMIT page_size + 1).
+    """
+    position = decode_cursor(cursor)
+    rows = list(_page_query(queryset, position, page_size, key))
+    return _make_page(rows, position, page_size, key)
+
+
+async def akeyset_paginate(queryset, cursor, page_size, key='order_id'):
+    """Асинхронный keyset_paginate (для async views)"""
+    position = decode_cursor(cursor)
+    rows = [row async for row in _page_query(queryset, position, page_size, key)]
+    return _make_page(rows, position, page_size, key)
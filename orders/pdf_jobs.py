@@ -0,0 +1,251 @@
+"""
+Фоновая генерация PDF (документы и ТЗ) вне потока запроса
+
+Задания выполняются во встроенном пуле потоков - внешний брокер не нужен.
+Результат сохраняется на диск под ключом "<тип>-<id>-<отпечаток>", где
+отпечаток - хэш полей документа, заказа, клиента и версии генератора,
+поэтому повторный запрос для неизменённого объекта сразу отдаёт готовый файл.
+Состояние задания хранится файлами-маркерами рядом с результатом, так что
+опрос работает из любого воркера, у которого общий PDF_RENDER_DIR.
+
+Настройки:
+    PDF_RENDER_DIR      - каталог результатов (по умолчанию во временном каталоге)
+    PDF_RENDER_WORKERS  - число потоков рендеринга (по умолчанию 2)
+    PDF_RENDER_TIMEOUT  - секунд, после которых задание без результата считается
+                          потерянным (воркер перезапущен) и ставится заново (300)
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .document_generator import GENERATOR_VERSION, generate_brief_pdf, generate_document_pdf
+from .models import Document, Order
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_RE = re.compile(r'^(document|brief)-(\d+)-([0-9a-f]{32})$')
+
+STATUS_READY = 'ready'
+STATUS_PENDING = 'pending'
+STATUS_FAILED = 'failed'
+STATUS_MISSING = 'missing'
+
+# Секунд, которые прежняя версия PDF хранится после сохранения новой
+PRUNE_DELAY = 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def render_dir():
+    path = getattr(settings, 'PDF_RENDER_DIR', None) or os.path.join(tempfile.gettempdir(), 'jewelry_crm_pdf')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PDF_RENDER_WORKERS', 2),
+                thread_name_prefix='pdf-render',
+            )
+        return _executor
+
+
+# ========================================
+# КЛЮЧИ ЗАДАНИЙ
+# ========================================
+
+# Поля, от которых зависит содержимое PDF (кроме updated_at они
+# покрывают и изменения через queryset.update(), не трогающие updated_at)
+DOCUMENT_FINGERPRINT_FIELDS = (
+    'document_id', 'document_type', 'document_number', 'document_date',
+    'amount', 'description', 'updated_at',
+)
+ORDER_FINGERPRINT_FIELDS = (
+    'order_id', 'updated_at', 'order_status', 'final_price', 'budget',
+    'material', 'product_type', 'order_type', 'user_id',
+)
+CUSTOMER_FINGERPRINT_FIELDS = ('customer_id', 'name', 'surname', 'phone', 'email')
+
+
+def fingerprint(*parts):
+    """Хэш данных, от которых зависит содержимое PDF, с учётом версии генератора"""
+    return hashlib.md5(
+        '|'.join(str(part) for part in (GENERATOR_VERSION, *parts)).encode()
+    ).hexdigest()
+
+
+def _fields(obj, names):
+    if obj is None:
+        return ('-',)
+    return tuple(getattr(obj, name) for name in names)
+
+
+def order_fingerprint_parts(order):
+    return (
+        *_fields(order, ORDER_FINGERPRINT_FIELDS),
+        *_fields(order.customer, CUSTOMER_FINGERPRINT_FIELDS),
+    )
+
+
+def document_job_id(document):
+    digest = fingerprint(
+        *_fields(document, DOCUMENT_FINGERPRINT_FIELDS),
+        *order_fingerprint_parts(document.order),
+    )
+    return f'document-{document.document_id}-{digest}'
+
+
+def brief_job_id(order):
+    return f'brief-{order.order_id}-{fingerprint(*order_fingerprint_parts(order), order.comment)}'
+
+
+def etag(job_id):
+    """ETag готового PDF - хэш содержимого из идентификатора задания"""
+    return f'"{job_id.rsplit("-", 1)[1]}"'
+
+
+def parse_job_id(job_id):
+    """Возвращает (тип, id объекта) или None для некорректного идентификатора"""
+    match = JOB_ID_RE.match(job_id or '')
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def _path(job_id, suffix):
+    return os.path.join(render_dir(), f'{job_id}.{suffix}')
+
+
+def result_path(job_id):
+    return _path(job_id, 'pdf')
+
+
+# ========================================
+# ВЫПОЛНЕНИЕ
+# ========================================
+
+def _render(kind, object_id):
+    """Генерирует PDF в рабочем потоке. Объекты перечитываются из БД"""
+    if kind == 'document':
+        document = Document.objects.select_related('order__customer').get(pk=object_id)
+        buffer, _ = generate_document_pdf(document)
+    else:
+        buffer = generate_brief_pdf(Order.objects.select_related('customer').get(pk=object_id))
+    return buffer.getvalue()
+
+
+def _store(job_id, data):
+    """Атомарно сохраняет результат и удаляет устаревшие версии того же объекта"""
+    # У каждого писателя своё временное имя: render_now и задание пула
+    # (или два воркера) могут сохранять один и тот же PDF одновременно
+    fd, tmp_path = tempfile.mkstemp(dir=render_dir(), prefix=f'{job_id}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, result_path(job_id))
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    _prune(job_id)
+
+
+def _prune(job_id):
+    """
+    Удаляет прежние версии PDF того же объекта. Версия живёт ещё PRUNE_DELAY
+    секунд, чтобы запрос, только что выбравший её, успел открыть файл
+    """
+    prefix = job_id.rsplit('-', 1)[0] + '-'
+    expired = time.time() - PRUNE_DELAY
+    for entry in os.scandir(render_dir()):
+        if not entry.name.startswith(prefix) or not entry.name.endswith('.pdf') or entry.name == f'{job_id}.pdf':
+            continue
+        try:
+            if entry.stat().st_mtime < expired:
+                _remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def _run(job_id, kind, object_id):
+    close_old_connections()
+    try:
+        _store(job_id, _render(kind, object_id))
+    except Exception as e:
+        logger.exception('Ошибка генерации PDF %s', job_id)
+        with open(_path(job_id, 'error'), 'w', encoding='utf-8') as f:
+            f.write(str(e))
+    finally:
+        _remove(_path(job_id, 'pending'))
+        close_old_connections()
+
+
+def render_now(job_id):
+    """
+    Открывает готовый PDF или синхронно генерирует его. Возвращает файловый объект:
+    между проверкой и открытием файл могла удалить очистка старых версий
+    """
+    try:
+        return open(result_path(job_id), 'rb')
+    except FileNotFoundError:
+        pass
+    kind, object_id = parse_job_id(job_id)
+    data = _render(kind, object_id)
+    _store(job_id, data)
+    return io.BytesIO(data)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _is_running(job_id):
+    """
+    Есть ли свежий маркер задания. Маркер старше PDF_RENDER_TIMEOUT остаётся
+    от воркера, перезапущенного до завершения задания, и не учитывается
+    """
+    try:
+        age = time.time() - os.path.getmtime(_path(job_id, 'pending'))
+    except FileNotFoundError:
+        return False
+    return age < getattr(settings, 'PDF_RENDER_TIMEOUT', 300)
+
+
+def submit(job_id):
+    """Ставит задание в очередь (если результата ещё нет). Возвращает статус"""
+    kind, object_id = parse_job_id(job_id)
+    current = job_status(job_id)
+    if current in (STATUS_READY, STATUS_PENDING):
+        return current
+
+    _remove(_path(job_id, 'error'))
+    # Создаём маркер заново: время изменения - момент постановки в очередь
+    _remove(_path(job_id, 'pending'))
+    open(_path(job_id, 'pending'), 'w').close()
+    _get_executor().submit(_run, job_id, kind, object_id)
+    return STATUS_PENDING
+
+
+def job_status(job_id):
+    if os.path.exists(result_path(job_id)):
+        return STATUS_READY
+    if _is_running(job_id):
+        return STATUS_PENDING
+    if os.path.exists(_path(job_id, 'error')):
+        return STATUS_FAILED
+    return STATUS_MISSING
@@ -0,0 +1,258 @@
+"""
+Общий реестр шрифтов и стилей ReportLab для документов и отчётов
+
+Шрифты регистрируются и стили создаются один раз на процесс при первом
+обращении; генераторы только берут готовые объекты из реестра.
+
+Поиск шрифтов: PDF_FONT_PATHS из настроек (пара путей обычный/жирный),
+затем распространённые шрифты Linux с кириллицей (DejaVu Sans,
+Liberation Sans), затем Arial из Windows. Если ничего не найдено,
+используется встроенный Helvetica (без кириллицы).
+"""
+import logging
+import os
+import threading
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+logger = logging.getLogger(__name__)
+
+FONT_CANDIDATES = (
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+     '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/dejavu/DejaVuSans.ttf',
+     '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/TTF/DejaVuSans.ttf',
+     '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf'),
+    ('/usr/share/fonts/liberation-sans/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/liberation-sans/LiberationSans-Bold.ttf'),
+    (r'C:\Windows\Fonts\arial.ttf', r'C:\Windows\Fonts\arialbd.ttf'),
+)
+
+FONT_NAME = 'CRM-Regular'
+FONT_NAME_BOLD = 'CRM-Bold'
+FALLBACK_FONTS = ('Helvetica', 'Helvetica-Bold')
+
+_lock = threading.Lock()
+_registry = None
+
+
+class StyleRegistry:
+    """Готовые шрифты, стили абзацев и таблиц"""
+
+    def __init__(self, font, font_bold):
+        self.font = font
+        self.font_bold = font_bold
+        self.paragraph = _build_paragraph_styles(font, font_bold)
+        self.table = _build_table_styles(font, font_bold)
+
+
+def _register_fonts():
+    """Регистрирует первую найденную пару шрифтов. Возвращает их имена"""
+    candidates = list(FONT_CANDIDATES)
+    custom = getattr(settings, 'PDF_FONT_PATHS', None)
+    if custom:
+        candidates.insert(0, tuple(custom))
+
+    for regular, bold in candidates:
+        if not (os.path.exists(regular) and os.path.exists(bold)):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(FONT_NAME, regular))
+            pdfmetrics.registerFont(TTFont(FONT_NAME_BOLD, bold))
+        except Exception:
+            logger.warning('Не удалось зарегистрировать шрифт %s', regular, exc_info=True)
+            continue
+        return FONT_NAME, FONT_NAME_BOLD
+
+    logger.warning('Шрифт с кириллицей не найден, PDF будут использовать Helvetica')
+    return FALLBACK_FONTS
+
+
+def registry():
+    """Реестр стилей (создаётся при первом вызове)"""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = StyleRegistry(*_register_fonts())
+    return _registry
+
+
+# ========================================
+# СТИЛИ АБЗАЦЕВ
+# ========================================
+def _build_paragraph_styles(font, bold):
+    base = getSampleStyleSheet()
+    normal = base['Normal']
+
+    def style(name, parent=normal, **kwargs):
+        return ParagraphStyle(name, parent=parent, **kwargs)
+
+    styles = {
+        # Счёт
+        'invoice.normal': style('InvoiceNormal', fontName=font, fontSize=9, leading=11),
+        'invoice.bold': style('InvoiceBold', fontName=bold, fontSize=9, leading=11),
+        'invoice.small': style('InvoiceSmall', fontName=font, fontSize=8, leading=10),
+        'invoice.title': style('InvoiceTitle', fontName=bold, fontSize=16, alignment=1, spaceAfter=10),
+
+        # Акт
+        'act.normal': style('ActNormal', fontName=font, fontSize=10, leading=14),
+        'act.bold': style('ActBold', fontName=bold, fontSize=10, leading=14),
+        'act.title': style('ActTitle', fontName=bold, fontSize=14, alignment=1, spaceAfter=15),
+
+        # Договор
+        'contract.normal': style('ContractNormal', fontName=font, fontSize=11, leading=15),
+        'contract.bold': style('ContractBold', fontName=bold, fontSize=11, leading=15),
+        'contract.title': style('ContractTitle', fontName=bold, fontSize=14, alignment=1, spaceAfter=20),
+
+        # Чек
+        'receipt.normal': style('ReceiptNormal', fontName=font, fontSize=10, leading=13),
+        'receipt.bold': style('ReceiptBold', fontName=bold, fontSize=10, leading=13),
+
+        # ТЗ для модельера
+        'brief.title': style('BriefTitle', parent=base['Heading1'], fontName=bold, fontSize=18,
+                             textColor=colors.HexColor('#1a1a1a'), spaceAfter=12, alignment=1),
+        'brief.heading': style('BriefHeading', parent=base['Heading2'], fontName=bold, fontSize=14,
+                               textColor=colors.HexColor('#d4af37'), spaceAfter=10, spaceBefore=15),
+        'brief.normal': style('BriefNormal', fontName=font, fontSize=11, leading=16),
+
+        # Отчёт
+        'report.title': style('ReportTitle', fontName=bold, fontSize=18,
+                              textColor=colors.HexColor('#1a1a1a'), spaceAfter=20, alignment=1),
+        'report.heading': style('ReportHeading', fontName=bold, fontSize=14,
+                                textColor=colors.HexColor('#0066cc'), spaceAfter=10, spaceBefore=10),
+        'report.normal': style('ReportNormal', fontName=font, fontSize=10, leading=14),
+    }
+    styles['receipt.center'] = style('ReceiptCenter', parent=styles['receipt.bold'], alignment=1, spaceAfter=10)
+    return styles
+
+
+# ========================================
+# СТИЛИ ТАБЛИЦ
+# ========================================
+def _build_table_styles(font, bold):
+    services = TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), font),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BOX', (0, 0), (-1, -1), 1, colors.black),
+        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ])
+    key_value = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), bold),
+        ('FONTNAME', (1, 0), (1, -1), font),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
+    report_grey = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), font),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+    return {
+        'invoice.bank': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('SPAN', (0, 0), (0, 1)),
+            ('SPAN', (1, 0), (2, 0)),
+            ('SPAN', (1, 1), (2, 1)),
+            ('SPAN', (0, 2), (2, 2)),
+            ('SPAN', (0, 3), (0, 4)),
+            ('SPAN', (1, 3), (1, 4)),
+            ('SPAN', (2, 3), (2, 3)),
+            ('SPAN', (0, 5), (2, 5)),
+            ('SPAN', (0, 6), (2, 6)),
+        ]),
+        'invoice.info': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 2),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+        ]),
+        'invoice.services': services,
+        'invoice.total': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+            ('SPAN', (0, 0), (3, 0)),
+            ('SPAN', (0, 1), (3, 1)),
+            ('SPAN', (0, 2), (3, 2)),
+        ]),
+        'invoice.signature': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+
+        'act.services': services,
+        'act.total': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+            ('SPAN', (0, 0), (3, 0)),
+            ('SPAN', (0, 1), (3, 1)),
+        ]),
+        'act.signature': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('SPAN', (0, 1), (1, 1)),
+        ]),
+
+        'contract.details': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]),
+
+        'receipt.items': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+            ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ]),
+
+        'brief.key_value': key_value,
+
+        'report.general': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066cc')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), bold),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), font),
+        ]),
+        'report.breakdown': report_grey,
+    }
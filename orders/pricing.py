@@ -0,0 +1,237 @@
+"""
+Расчёт предполагаемой цены заказа (estimated_price)
+
+Тарифы (цены металлов, коэффициенты сложности, коэффициент шаблона и доля
+трудозатрат) хранятся версиями в таблице pricing_rates. Процесс загружает
+действующую версию один раз и держит её в памяти; сохранение новой версии
+меняет ключ версии в общем кэше, и остальные процессы перечитывают тарифы
+при следующем расчёте.
+
+reprice_orders() пересчитывает цены всех заказов без подтверждённой цены
+за один проход: строки читаются пачками через values_list (без создания
+моделей), цена считается по колонкам с уже разобранными тарифами, а
+изменившиеся цены записываются bulk_update (вместе с updated_at - auto_now
+при bulk_update не срабатывает).
+
+quote() - цена для формы создания заказа до его сохранения (JSON-эндпоинт
+order_price_quote). Результаты для одинаковых параметров запоминаются в
+памяти процесса до смены версии тарифов, поэтому повторный запрос не
+обращается к БД.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order, PricingRates
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'pricing:version'
+
+# Примерный вес шаблонного изделия, г (кольцо - по размеру)
+TEMPLATE_WEIGHTS = {
+    'brooch': 8,
+    'bracelet': 12,
+    'earrings': 2,
+}
+TEMPLATE_DEFAULT_WEIGHT = 3
+DEFAULT_RING_SIZE = 17
+DEFAULT_CUSTOM_WEIGHT = 5
+
+CENT = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class Rates:
+    """Действующие тарифы"""
+    version: int = None
+    materials: dict = field(default_factory=dict)
+    product_complexity: dict = field(default_factory=dict)
+    template_coefficient: float = 1.5
+    labor_cost: float = 0.35
+
+    @classmethod
+    def from_model(cls, rates):
+        return cls(
+            version=rates.version,
+            materials=dict(rates.materials),
+            product_complexity=dict(rates.product_complexity),
+            template_coefficient=rates.template_coefficient,
+            labor_cost=rates.labor_cost,
+        )
+
+
+_lock = threading.Lock()
+_state = (None, None)  # (версия в кэше, Rates)
+
+
+def _cache():
+    return caches[getattr(settings, 'PRICING_CACHE_ALIAS', 'default')]
+
+
+def _current_version():
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def current_rates():
+    """Действующая (последняя) версия тарифов, из памяти процесса"""
+    global _state
+    version = _current_version()
+    loaded_version, rates = _state
+    if rates is None or loaded_version != version:
+        with _lock:
+            loaded_version, rates = _state
+            if rates is None or loaded_version != version:
+                latest = PricingRates.objects.order_by('-version').first()
+                if latest is None:
+                    logger.warning('Таблица pricing_rates пуста - цены не рассчитываются')
+                rates = Rates.from_model(latest) if latest is not None else Rates()
+                _state = (version, rates)
+    return rates
+
+
+def invalidate():
+    """Сбрасывает тарифы во всех процессах (после сохранения новой версии)"""
+    global _state
+    _cache().set(VERSION_KEY, time.time_ns(), timeout=None)
+    _state = (None, None)
+
+
+def _weight(order_type, product_type, ring_size, desired_weight):
+    """Расчётный вес изделия, г, или None"""
+    if order_type == 'template':
+        if product_type == 'ring':
+            # Примерный вес по размеру кольца
+            return max(2, float(ring_size or DEFAULT_RING_SIZE) * 0.4)
+        return TEMPLATE_WEIGHTS.get(product_type, TEMPLATE_DEFAULT_WEIGHT)
+    if order_type == 'custom':
+        weight = float(desired_weight or DEFAULT_CUSTOM_WEIGHT)
+        return weight if weight > 0 else None
+    return None
+
+
+def price(order_type, product_type, material, ring_size, desired_weight, rates):
+    """Цена по параметрам заказа (float, 2 знака) или None, если рассчитать нельзя"""
+    if not material or not product_type:
+        return None
+    material_price = rates.materials.get(material)
+    if not material_price:
+        return None
+    complexity = rates.product_complexity.get(product_type, 1.0)
+
+    try:
+        weight = _weight(order_type, product_type, ring_size, desired_weight)
+    except (ValueError, TypeError):
+        return None
+    if weight is None:
+        return None
+
+    base_cost = weight * material_price
+    if order_type == 'template':
+        base_cost = base_cost * rates.template_coefficient
+
+    # Коэффициент сложности и трудозатраты
+    return round(base_cost * complexity * (1 + rates.labor_cost), 2)
+
+
+# Предел числа запомненных котировок на процесс (при переполнении - сброс)
+QUOTE_CACHE_SIZE = 4096
+
+_quotes = (None, {})  # (Rates, {параметры: цена})
+
+
+def quote(order_type, product_type, material, ring_size=None, desired_weight=None):
+    """
+    Предполагаемая цена по параметрам формы (как calculate_price для
+    несохранённого заказа). Одинаковые параметры считаются один раз на
+    версию тарифов.
+    """
+    global _quotes
+    rates = current_rates()
+    loaded_rates, quotes = _quotes
+    if loaded_rates is not rates:
+        quotes = {}
+        _quotes = (rates, quotes)
+
+    key = (order_type, product_type, material, ring_size, desired_weight)
+    try:
+        return quotes[key]
+    except KeyError:
+        pass
+    if len(quotes) >= QUOTE_CACHE_SIZE:
+        quotes.clear()
+    quotes[key] = result = price(order_type, product_type, material, ring_size, desired_weight, rates)
+    return result
+
+
+def calculate_price(order, rates=None):
+    """Предполагаемая цена одного заказа"""
+    return price(
+        order.order_type, order.product_type, order.material,
+        order.ring_size, order.desired_weight, rates or current_rates(),
+    )
+
+
+# Колонки заказа, нужные для расчёта цены (в порядке аргументов price())
+PRICE_COLUMNS = ('order_type', 'product_type', 'material', 'ring_size', 'desired_weight')
+
+RepriceResult = namedtuple('RepriceResult', ['version', 'checked', 'changed'])
+
+
+def repriceable_orders():
+    """Заказы, цена которых ещё не подтверждена менеджером"""
+    return Order.objects.filter(price_confirmed=False)
+
+
+def reprice_orders(orders=None, rates=None, batch_size=2000, dry_run=False):
+    """
+    Пересчитывает estimated_price заказов (по умолчанию - всех без
+    подтверждённой цены) по действующим тарифам. Заказы, цену которых
+    рассчитать нельзя, не меняются.
+    """
+    rates = rates or current_rates()
+    orders = repriceable_orders() if orders is None else orders
+    rows = orders.order_by().values_list('order_id', 'estimated_price', *PRICE_COLUMNS)
+
+    checked = changed = 0
+    pending = []
+    updated_at = timezone.now()
+
+    def flush():
+        if pending and not dry_run:
+            with transaction.atomic():
+                Order.objects.bulk_update(pending, ['estimated_price', 'updated_at'], batch_size=batch_size)
+        pending.clear()
+
+    # Одинаковые параметры у тысяч заказов - считаем цену один раз
+    prices = {}
+    for order_id, current, *params in rows.iterator(chunk_size=batch_size):
+        checked += 1
+        key = tuple(params)
+        if key not in prices:
+            new_price = price(*params, rates)
+            prices[key] = Decimal(repr(new_price)).quantize(CENT) if new_price is not None else None
+        new_price = prices[key]
+        if new_price is None or new_price == current:
+            continue
+        changed += 1
+        pending.append(Order(order_id=order_id, estimated_price=new_price, updated_at=updated_at))
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+    return RepriceResult(rates.version, checked, changed)
+
@@ -0,0 +1,92 @@
+"""
+Кэш результатов отчётов по периоду
+
+Ключ отчёта строится из нормализованного периода и "версий" всех дней
+периода. Изменение заказа меняет версию только своего дня, поэтому
+инвалидируются лишь отчёты, в период которых попадает этот день.
+
+Бэкенд выбирается настройкой REPORT_CACHE_ALIAS (по умолчанию 'default',
+т.е. LocMemCache, если CACHES не настроен).
+"""
+import hashlib
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+REPORT_CACHE_TIMEOUT = getattr(settings, 'REPORT_CACHE_TIMEOUT', 60 * 60)
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _cache():
+    return caches[getattr(settings, 'REPORT_CACHE_ALIAS', 'default')]
+
+
+def _count(name, value=1):
+    with _stats_lock:
+        _stats[name] += value
+
+
+def _day_key(day):
+    return f'report:day:{day.isoformat()}'
+
+
+def _period_days(start_date, end_date):
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _day_versions(cache, days):
+    """Версии дней периода; отсутствующим назначается новая версия"""
+    keys = [_day_key(day) for day in days]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Версия по времени, а не 0: если ключ дня вытеснен из кэша,
+        # старые отчёты не должны снова стать "актуальными"
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def get_report(start_date, end_date, compute):
+    """Возвращает отчёт за период из кэша или вычисляет его через compute()"""
+    if start_date > end_date:
+        start_date, end_date = end_date, start_date
+
+    cache = _cache()
+    versions = _day_versions(cache, _period_days(start_date, end_date))
+    digest = hashlib.md5(','.join(map(str, versions)).encode()).hexdigest()
+    key = f'report:{start_date.isoformat()}:{end_date.isoformat()}:{digest}'
+
+    report = cache.get(key)
+    if report is not None:
+        _count('hits')
+        return report
+
+    _count('misses')
+    report = compute(start_date, end_date)
+    cache.set(key, report, REPORT_CACHE_TIMEOUT)
+    return report
+
+
+def invalidate_days(days):
+    """Сбрасывает закэшированные отчёты, период которых включает любой из дней"""
+    days = {day for day in days if day is not None}
+    if not days:
+        return
+    _cache().set_many({_day_key(day): time.time_ns() for day in days}, timeout=None)
+    _count('invalidations', len(days))
+
+
+def cache_stats():
+    """Счётчики попаданий/промахов кэша отчётов в текущем процессе"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+    return stats
@@ -1,109 +1,216 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
 from io import BytesIO
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import datetime
-from django.db.models import Count, Sum, Q
-import os
-
-# Регистрируем шрифты
-try:
-    windows_fonts_path = r'C:\Windows\Fonts'
-    pdfmetrics.registerFont(TTFont('Arial', os.path.join(windows_fonts_path, 'arial.ttf')))
-    pdfmetrics.registerFont(TTFont('Arial-Bold', os.path.join(windows_fonts_path, 'arialbd.ttf')))
-    FONT_NAME = 'Arial'
-    FONT_NAME_BOLD = 'Arial-Bold'
-except:
-    FONT_NAME = 'Helvetica'
-    FONT_NAME_BOLD = 'Helvetica-Bold'
+from decimal import Decimal
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Count, F, Sum
+
+from .analytics import format_duration
+from .models import Order, OrderDailyRollup
+from .pdf_styles import registry
+from .rollup import day_bounds
 
 # Компания
 COMPANY_NAME = "ООО «JEWEllUX»"
 
 
+# ========================================
+# АГРЕГАЦИЯ ДАННЫХ ОТЧЁТА
+# ========================================
+
+StatusCount = namedtuple('StatusCount', ['order_status', 'count'])
+ProductTypeCount = namedtuple('ProductTypeCount', ['product_type', 'count'])
+OrderTypeCount = namedtuple('OrderTypeCount', ['order_type', 'count'])
+TopCustomer = namedtuple('TopCustomer', ['customer_id', 'name', 'surname', 'count', 'total_spent'])
+
+
+@dataclass(frozen=True)
+class ReportData:
+    """Неизменяемый результат отчёта за период"""
+    total_orders: int = 0
+    total_revenue: Decimal = Decimal('0')
+    confirmed_orders: int = 0
+    status_stats: tuple = ()
+    product_stats: tuple = ()
+    order_type_stats: tuple = ()
+    top_customers: tuple = ()
+
+    @property
+    def avg_order_value(self):
+        """Средний чек по заказам с установленной ценой"""
+        if self.confirmed_orders > 0:
+            return self.total_revenue / self.confirmed_orders
+        return 0
+
+
+TOP_CUSTOMERS_LIMIT = 5
+
+# Битовые маски GROUPING(order_status, product_type, order_type, customer_id):
+# 1 в разряде означает, что колонка свёрнута в этом наборе группировки
+GROUP_TOTAL = 0b1111
+GROUP_STATUS = 0b0111
+GROUP_PRODUCT_TYPE = 0b1011
+GROUP_ORDER_TYPE = 0b1101
+GROUP_CUSTOMER = 0b1110
+
+REPORT_SQL = """
+    WITH base AS ({base_sql}),
+    grouped AS (
+        SELECT
+            GROUPING(order_status, product_type, order_type, customer_id) AS grp,
+            order_status, product_type, order_type, customer_id,
+            COUNT(*) AS orders_count,
+            SUM(final_price) AS revenue,
+            COUNT(*) FILTER (WHERE final_price > 0) AS confirmed_count
+        FROM base
+        GROUP BY GROUPING SETS (
+            (), (order_status), (product_type), (order_type), (customer_id)
+        )
+    ),
+    ranked AS (
+        SELECT
+            grouped.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY grp
+                ORDER BY revenue DESC NULLS LAST, orders_count DESC
+            ) AS rn
+        FROM grouped
+        WHERE grp <> %s OR customer_id IS NOT NULL
+    )
+    SELECT
+        r.grp, r.order_status, r.product_type, r.order_type, r.customer_id,
+        r.orders_count, r.revenue, r.confirmed_count,
+        c.name, c.surname
+    FROM ranked r
+    LEFT JOIN customers c ON c.customer_id = r.customer_id
+    WHERE r.grp <> %s OR r.rn <= %s
+"""
+
+
+def _build_report_data(rows):
+    """Раскладывает строки GROUPING SETS по разделам отчёта"""
+    totals = None
+    status_stats, product_stats, order_type_stats, top_customers = [], [], [], []
+
+    for (grp, status, product_type, order_type, customer_id,
+         count, revenue, confirmed, name, surname) in rows:
+        if grp == GROUP_TOTAL:
+            totals = (count, revenue or Decimal('0'), confirmed)
+        elif grp == GROUP_STATUS:
+            status_stats.append(StatusCount(status, count))
+        elif grp == GROUP_PRODUCT_TYPE:
+            product_stats.append(ProductTypeCount(product_type, count))
+        elif grp == GROUP_ORDER_TYPE:
+            order_type_stats.append(OrderTypeCount(order_type, count))
+        elif grp == GROUP_CUSTOMER:
+            top_customers.append(TopCustomer(customer_id, name, surname, count, revenue))
+
+    if totals is None:
+        return ReportData()
+
+    def by_count(items):
+        return tuple(sorted(items, key=lambda item: -item.count))
+
+    top_customers.sort(key=lambda c: (c.total_spent is None, -(c.total_spent or 0), -c.count))
+
+    return ReportData(
+        total_orders=totals[0],
+        total_revenue=totals[1],
+        confirmed_orders=totals[2],
+        status_stats=by_count(status_stats),
+        product_stats=by_count(product_stats),
+        order_type_stats=by_count(order_type_stats),
+        top_customers=tuple(top_customers),
+    )
+
+
 def generate_report_data(orders):
-    """Собирает аналитические данные"""
-    
-    # Общая статистика
-    total_orders = orders.count()
-    total_revenue = orders.filter(
-        final_price__isnull=False
-    ).aggregate(total=Sum('final_price'))['total'] or 0
-    
-    # По статусам
-    status_stats = orders.values('order_status').annotate(count=Count('order_id')).order_by('-count')
-    
-    # По типам изделий
-    product_stats = orders.values('product_type').annotate(count=Count('order_id')).order_by('-count')
-    
-    # По типам заказов
-    order_type_stats = orders.values('order_type').annotate(count=Count('order_id')).order_by('-count')
-    
-    # Топ-5 клиентов по количеству заказов
-    top_customers = orders.values('customer__name', 'customer__surname').annotate(
+    """
+    Собирает аналитические данные по queryset заказов за один запрос:
+    итоги, разбивки по статусам/типам и топ клиентов считаются
+    через GROUPING SETS поверх отфильтрованного queryset.
+    """
+    base = orders.order_by().values(
+        'order_status', 'product_type', 'order_type', 'customer_id', 'final_price'
+    )
+    try:
+        base_sql, base_params = base.query.get_compiler(using=base.db).as_sql()
+    except EmptyResultSet:
+        return ReportData()
+
+    sql = REPORT_SQL.format(base_sql=base_sql)
+    params = (*base_params, GROUP_CUSTOMER, GROUP_CUSTOMER, TOP_CUSTOMERS_LIMIT)
+
+    with connections[base.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return _build_report_data(rows)
+
+
+ROLLUP_REPORT_SQL = """
+    SELECT
+        (GROUPING(order_status, product_type, order_type) << 1) | 1 AS grp,
+        order_status,
+        NULLIF(product_type, '') AS product_type,
+        NULLIF(order_type, '') AS order_type,
+        NULL AS customer_id,
+        SUM(orders_count) AS orders_count,
+        SUM(revenue) AS revenue,
+        SUM(confirmed_count) AS confirmed_count,
+        NULL AS name,
+        NULL AS surname
+    FROM order_daily_rollup
+    WHERE day BETWEEN %s AND %s AND orders_count > 0
+    GROUP BY GROUPING SETS ((), (order_status), (product_type), (order_type))
+"""
+
+
+def generate_period_report(start_date, end_date):
+    """
+    Отчёт за период по дневной сводке order_daily_rollup.
+    Разбивки читаются из сводки (≈ дни × комбинации), топ клиентов -
+    из orders по индексируемому диапазону created_at.
+    """
+    db = OrderDailyRollup.objects.db
+    with connections[db].cursor() as cursor:
+        cursor.execute(ROLLUP_REPORT_SQL, [start_date, end_date])
+        rows = cursor.fetchall()
+
+    period_start, period_end = day_bounds(start_date, end_date)
+    top_customers = Order.objects.filter(
+        created_at__gte=period_start,
+        created_at__lt=period_end,
+        customer__isnull=False,
+    ).order_by().values('customer_id', 'customer__name', 'customer__surname').annotate(
         count=Count('order_id'),
-        total_spent=Sum('final_price')
-    ).order_by('-total_spent')[:5]
-    
-    confirmed_orders = orders.filter(
-        final_price__isnull=False,
-        final_price__gt=0
-    ).count()
-    
-    # Средний чек
-    avg_order_value = (total_revenue / confirmed_orders if confirmed_orders > 0 else 0)
-    
-    return {
-        'total_orders': total_orders,
-        'total_revenue': total_revenue,
-        'avg_order_value': avg_order_value,
-        'status_stats': status_stats,
-        'product_stats': product_stats,
-        'order_type_stats': order_type_stats,
-        'top_customers': top_customers,
-    }
+        total_spent=Sum('final_price'),
+    ).order_by(F('total_spent').desc(nulls_last=True), '-count')[:TOP_CUSTOMERS_LIMIT]
+
+    rows.extend(
+        (GROUP_CUSTOMER, None, None, None, row['customer_id'],
+         row['count'], row['total_spent'], None,
+         row['customer__name'], row['customer__surname'])
+        for row in top_customers
+    )
+    return _build_report_data(rows)
 
 
-def generate_report_pdf(start_date, end_date, report_data):
-    """Генерирует PDF-отчёт"""
+def generate_report_pdf(start_date, end_date, report_data, cycle_report=None):
+    """Генерирует PDF-отчёт (cycle_report - сроки выполнения из orders.analytics)"""
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=20, leftMargin=20, topMargin=20, bottomMargin=20)
     
     elements = []
-    styles = getSampleStyleSheet()
-    
-    # Стили
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Normal'],
-        fontName=FONT_NAME_BOLD,
-        fontSize=18,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=20,
-        alignment=1
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Normal'],
-        fontName=FONT_NAME_BOLD,
-        fontSize=14,
-        textColor=colors.HexColor('#0066cc'),
-        spaceAfter=10,
-        spaceBefore=10
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontName=FONT_NAME,
-        fontSize=10,
-        leading=14
-    )
+    styles = registry()
+    title_style = styles.paragraph['report.title']
+    heading_style = styles.paragraph['report.heading']
+    normal_style = styles.paragraph['report.normal']
     
     # Заголовок
     elements.append(Paragraph(f"ОТЧЁТ О РАБОТЕ КОМПАНИИ", title_style))
@@ -121,23 +228,13 @@ def generate_report_pdf(start_date, end_date, report_data):
     
     general_stats = [
         ['Показатель', 'Значение'],
-        ['Всего заказов', str(report_data['total_orders'])],
-        ['Общая выручка', f"{report_data['total_revenue']:.2f} ₽"],
-        ['Средний чек', f"{report_data['avg_order_value']:.2f} ₽"],
+        ['Всего заказов', str(report_data.total_orders)],
+        ['Общая выручка', f"{report_data.total_revenue:.2f} ₽"],
+        ['Средний чек', f"{report_data.avg_order_value:.2f} ₽"],
     ]
     
     general_table = Table(general_stats, colWidths=[8*cm, 6*cm])
-    general_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066cc')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), FONT_NAME_BOLD),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), FONT_NAME),
-    ]))
+    general_table.setStyle(styles.table['report.general'])
     elements.append(general_table)
     elements.append(Spacer(1, 0.5*cm))
     
@@ -153,21 +250,12 @@ def generate_report_pdf(start_date, end_date, report_data):
     }
     
     status_data = [['Статус', 'Количество']]
-    for item in report_data['status_stats']:
-        status_name = status_names.get(item['order_status'], item['order_status'])
-        status_data.append([status_name, str(item['count'])])
+    for item in report_data.status_stats:
+        status_name = status_names.get(item.order_status, item.order_status)
+        status_data.append([status_name, str(item.count)])
     
     status_table = Table(status_data, colWidths=[8*cm, 6*cm])
-    status_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    status_table.setStyle(styles.table['report.breakdown'])
     elements.append(status_table)
     elements.append(Spacer(1, 0.5*cm))
     
@@ -182,21 +270,12 @@ def generate_report_pdf(start_date, end_date, report_data):
     }
     
     product_data = [['Тип изделия', 'Количество']]
-    for item in report_data['product_stats']:
-        product_name = product_names.get(item['product_type'], item['product_type'] or 'Не указано')
-        product_data.append([product_name, str(item['count'])])
+    for item in report_data.product_stats:
+        product_name = product_names.get(item.product_type, item.product_type or 'Не указано')
+        product_data.append([product_name, str(item.count)])
     
     product_table = Table(product_data, colWidths=[8*cm, 6*cm])
-    product_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    product_table.setStyle(styles.table['report.breakdown'])
     elements.append(product_table)
     elements.append(Spacer(1, 0.5*cm))
     
@@ -204,24 +283,44 @@ def generate_report_pdf(start_date, end_date, report_data):
     elements.append(Paragraph("👥 ТОП-5 КЛИЕНТОВ", heading_style))
     
     customer_data = [['Клиент', 'Заказов', 'Сумма']]
-    for customer in report_data['top_customers']:
-        name = f"{customer['customer__name']} {customer['customer__surname']}"
-        count = str(customer['count'])
-        total = f"{customer['total_spent'] or 0:.2f} ₽"
+    for customer in report_data.top_customers:
+        name = f"{customer.name} {customer.surname}"
+        count = str(customer.count)
+        total = f"{customer.total_spent or 0:.2f} ₽"
         customer_data.append([name, count, total])
     
     customer_table = Table(customer_data, colWidths=[7*cm, 3*cm, 4*cm])
-    customer_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    customer_table.setStyle(styles.table['report.breakdown'])
     elements.append(customer_table)
+
+    # ===== СРОКИ ВЫПОЛНЕНИЯ =====
+    if cycle_report is not None:
+        elements.append(Spacer(1, 0.5*cm))
+        elements.append(Paragraph("⏱ СРОКИ ВЫПОЛНЕНИЯ", heading_style))
+        elements.append(Paragraph(
+            f"Просроченных незавершённых заказов: <b>{cycle_report.overdue_open}</b>", normal_style,
+        ))
+        elements.append(Spacer(1, 0.2*cm))
+
+        for title, rows in (
+            ('От создания до доставки', (cycle_report.overall,) if cycle_report.overall else ()),
+            ('По типам изделий', cycle_report.by_product_type),
+            ('По исполнителям', cycle_report.by_worker),
+            ('По этапам', cycle_report.stages),
+        ):
+            if not rows:
+                continue
+            cycle_data = [[title, 'Заказов', 'Среднее', 'p50', 'p90', 'С опозданием']]
+            for row in rows:
+                cycle_data.append([
+                    row.label, str(row.count), format_duration(row.avg),
+                    format_duration(row.p50), format_duration(row.p90),
+                    '—' if row.late is None else str(row.late),
+                ])
+            cycle_table = Table(cycle_data, colWidths=[5*cm, 2*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm])
+            cycle_table.setStyle(styles.table['report.breakdown'])
+            elements.append(cycle_table)
+            elements.append(Spacer(1, 0.3*cm))
     
     # Подвал
     elements.append(Spacer(1, 1*cm))
@@ -0,0 +1,132 @@
+"""
+Поддержка дневной сводки заказов (OrderDailyRollup)
+
+Сигналы Order вызывают apply_order_change() с прежним и новым состоянием
+заказа, и сводка изменяется на разницу. rebuild_rollup() пересчитывает
+диапазон дней с нуля (команда rebuild_order_rollup).
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Order, OrderDailyRollup
+
+
+# Поля заказа, от которых зависит сводка
+ROLLUP_FIELDS = ('created_at', 'order_status', 'product_type', 'order_type', 'final_price')
+
+
+def local_day(value):
+    """Дата создания заказа в текущем часовом поясе"""
+    if timezone.is_aware(value):
+        return timezone.localtime(value).date()
+    return value.date()
+
+
+def day_bounds(start_date, end_date):
+    """
+    Границы периода [start_date 00:00, end_date+1 00:00) в текущем поясе.
+    Фильтр по таким границам использует индекс по created_at, в отличие от created_at__date.
+    """
+    start = datetime.combine(start_date, time.min)
+    end = datetime.combine(end_date + timedelta(days=1), time.min)
+    if settings.USE_TZ:
+        start = timezone.make_aware(start)
+        end = timezone.make_aware(end)
+    return start, end
+
+
+def snapshot(order):
+    """Состояние заказа, значимое для сводки: (ключ, (кол-во, сумма, с ценой)) или None"""
+    if order.created_at is None:
+        return None
+    key = (
+        local_day(order.created_at),
+        order.order_status,
+        order.product_type or '',
+        order.order_type or '',
+    )
+    price = order.final_price or Decimal('0')
+    return key, (1, price, 1 if price > 0 else 0)
+
+
+def _apply_delta(key, count, revenue, confirmed):
+    day, status, product_type, order_type = key
+    bucket = OrderDailyRollup.objects.filter(
+        day=day, order_status=status, product_type=product_type, order_type=order_type,
+    )
+    updated = bucket.update(
+        orders_count=F('orders_count') + count,
+        revenue=F('revenue') + revenue,
+        confirmed_count=F('confirmed_count') + confirmed,
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            OrderDailyRollup.objects.create(
+                day=day, order_status=status, product_type=product_type, order_type=order_type,
+                orders_count=count, revenue=revenue, confirmed_count=confirmed,
+            )
+    except IntegrityError:
+        # Строку успели создать параллельно - повторяем инкремент
+        bucket.update(
+            orders_count=F('orders_count') + count,
+            revenue=F('revenue') + revenue,
+            confirmed_count=F('confirmed_count') + confirmed,
+        )
+
+
+def apply_order_change(before, after):
+    """Переносит вклад заказа из состояния before в after (любое может быть None)"""
+    if before == after:
+        return
+    if before is not None:
+        key, (count, revenue, confirmed) = before
+        _apply_delta(key, -count, -revenue, -confirmed)
+    if after is not None:
+        key, (count, revenue, confirmed) = after
+        _apply_delta(key, count, revenue, confirmed)
+
+
+def rebuild_rollup(start_date=None, end_date=None):
+    """Пересчитывает сводку за период (или целиком) по таблице orders"""
+    orders = Order.objects.all()
+    rollup = OrderDailyRollup.objects.all()
+    if start_date:
+        orders = orders.filter(created_at__gte=day_bounds(start_date, start_date)[0])
+        rollup = rollup.filter(day__gte=start_date)
+    if end_date:
+        orders = orders.filter(created_at__lt=day_bounds(end_date, end_date)[1])
+        rollup = rollup.filter(day__lte=end_date)
+
+    rows = orders.order_by().annotate(
+        day=TruncDate('created_at'),
+        pt=Coalesce('product_type', Value('')),
+        ot=Coalesce('order_type', Value('')),
+    ).values('day', 'order_status', 'pt', 'ot').annotate(
+        orders_count=Count('order_id'),
+        revenue=Coalesce(Sum('final_price'), Value(Decimal('0'))),
+        confirmed_count=Count('order_id', filter=Q(final_price__gt=0)),
+    )
+
+    with transaction.atomic():
+        rollup.delete()
+        buckets = OrderDailyRollup.objects.bulk_create(
+            (
+                OrderDailyRollup(
+                    day=row['day'], order_status=row['order_status'],
+                    product_type=row['pt'], order_type=row['ot'],
+                    orders_count=row['orders_count'], revenue=row['revenue'],
+                    confirmed_count=row['confirmed_count'],
+                )
+                for row in rows.iterator(chunk_size=5000)
+            ),
+            batch_size=5000,
+        )
+    return len(buckets)
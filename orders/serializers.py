@@ -0,0 +1,44 @@
+"""
+Сериализаторы API заказов, документов и платежей (см. jewelry_crm.api)
+
+Вложенные клиент и исполнитель заказа загружаются тем же запросом
+(select_related), связи документов и платежей отдаются идентификаторами.
+"""
+from accounts.serializers import CustomerSerializer, UserSerializer
+from jewelry_crm.api import SparseFieldsSerializer
+from .models import Document, Order, Payment
+
+
+class OrderSerializer(SparseFieldsSerializer):
+    customer = CustomerSerializer(read_only=True)
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'order_id', 'order_status', 'order_type', 'product_type',
+            'template_image', 'ring_size', 'thickness', 'width', 'stone_size',
+            'desired_weight', 'material', 'budget', 'estimated_price', 'final_price',
+            'price_confirmed', 'required_by', 'comment', 'created_at', 'updated_at',
+            'collection_product_id', 'collection_product_name', 'collection_product_price',
+            'customer', 'user',
+        ]
+        read_only_fields = fields
+
+
+class DocumentSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Document
+        # file_path - путь на сервере, в API не отдаётся
+        fields = [
+            'document_id', 'order', 'document_type', 'document_number', 'document_date',
+            'amount', 'description', 'created_by', 'uploaded_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class PaymentSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Payment
+        fields = ['payment_id', 'order', 'amount', 'payment_date', 'payment_method']
+        read_only_fields = fields
@@ -0,0 +1,110 @@
+"""
+Сигналы заказов: поддержка производных данных при изменении Order
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .customer_stats import STATS_FIELDS, apply_stats_change, stats_snapshot
+from . import pricing
+from . import updates
+from .events import EVENT_FIELDS, event_snapshot, record_changes
+from .models import Order, PricingRates
+from .report_cache import invalidate_days
+from .rollup import ROLLUP_FIELDS, apply_order_change, snapshot
+
+
+def _days(*states):
+    return [state[0][0] for state in states if state is not None]
+
+
+def _invalidate_reports(*states):
+    """
+    Сброс отчётов за дни заказа - после фиксации транзакции: иначе параллельный
+    запрос пересчитал бы отчёт по старым данным и сохранил его под новой версией
+    """
+    days = _days(*states)
+    if days:
+        transaction.on_commit(lambda: invalidate_days(days))
+
+
+@receiver(pre_save, sender=Order)
+def remember_previous_state(sender, instance, **kwargs):
+    """Запоминаем состояние заказа до сохранения, чтобы посчитать разницу"""
+    instance._previous_state = None
+    instance._previous_stats = None
+    instance._previous_events = None
+    if instance.pk is None or kwargs.get('raw'):
+        return
+    previous = Order.objects.filter(pk=instance.pk).only(
+        *ROLLUP_FIELDS, *STATS_FIELDS, *EVENT_FIELDS,
+    ).first()
+    if previous is not None:
+        instance._previous_state = snapshot(previous)
+        instance._previous_stats = stats_snapshot(previous)
+        instance._previous_events = event_snapshot(previous)
+
+
+@receiver(post_save, sender=Order)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    """Обновление дневной сводки при создании/изменении заказа"""
+    if raw:
+        return
+    before = None if created else getattr(instance, '_previous_state', None)
+    after = snapshot(instance)
+    apply_order_change(before, after)
+    _invalidate_reports(before, after)
+
+
+@receiver(post_save, sender=Order)
+def update_customer_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """Обновление счётчиков клиента при создании/изменении заказа"""
+    if raw:
+        return
+    before = None if created else getattr(instance, '_previous_stats', None)
+    apply_stats_change(before, stats_snapshot(instance))
+
+
+@receiver(post_save, sender=Order)
+def record_order_events(sender, instance, created, raw=False, **kwargs):
+    """Журнал изменений статуса, цены и исполнителя"""
+    if raw:
+        return
+    before = None if created else getattr(instance, '_previous_events', None)
+    if before is None and not created:
+        return
+    # Кто изменил - view может указать в instance.changed_by_id
+    events = record_changes(instance.pk, before, event_snapshot(instance), getattr(instance, 'changed_by_id', None))
+    # Открытые страницы заказа и списка обновляются по websocket
+    updates.publish_changes(instance, events, created)
+
+
+@receiver(post_delete, sender=Order)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Обновление дневной сводки при удалении заказа"""
+    before = snapshot(instance)
+    apply_order_change(before, None)
+    _invalidate_reports(before)
+
+
+@receiver(post_delete, sender=Order)
+def update_customer_stats_on_delete(sender, instance, **kwargs):
+    """Обновление счётчиков клиента при удалении заказа"""
+    apply_stats_change(stats_snapshot(instance), None)
+
+
+@receiver(post_delete, sender=Order)
+def publish_order_removed(sender, instance, **kwargs):
+    """Удалённый заказ убирается с открытых страниц"""
+    updates.publish_removed(instance)
+
+
+@receiver(post_save, sender=PricingRates)
+@receiver(post_delete, sender=PricingRates)
+def invalidate_pricing_rates(sender, **kwargs):
+    """
+    Новая версия тарифов - процессы перечитают их при следующем расчёте.
+    Сброс после фиксации транзакции: иначе расчёт между сбросом и фиксацией
+    снова закэширует прежние тарифы.
+    """
+    transaction.on_commit(pricing.invalidate)
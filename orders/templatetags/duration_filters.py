@@ -0,0 +1,15 @@
+from django import template
+
+from orders.analytics import format_duration
+
+register = template.Library()
+
+@register.filter(name='duration')
+def duration(value):
+    """
+    Форматирует timedelta для отчётов
+    Примеры:
+        3 дня 4 часа -> 3 д 4 ч
+        None -> —
+    """
+    return format_duration(value)
@@ -1,3 +1,909 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from io import StringIO
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+try:
+    from channels.testing import WebsocketCommunicator
+except ImportError:  # channels.testing импортирует daphne (channels[daphne] в requirements.txt)
+    WebsocketCommunicator = None
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Customer, User
+from jewelry_crm.schema import declared_indexes
+from .models import CustomerStats, Document, Order, OrderDailyRollup, OrderEvent, PricingRates
+from .analytics import cycle_time_report, format_duration
+from .batch_export import zip_stream
+from .customer_stats import find_drift, rebuild_customer_stats
+from .events import stage_durations, stage_intervals
+from .document_generator import amount_to_words_ru, num_to_words_ru
+from .management.commands.explain_order_queries import seq_scans
+from .pagination import decode_cursor, encode_cursor
+from . import pdf_jobs
+from .pdf_styles import registry
+from . import pricing
+from . import report_cache
+from .pricing import Rates, price
+from .rollup import rebuild_rollup
+from .consumers import CLOSE_FORBIDDEN
+from .routing import websocket_urlpatterns
+from .updates import MANAGERS_GROUP, customer_group, groups_for_order, groups_for_user, worker_group
+
+
+class KeysetCursorTests(TestCase):
+    """Токены курсора keyset-пагинации"""
+
+    def test_roundtrip(self):
+        self.assertEqual(decode_cursor(encode_cursor('a', 123)), ('a', 123))
+        self.assertEqual(decode_cursor(encode_cursor('b', 7)), ('b', 7))
+
+    def test_garbage_is_ignored(self):
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        self.assertIsNone(decode_cursor(''))
+
+
+class OrderListQueryCountTests(TestCase):
+    """Количество запросов order_list не зависит от размера страницы"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        client = User.objects.create_user(username='client', password='pass', role='client')
+        customer = Customer.objects.get(user=client)
+        Order.objects.bulk_create([
+            Order(customer=customer, order_status='new', product_type='ring', order_type='custom')
+            for _ in range(120)
+        ])
+
+    def _count_queries(self, per_page, cursor=None):
+        params = {'per_page': per_page}
+        if cursor:
+            params['cursor'] = cursor
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('order_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.context['page']
+
+    def test_constant_queries_regardless_of_page_size(self):
+        self.client.force_login(self.manager)
+        small, _ = self._count_queries(5)
+        large, first_page = self._count_queries(100)
+        self.assertEqual(small, large)
+
+        # Следующая страница стоит столько же, сколько первая
+        next_page, _ = self._count_queries(100, first_page.next_cursor)
+        self.assertEqual(next_page, large)
+
+    def test_pages_do_not_overlap(self):
+        self.client.force_login(self.manager)
+        _, first = self._count_queries(50)
+        _, second = self._count_queries(50, first.next_cursor)
+        first_ids = {order.order_id for order in first}
+        second_ids = {order.order_id for order in second}
+        self.assertEqual(len(first_ids), 50)
+        self.assertFalse(first_ids & second_ids)
+        self.assertLess(max(second_ids), min(first_ids))
+
+
+class OrderAccessQueryCountTests(TestCase):
+    """Права на заказ проверяются в SQL: число запросов не зависит от роли"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        cls.worker = User.objects.create_user(username='jeweler', password='pass', role='jeweler')
+        cls.owner = User.objects.create_user(username='owner', password='pass', role='client')
+        cls.stranger = User.objects.create_user(username='stranger', password='pass', role='client')
+        cls.order = Order.objects.create(
+            customer=Customer.objects.get(user=cls.owner), user=cls.worker,
+            order_status='new', product_type='ring', order_type='custom',
+        )
+        cls.other_order = Order.objects.create(
+            customer=Customer.objects.get(user=cls.stranger),
+            order_status='new', product_type='ring', order_type='custom',
+        )
+
+    def _queries(self, user, url):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_for_user_scopes_by_role(self):
+        self.assertEqual(set(Order.objects.for_user(self.manager)), {self.order, self.other_order})
+        self.assertEqual(list(Order.objects.for_user(self.owner)), [self.order])
+        self.assertEqual(list(Order.objects.for_user(self.worker)), [self.order])
+
+    def test_scoping_is_a_single_query(self):
+        for user in (self.manager, self.owner, self.worker):
+            with self.subTest(role=user.role), self.assertNumQueries(1):
+                list(Order.objects.for_user(user).filter(pk=self.order.pk))
+
+    def test_same_queries_for_every_role(self):
+        everyone = (self.manager, self.owner, self.worker)
+        for name, url, users in (
+            # Менеджеру order_detail дополнительно рендерит форму со списком исполнителей
+            ('order_detail', reverse('order_detail', args=[self.order.pk]), (self.owner, self.worker)),
+            ('document_list', reverse('document_list', args=[self.order.pk]), everyone),
+            ('order_list', reverse('order_list'), everyone),
+        ):
+            with self.subTest(view=name):
+                counts = {user.role: self._queries(user, url) for user in users}
+                self.assertEqual(len(set(counts.values())), 1, counts)
+
+    def test_foreign_order_not_found(self):
+        for user in (self.owner, self.worker):
+            self.client.force_login(user)
+            for name in ('order_detail', 'order_delete', 'document_list'):
+                with self.subTest(role=user.role, view=name):
+                    response = self.client.get(reverse(name, args=[self.other_order.pk]))
+                    if name == 'order_delete' and user is self.worker:
+                        self.assertRedirects(response, reverse('order_list'), fetch_redirect_response=False)
+                    else:
+                        self.assertEqual(response.status_code, 404)
+
+
+class AsyncOrderViewTests(TestCase):
+    """order_list и order_detail - async views, работают и через ASGI-клиент"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        cls.owner = User.objects.create_user(username='owner', password='pass', role='client')
+        cls.order = Order.objects.create(
+            customer=Customer.objects.get(user=cls.owner),
+            order_status='new', product_type='ring', order_type='custom',
+        )
+
+    async def test_order_list(self):
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.get(reverse('order_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([order.pk for order in response.context['page']], [self.order.pk])
+
+    async def test_order_detail(self):
+        url = reverse('order_detail', args=[self.order.pk])
+        await self.async_client.aforce_login(self.owner)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['update_form'])
+
+        # Менеджеру форма редактирования рендерится в потоке
+        await self.async_client.aforce_login(self.manager)
+        response = await self.async_client.get(url)
+        self.assertIsNotNone(response.context['update_form'])
+
+    async def test_anonymous_redirected(self):
+        response = await self.async_client.get(reverse('order_list'))
+        self.assertEqual(response.status_code, 302)
+
+
+class OrderEventLogTests(TestCase):
+    """Журнал изменений заказа и длительность этапов"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = User.objects.create_user(username='jeweler', password='pass', role='jeweler')
+        client = User.objects.create_user(username='client', password='pass', role='client')
+        cls.customer = Customer.objects.get(user=client)
+
+    def test_changes_are_logged_in_one_insert(self):
+        order = Order.objects.create(customer=self.customer, order_status='new', product_type='ring')
+        self.assertEqual(
+            list(OrderEvent.objects.filter(order_id=order.pk).values_list('kind', 'old_value', 'new_value')),
+            [('status', None, 'new')],
+        )
+
+        order.order_status = 'in_work'
+        order.user = self.worker
+        order.changed_by_id = self.worker.pk
+        order.comment = 'не отслеживается'
+        order.save()
+
+        events = OrderEvent.objects.filter(order_id=order.pk).exclude(new_value='new')
+        self.assertEqual(
+            {(e.kind, e.old_value, e.new_value, e.actor_id) for e in events},
+            {('status', 'new', 'in_work', self.worker.pk),
+             ('assignee', None, str(self.worker.pk), self.worker.pk)},
+        )
+        self.assertEqual(len({e.ts for e in events}), 1)
+
+    def test_stage_durations(self):
+        order = Order.objects.create(customer=self.customer, order_status='new', product_type='ring')
+        OrderEvent.objects.filter(order_id=order.pk).update(ts=timezone.now() - timedelta(hours=5))
+        order.order_status = 'in_work'
+        order.save()
+
+        [interval, current] = stage_intervals([order.pk])
+        self.assertEqual((interval.stage, current.stage, current.left_at), ('new', 'in_work', None))
+
+        [summary] = stage_durations([order.pk])
+        self.assertEqual((summary.stage, summary.count), ('new', 1))
+        self.assertAlmostEqual(summary.median.total_seconds(), 5 * 3600, delta=60)
+
+
+class CustomerStatsTests(TestCase):
+    """Счётчики заказов клиента меняются на разницу и сверяются с orders"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Customer.objects.get(user=User.objects.create_user(username='first', password='pass', role='client'))
+        cls.second = Customer.objects.get(user=User.objects.create_user(username='second', password='pass', role='client'))
+
+    def _stats(self, customer):
+        stats = CustomerStats.objects.filter(customer_id=customer.pk).first()
+        if stats is None:
+            return None
+        return stats.orders_count, stats.total_spent, stats.last_order_at
+
+    def _create(self, customer, final_price=None, days_ago=0):
+        order = Order.objects.create(customer=customer, order_status='new', final_price=final_price)
+        if days_ago:
+            order.created_at -= timedelta(days=days_ago)
+            order.save()
+        return order
+
+    def test_create_and_price_change(self):
+        order = self._create(self.first, Decimal('100'))
+        self.assertEqual(self._stats(self.first), (1, Decimal('100'), order.created_at))
+
+        order.final_price = Decimal('150')
+        order.save()
+        self.assertEqual(self._stats(self.first), (1, Decimal('150'), order.created_at))
+        self.assertEqual(find_drift(), [])
+
+    def test_move_to_another_customer(self):
+        older = self._create(self.first, Decimal('30'), days_ago=3)
+        order = self._create(self.first, Decimal('70'))
+
+        order.customer = self.second
+        order.save()
+        self.assertEqual(self._stats(self.first), (1, Decimal('30'), older.created_at))
+        self.assertEqual(self._stats(self.second), (1, Decimal('70'), order.created_at))
+        self.assertEqual(find_drift(), [])
+
+    def test_delete_latest_order_refreshes_last_order(self):
+        older = self._create(self.first, Decimal('10'), days_ago=5)
+        latest = self._create(self.first, Decimal('20'))
+
+        latest.delete()
+        self.assertEqual(self._stats(self.first), (1, Decimal('10'), older.created_at))
+
+        older.delete()
+        self.assertEqual(self._stats(self.first), (0, Decimal('0'), None))
+        self.assertEqual(find_drift(), [])
+
+    def test_drift_found_and_rebuilt(self):
+        self._create(self.first, Decimal('10'))
+        self._create(self.second, Decimal('20'))
+        CustomerStats.objects.filter(customer_id=self.second.pk).update(orders_count=5)
+        self.assertEqual(find_drift(), [self.second.pk])
+
+        rebuild_customer_stats([self.second.pk])
+        self.assertEqual(find_drift(), [])
+        self.assertEqual(self._stats(self.second)[:2], (1, Decimal('20')))
+
+
+class OrderDailyRollupTests(TestCase):
+    """Дневная сводка меняется на разницу при сохранении и удалении заказа"""
+
+    @classmethod
+    def setUpTestData(cls):
+        client = User.objects.create_user(username='client', password='pass', role='client')
+        cls.customer = Customer.objects.get(user=client)
+
+    def _buckets(self):
+        """Непустые строки сводки: {(день, статус, тип изделия): (кол-во, сумма, с ценой)}"""
+        return {
+            (row.day, row.order_status, row.product_type): (row.orders_count, row.revenue, row.confirmed_count)
+            for row in OrderDailyRollup.objects.filter(orders_count__gt=0)
+        }
+
+    def _create(self, **fields):
+        return Order.objects.create(customer=self.customer, order_type='custom', **fields)
+
+    def test_status_change_moves_order_between_buckets(self):
+        today = timezone.localdate()
+        order = self._create(order_status='new', product_type='ring', final_price=Decimal('100'))
+        self._create(order_status='new', product_type='ring')
+        self.assertEqual(self._buckets(), {(today, 'new', 'ring'): (2, Decimal('100'), 1)})
+
+        order.order_status = 'in_work'
+        order.final_price = Decimal('150')
+        order.save()
+        self.assertEqual(self._buckets(), {
+            (today, 'new', 'ring'): (1, Decimal('0'), 0),
+            (today, 'in_work', 'ring'): (1, Decimal('150'), 1),
+        })
+
+    def test_day_change(self):
+        order = self._create(order_status='new', product_type='brooch', final_price=Decimal('70'))
+        yesterday = timezone.localdate() - timedelta(days=1)
+        order.created_at -= timedelta(days=1)
+        order.save()
+        self.assertEqual(self._buckets(), {(yesterday, 'new', 'brooch'): (1, Decimal('70'), 1)})
+
+    def test_delete_removes_contribution(self):
+        order = self._create(order_status='ready', product_type='ring', final_price=Decimal('40'))
+        self._create(order_status='ready', product_type='ring', final_price=Decimal('60'))
+        order.delete()
+        self.assertEqual(self._buckets(), {(timezone.localdate(), 'ready', 'ring'): (1, Decimal('60'), 1)})
+
+    def test_incremental_matches_rebuild(self):
+        orders = [
+            self._create(order_status='new', product_type=product_type, final_price=price)
+            for product_type, price in (('ring', Decimal('10')), ('brooch', None), (None, Decimal('5')))
+        ]
+        orders[0].order_status = 'delivered'
+        orders[0].save()
+        orders[1].delete()
+
+        incremental = self._buckets()
+        rebuild_rollup()
+        self.assertEqual(self._buckets(), incremental)
+
+
+@skipIf(WebsocketCommunicator is None, 'для channels.testing нужен daphne')
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class OrderUpdatesWebsocketTests(TransactionTestCase):
+    """
+    Изменения заказа приходят по websocket только тем, кому заказ виден.
+    TransactionTestCase: consumer читает БД через database_sync_to_async,
+    а тот закрывает соединение - транзакция TestCase этого не переживает.
+    """
+
+    usernames = ('manager', 'jeweler', 'modeler', 'owner', 'stranger', 'noprofile')
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        self.worker = User.objects.create_user(username='jeweler', password='pass', role='jeweler')
+        self.other_worker = User.objects.create_user(username='modeler', password='pass', role='modeler')
+        self.owner = User.objects.create_user(username='owner', password='pass', role='client')
+        self.stranger = User.objects.create_user(username='stranger', password='pass', role='client')
+        self.customer = Customer.objects.get(user=self.owner)
+        self.order = Order.objects.create(
+            customer=self.customer, user=self.worker,
+            order_status='new', product_type='ring', order_type='custom',
+        )
+        self.addCleanup(self._delete_users)
+
+    def _delete_users(self):
+        # Таблицы users, customers и orders не управляются Django, и
+        # TransactionTestCase не очищает их после теста
+        Order.objects.filter(customer__user__username__in=self.usernames).delete()
+        User.objects.filter(username__in=self.usernames).delete()
+
+    def test_groups_follow_access_rules(self):
+        self.assertEqual(groups_for_user(self.manager), [MANAGERS_GROUP])
+        self.assertEqual(groups_for_user(self.owner), [customer_group(self.customer.pk)])
+        self.assertEqual(groups_for_user(self.worker), [worker_group(self.worker.pk)])
+        self.assertEqual(
+            groups_for_order(self.order),
+            [MANAGERS_GROUP, customer_group(self.customer.pk), worker_group(self.worker.pk)],
+        )
+
+    async def _connect(self, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/orders/')
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    def _save(self, **changes):
+        order = Order.objects.get(pk=self.order.pk)
+        for field, value in changes.items():
+            setattr(order, field, value)
+        # Вне транзакции теста on_commit-колбэки выполняются сразу после save()
+        order.save()
+
+    async def test_status_change_is_pushed(self):
+        owner, manager, stranger = [await self._connect(u) for u in (self.owner, self.manager, self.stranger)]
+
+        await database_sync_to_async(self._save)(order_status='in_work')
+
+        for communicator in (owner, manager):
+            message = await communicator.receive_json_from()
+            self.assertEqual((message['order_id'], message['status']), (self.order.pk, 'in_work'))
+            self.assertEqual(message['changes'], [{'kind': 'status', 'old': 'new', 'new': 'in_work'}])
+        self.assertTrue(await stranger.receive_nothing())
+
+        for communicator in (owner, manager, stranger):
+            await communicator.disconnect()
+
+    async def test_reassigned_worker_loses_order(self):
+        worker, other_worker = [await self._connect(u) for u in (self.worker, self.other_worker)]
+
+        await database_sync_to_async(self._save)(user=self.other_worker)
+
+        self.assertEqual(await worker.receive_json_from(), {'order_id': self.order.pk, 'removed': True})
+        message = await other_worker.receive_json_from()
+        self.assertEqual(message['assignee_id'], self.other_worker.pk)
+
+        for communicator in (worker, other_worker):
+            await communicator.disconnect()
+
+    async def test_without_access_closed_with_4403(self):
+        # Клиенту без профиля Customer подписываться не на что
+        no_profile = await database_sync_to_async(User.objects.create_user)(
+            username='noprofile', password='pass', role='client',
+        )
+        await Customer.objects.filter(user=no_profile).adelete()
+
+        for user in (AnonymousUser(), no_profile):
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/orders/')
+            communicator.scope['user'] = user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            output = await communicator.receive_output()
+            self.assertEqual((output['type'], output['code']), ('websocket.close', CLOSE_FORBIDDEN))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                       'LOCATION': 'report-cache-tests'}})
+class ReportCacheTests(TestCase):
+    """Кэш отчётов по периоду: попадания, промахи и сброс по дням"""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.computed = []
+        self.start = timezone.localdate() - timedelta(days=6)
+        self.end = timezone.localdate()
+
+    def _compute(self, start_date, end_date):
+        self.computed.append((start_date, end_date))
+        return {'period': (start_date, end_date), 'n': len(self.computed)}
+
+    def _report(self, start=None, end=None):
+        return report_cache.get_report(start or self.start, end or self.end, self._compute)
+
+    def test_hit_and_miss(self):
+        first = self._report()
+        self.assertEqual(self._report(), first)
+        self.assertEqual(len(self.computed), 1)
+
+        # Другой период - свой ключ; перевёрнутые границы нормализуются
+        self._report(self.start, self.start)
+        self.assertEqual(self._report(self.end, self.start), first)
+        self.assertEqual(len(self.computed), 2)
+
+    def test_invalidation_is_per_day(self):
+        self._report()
+        report_cache.invalidate_days([self.end + timedelta(days=1)])
+        self._report()
+        self.assertEqual(len(self.computed), 1)
+
+        report_cache.invalidate_days([self.start + timedelta(days=3)])
+        self.assertEqual(self._report()['n'], 2)
+
+    def test_order_change_invalidates_after_commit(self):
+        order = Order.objects.create(order_status='new', product_type='ring')
+        self._report()
+
+        order.order_status = 'in_work'
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            order.save()
+        # До фиксации транзакции отчёт ещё прежний
+        self._report()
+        self.assertEqual(len(self.computed), 1)
+
+        for callback in callbacks:
+            callback()
+        self._report()
+        self.assertEqual(len(self.computed), 2)
+
+
+class CycleTimeReportTests(TestCase):
+    """Сроки выполнения заказов по журналу статусов"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = User.objects.create_user(username='jeweler', password='pass', role='jeweler')
+        client = User.objects.create_user(username='client', password='pass', role='client')
+        cls.customer = Customer.objects.get(user=client)
+
+    def test_delivered_orders_grouped(self):
+        now = timezone.now()
+        for product_type, days in (('ring', 2), ('ring', 4), ('brooch', 10)):
+            order = Order.objects.create(
+                customer=self.customer, user=self.worker, order_status='new', product_type=product_type,
+                required_by=now - timedelta(days=1),
+            )
+            # created_at задаётся у экземпляра: save() записывает все поля
+            order.created_at = now - timedelta(days=days)
+            order.order_status = 'delivered'
+            order.save()
+        Order.objects.create(customer=self.customer, order_status='new', required_by=now - timedelta(days=1))
+
+        report = cycle_time_report(timezone.localdate(), timezone.localdate())
+        self.assertEqual((report.overall.count, report.overall.late), (3, 3))
+        rings = next(row for row in report.by_product_type if row.key == 'ring')
+        self.assertAlmostEqual(rings.p50.total_seconds(), 3 * 86400, delta=60)
+        self.assertEqual([row.key for row in report.by_worker], [self.worker.pk])
+        self.assertEqual(report.overdue_open, 1)
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(timedelta(days=3, hours=4, minutes=5)), '3 д 4 ч')
+        self.assertEqual(format_duration(timedelta(hours=5, minutes=10)), '5 ч 10 мин')
+        self.assertEqual(format_duration(None), '—')
+
+
+class PdfStyleRegistryTests(SimpleTestCase):
+    """Шрифты и стили PDF создаются один раз на процесс"""
+
+    def test_registry_is_shared(self):
+        self.assertIs(registry(), registry())
+        self.assertIs(registry().paragraph['invoice.normal'], registry().paragraph['invoice.normal'])
+
+    def test_styles_use_registered_fonts(self):
+        styles = registry()
+        self.assertEqual(styles.paragraph['act.normal'].fontName, styles.font)
+        self.assertEqual(styles.paragraph['act.title'].fontName, styles.font_bold)
+
+
+class PdfJobTests(SimpleTestCase):
+    """Задания фоновой генерации PDF: идентификаторы, статусы, повторная постановка"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(PDF_RENDER_DIR=directory.name, PDF_RENDER_TIMEOUT=60)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # Рендеринг не запускаем - проверяется только постановка в очередь
+        patcher = mock.patch.object(pdf_jobs, '_get_executor')
+        self.executor = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+        self.order = Order(order_id=7, order_status='new', final_price=Decimal('100'))
+        self.job_id = pdf_jobs.brief_job_id(self.order)
+
+    def test_parse_job_id(self):
+        self.assertEqual(pdf_jobs.parse_job_id(self.job_id), ('brief', 7))
+        self.assertEqual(pdf_jobs.parse_job_id(f'document-12-{"0" * 32}'), ('document', 12))
+        for job_id in (None, '', 'brief-7', 'report-7-' + '0' * 32, '../brief-7-' + '0' * 32):
+            self.assertIsNone(pdf_jobs.parse_job_id(job_id))
+
+    def test_fingerprint_follows_content(self):
+        self.assertEqual(pdf_jobs.brief_job_id(self.order), self.job_id)
+        self.order.final_price = Decimal('120')
+        self.assertNotEqual(pdf_jobs.brief_job_id(self.order), self.job_id)
+
+        document = Document(document_id=3, order=self.order, document_type='invoice', amount=Decimal('1'))
+        job_id = pdf_jobs.document_job_id(document)
+        document.amount = Decimal('2')
+        self.assertNotEqual(pdf_jobs.document_job_id(document), job_id)
+
+    def test_submit_once_while_pending(self):
+        self.assertEqual(pdf_jobs.job_status(self.job_id), pdf_jobs.STATUS_MISSING)
+        self.assertEqual(pdf_jobs.submit(self.job_id), pdf_jobs.STATUS_PENDING)
+        self.assertEqual(pdf_jobs.submit(self.job_id), pdf_jobs.STATUS_PENDING)
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+    def test_stale_pending_is_resubmitted(self):
+        pdf_jobs.submit(self.job_id)
+        # Маркер остался от воркера, перезапущенного до завершения задания
+        stale = time.time() - 120
+        os.utime(pdf_jobs._path(self.job_id, 'pending'), (stale, stale))
+        self.assertEqual(pdf_jobs.job_status(self.job_id), pdf_jobs.STATUS_MISSING)
+
+        self.assertEqual(pdf_jobs.submit(self.job_id), pdf_jobs.STATUS_PENDING)
+        self.assertEqual(self.executor.submit.call_count, 2)
+        self.assertEqual(pdf_jobs.job_status(self.job_id), pdf_jobs.STATUS_PENDING)
+
+    def test_ready_and_failed(self):
+        with open(pdf_jobs._path(self.job_id, 'error'), 'w') as f:
+            f.write('ошибка')
+        self.assertEqual(pdf_jobs.job_status(self.job_id), pdf_jobs.STATUS_FAILED)
+
+        with open(pdf_jobs.result_path(self.job_id), 'wb') as f:
+            f.write(b'%PDF')
+        self.assertEqual(pdf_jobs.submit(self.job_id), pdf_jobs.STATUS_READY)
+        self.executor.submit.assert_not_called()
+
+    def test_store_by_concurrent_writers(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: pdf_jobs._store(self.job_id, b'%PDF' * 1000), range(32)))
+        with open(pdf_jobs.result_path(self.job_id), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF' * 1000)
+        self.assertEqual(os.listdir(pdf_jobs.render_dir()), [f'{self.job_id}.pdf'])
+
+    def test_old_versions_pruned_after_delay(self):
+        old_id = self.job_id
+        pdf_jobs._store(old_id, b'old')
+        self.order.final_price = Decimal('120')
+        new_id = pdf_jobs.brief_job_id(self.order)
+
+        # Только что сохранённую версию ещё могут открывать
+        pdf_jobs._store(new_id, b'new')
+        self.assertTrue(os.path.exists(pdf_jobs.result_path(old_id)))
+
+        expired = time.time() - pdf_jobs.PRUNE_DELAY - 1
+        os.utime(pdf_jobs.result_path(old_id), (expired, expired))
+        pdf_jobs._store(new_id, b'new')
+        self.assertFalse(os.path.exists(pdf_jobs.result_path(old_id)))
+        with pdf_jobs.render_now(new_id) as f:
+            self.assertEqual(f.read(), b'new')
+
+
+class BatchExportZipTests(SimpleTestCase):
+    """Потоковый ZIP пакетной выгрузки документов"""
+
+    def test_zip_stream_is_valid_archive(self):
+        import io
+        import zipfile
+
+        data = b''.join(zip_stream([('Счёт_1.pdf', b'one'), ('Счёт_1.pdf', b'two'), ('Акт_2.pdf', b'three')]))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ['Счёт_1.pdf', 'Счёт_1_2.pdf', 'Акт_2.pdf'])
+            self.assertEqual(archive.read('Счёт_1_2.pdf'), b'two')
+
+
+def _words_to_number(text):
+    """Обратное преобразование прописи в число - для проверки num_to_words_ru"""
+    from .document_generator import HUNDREDS, SCALES, TEENS, TENS, UNITS, UNITS_FEM
+
+    values = {}
+    for table, step in ((UNITS, 1), (UNITS_FEM, 1), (TENS, 10), (HUNDREDS, 100)):
+        values.update({word: i * step for i, word in enumerate(table) if word})
+    values.update({word: 10 + i for i, word in enumerate(TEENS)})
+    scales = {form: scale for scale, forms, _ in SCALES for form in forms}
+
+    total = group = 0
+    for word in text.split():
+        if word in scales:
+            total += group * scales[word]
+            group = 0
+        else:
+            group += values[word]
+    return total + group
+
+
+class NumToWordsTests(SimpleTestCase):
+    """Сумма прописью"""
+
+    def test_known_values(self):
+        self.assertEqual(num_to_words_ru(0), 'ноль')
+        self.assertEqual(num_to_words_ru(21000), 'двадцать одна тысяча')
+        self.assertEqual(num_to_words_ru(2000000), 'два миллиона')
+        self.assertEqual(num_to_words_ru(1001001), 'один миллион одна тысяча один')
+        self.assertEqual(num_to_words_ru(3000000000), 'три миллиарда')
+
+    def test_roundtrip_over_range(self):
+        import random
+
+        rng = random.Random(42)
+        numbers = [1, 10, 11, 19, 20, 100, 999, 1000, 1001, 11000, 999999, 1000000, 999999999]
+        numbers += [rng.randint(1, 999999999) for _ in range(20000)]
+        for number in numbers:
+            words = num_to_words_ru(number)
+            self.assertNotIn('  ', words)
+            self.assertEqual(_words_to_number(words), number, words)
+
+    def test_gender_of_thousands(self):
+        for number, words in ((1000, 'одна тысяча'), (2000, 'две тысячи'), (5000, 'пять тысяч'),
+                              (11000, 'одиннадцать тысяч'), (22000, 'двадцать две тысячи')):
+            self.assertEqual(num_to_words_ru(number), words)
+
+    def test_amount_with_kopeks(self):
+        self.assertEqual(amount_to_words_ru('1.01'), 'один рубль 01 копейка')
+        self.assertEqual(amount_to_words_ru('2.02'), 'два рубля 02 копейки')
+        self.assertEqual(amount_to_words_ru('1234.5'), 'одна тысяча двести тридцать четыре рубля 50 копеек')
+        self.assertEqual(amount_to_words_ru(None), 'ноль рублей 00 копеек')
+
+
+class OrderIndexDeclarationTests(SimpleTestCase):
+    """Индексы orders объявлены в модели и находятся apply_indexes"""
+
+    def test_order_indexes_declared(self):
+        names = {index.name for model, index in declared_indexes(['orders']) if model is Order}
+        self.assertLessEqual(
+            {'orders_customer_recent_idx', 'orders_user_recent_idx',
+             'orders_status_created_idx', 'orders_created_idx'},
+            names,
+        )
+
+    def test_managed_models_skipped(self):
+        self.assertTrue(all(not model._meta.managed for model, _ in declared_indexes()))
+
+    def test_seq_scan_found_in_nested_plan(self):
+        plan = {'Node Type': 'Limit', 'Plans': [
+            {'Node Type': 'Sort', 'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'orders'}]},
+            {'Node Type': 'Seq Scan', 'Relation Name': 'customers'},
+        ]}
+        self.assertEqual(len(seq_scans(plan, 'orders')), 1)
+        self.assertEqual(seq_scans({'Node Type': 'Index Scan', 'Relation Name': 'orders'}, 'orders'), [])
+
+
+class PricingTests(SimpleTestCase):
+    """Цена по тарифам совпадает с прежней формулой calculate_order_price"""
+
+    rates = Rates(
+        version=1,
+        materials={'gold_585': 3500, 'gold_750': 4200, 'silver_925': 45, 'platinum': 8500},
+        product_complexity={'ring': 1.0, 'brooch': 1.3, 'bracelet': 1.1, 'earrings': 0.9},
+    )
+
+    def test_custom_order(self):
+        self.assertEqual(price('custom', 'ring', 'gold_585', None, Decimal('5'), self.rates), 23625.0)
+        self.assertEqual(price('custom', 'ring', 'gold_585', None, None, self.rates), 23625.0)
+
+    def test_template_order(self):
+        self.assertEqual(price('template', 'brooch', 'gold_750', None, None, self.rates), 88452.0)
+        self.assertEqual(price('template', 'ring', 'gold_585', '18', None, self.rates), 51030.0)
+
+    def test_unpriceable(self):
+        self.assertIsNone(price('custom', 'ring', 'wood', None, None, self.rates))
+        self.assertIsNone(price('collection', 'ring', 'gold_585', None, None, self.rates))
+        self.assertIsNone(price('template', 'ring', 'gold_585', 'большой', None, self.rates))
+        self.assertIsNone(price('custom', 'ring', 'gold_585', None, Decimal('-1'), self.rates))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                       'LOCATION': 'pricing-tests'}})
+class PricingRatesTests(TestCase):
+    """Версии тарифов в БД: сброс после фиксации и пересчёт заказов"""
+
+    materials = {'gold_585': 3500, 'gold_750': 4200, 'silver_925': 45, 'platinum': 8500}
+    complexity = {'ring': 1.0, 'brooch': 1.3, 'bracelet': 1.1, 'earrings': 0.9}
+
+    def setUp(self):
+        caches['default'].clear()
+        pricing.invalidate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rates = PricingRates.objects.create(materials=self.materials, product_complexity=self.complexity)
+
+    def test_new_rates_after_commit(self):
+        self.assertEqual(pricing.current_rates().version, self.rates.version)
+        with self.captureOnCommitCallbacks(execute=True):
+            new_rates = PricingRates.objects.create(materials=self.materials, product_complexity=self.complexity)
+            # До фиксации транзакции действуют прежние тарифы
+            self.assertEqual(pricing.current_rates().version, self.rates.version)
+        self.assertEqual(pricing.current_rates().version, new_rates.version)
+
+    def _order(self, estimated_price, price_confirmed=False):
+        order = Order.objects.create(
+            order_status='new', order_type='custom', product_type='ring', material='gold_585',
+            desired_weight=Decimal('5'), estimated_price=estimated_price, price_confirmed=price_confirmed,
+        )
+        Order.objects.filter(pk=order.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        return Order.objects.get(pk=order.pk)
+
+    def test_reprice_writes_changed_unconfirmed_orders(self):
+        stale = self._order(Decimal('100.00'))
+        current = self._order(Decimal('23625.00'))
+        confirmed = self._order(Decimal('100.00'), price_confirmed=True)
+
+        result = pricing.reprice_orders(batch_size=1)
+        self.assertEqual((result.version, result.checked, result.changed), (self.rates.version, 2, 1))
+
+        for order, price_after, touched in ((stale, Decimal('23625.00'), True),
+                                            (current, Decimal('23625.00'), False),
+                                            (confirmed, Decimal('100.00'), False)):
+            with self.subTest(order=order.pk):
+                fresh = Order.objects.get(pk=order.pk)
+                self.assertEqual(fresh.estimated_price, price_after)
+                self.assertEqual(fresh.updated_at > order.updated_at, touched)
+
+    def test_reprice_dry_run_writes_nothing(self):
+        stale = self._order(Decimal('100.00'))
+        out = StringIO()
+        call_command('reprice_orders', '--dry-run', stdout=out)
+        self.assertIn('изменилась бы цена 1', out.getvalue())
+        fresh = Order.objects.get(pk=stale.pk)
+        self.assertEqual((fresh.estimated_price, fresh.updated_at), (stale.estimated_price, stale.updated_at))
+
+
+class PriceQuoteViewTests(TestCase):
+    """JSON-расчёт цены для формы создания заказа"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='client', password='pass', role='client')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('order_price_quote')
+
+    def test_same_price_as_saved_order(self):
+        params = {'order_type': 'custom', 'product_type': 'brooch', 'material': 'gold_750',
+                  'desired_weight': '6.5'}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        order = Order(order_type='custom', product_type='brooch', material='gold_750',
+                      desired_weight=Decimal('6.5'))
+        self.assertEqual(response.json()['price'], pricing.calculate_price(order))
+
+    def test_invalid_params(self):
+        response = self.client.get(self.url, {'order_type': 'custom', 'product_type': 'ring'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('material', response.json()['errors'])
+
+    def test_manager_form_uses_quote_endpoint(self):
+        manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        order = Order.objects.create(order_status='new', product_type='ring', order_type='custom')
+        self.client.force_login(manager)
+        response = self.client.get(reverse('order_detail', args=[order.pk]))
+        self.assertContains(response, f'data-quote-url="{self.url}"')
+        self.assertNotContains(response, 'PRICING_CONFIG')
+
+    def test_repeated_quote_without_queries(self):
+        pricing.quote('template', 'ring', 'gold_585', '18')
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                pricing.quote('template', 'ring', 'gold_585', '18'),
+                pricing.quote('template', 'ring', 'gold_585', '18'),
+            )
+
+
+class ReadOnlyApiTests(TestCase):
+    """REST API: права как на сайте, ?fields= -> only(), курсор, ETag"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username='manager', password='pass', role='manager')
+        cls.owner = User.objects.create_user(username='owner', password='pass', role='client')
+        stranger = User.objects.create_user(username='stranger', password='pass', role='client')
+        customer = Customer.objects.get(user=cls.owner)
+        cls.orders = [
+            Order.objects.create(customer=customer, order_status='new', product_type='ring', order_type='custom')
+            for _ in range(3)
+        ]
+        Order.objects.create(customer=Customer.objects.get(user=stranger), order_status='new')
+
+    def test_orders_scoped_and_paginated(self):
+        self.client.force_login(self.owner)
+        response = self.client.get('/api/orders/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertEqual([o['order_id'] for o in first['results']], [self.orders[2].pk, self.orders[1].pk])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual([o['order_id'] for o in second['results']], [self.orders[0].pk])
+        self.assertIsNone(second['next'])
+
+    def test_sparse_fields_select_only_needed_columns(self):
+        self.client.force_login(self.manager)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/orders/', {'fields': 'order_id,order_status,customer'})
+        self.assertEqual(set(response.json()['results'][0]), {'order_id', 'order_status', 'customer'})
+
+        [sql] = [q['sql'] for q in ctx.captured_queries if 'FROM "orders"' in q['sql']]
+        self.assertIn('"customers"', sql)
+        self.assertNotIn('"comment"', sql)
+
+    def test_unknown_field_rejected(self):
+        self.client.force_login(self.manager)
+        response = self.client.get('/api/orders/', {'fields': 'order_id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_etag_not_modified(self):
+        self.client.force_login(self.owner)
+        response = self.client.get('/api/orders/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/orders/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.orders[0].order_status = 'in_work'
+        self.orders[0].save()
+        self.assertEqual(self.client.get('/api/orders/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_customers_visible_to_manager_only(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(len(self.client.get('/api/customers/').json()['results']), 1)
+        self.client.force_login(self.manager)
+        self.assertEqual(len(self.client.get('/api/customers/').json()['results']), 2)
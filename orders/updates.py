@@ -0,0 +1,119 @@
+"""
+Рассылка изменений заказов подписчикам websocket (Channels)
+
+После сохранения заказа сигнал передаёт сюда события журнала (статус,
+окончательная цена, исполнитель). Сообщение уходит в группы слоя каналов
+после фиксации транзакции - только тем, кому заказ виден на order_detail
+(те же правила, что Order.objects.for_user):
+
+    orders.managers          - все менеджеры
+    orders.customer.<id>     - клиент-владелец заказа
+    orders.worker.<user_id>  - назначенный модельер/ювелир
+
+Прежний исполнитель при переназначении получает только отметку, что заказ
+ему больше не доступен. Без CHANNEL_LAYERS рассылка выключена.
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from accounts.models import Customer
+from .models import OrderEvent
+
+MESSAGE_TYPE = 'order.changed'
+MANAGERS_GROUP = 'orders.managers'
+
+
+def customer_group(customer_id):
+    return f'orders.customer.{customer_id}'
+
+
+def worker_group(user_id):
+    return f'orders.worker.{user_id}'
+
+
+def groups_for_user(user):
+    """Группы, на которые подписывается пользователь (синхронно, для database_sync_to_async)"""
+    if not user.is_authenticated:
+        return []
+    if user.role == 'manager':
+        return [MANAGERS_GROUP]
+    if user.role == 'client':
+        return [
+            customer_group(customer_id)
+            for customer_id in Customer.objects.filter(user=user).values_list('customer_id', flat=True)
+        ]
+    if user.role in ('modeler', 'jeweler'):
+        return [worker_group(user.pk)]
+    return []
+
+
+def groups_for_order(order):
+    """Группы, которым виден заказ"""
+    groups = [MANAGERS_GROUP]
+    if order.customer_id is not None:
+        groups.append(customer_group(order.customer_id))
+    if order.user_id is not None:
+        groups.append(worker_group(order.user_id))
+    return groups
+
+
+def _assignee_name(order):
+    if order.user_id is None:
+        return None
+    return order.user.get_full_name() or order.user.username
+
+
+def order_payload(order, events, created=False):
+    """Данные для страницы: текущие значения и список изменений"""
+    return {
+        'order_id': order.pk,
+        'created': created,
+        'status': order.order_status,
+        'status_display': order.get_status_display_ru(),
+        'final_price': str(order.final_price) if order.final_price is not None else None,
+        'assignee_id': order.user_id,
+        'assignee': _assignee_name(order),
+        'changes': [
+            {'kind': event.kind, 'old': event.old_value, 'new': event.new_value}
+            for event in events
+        ],
+    }
+
+
+def _previous_assignees(order, events):
+    """Исполнители, с которых заказ сняли этими изменениями"""
+    return {
+        int(event.old_value) for event in events
+        if event.kind == OrderEvent.KIND_ASSIGNEE and event.old_value and int(event.old_value) != order.user_id
+    }
+
+
+def _send(messages):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    for group, payload in messages:
+        async_to_sync(layer.group_send)(group, {'type': MESSAGE_TYPE, 'order': payload})
+
+
+def publish_changes(order, events, created=False):
+    """Рассылает изменения заказа после фиксации текущей транзакции"""
+    if not events or get_channel_layer() is None:
+        return
+    payload = order_payload(order, events, created)
+    messages = [(group, payload) for group in groups_for_order(order)]
+    messages += [
+        (worker_group(user_id), {'order_id': order.pk, 'removed': True})
+        for user_id in _previous_assignees(order, events)
+    ]
+    transaction.on_commit(lambda: _send(messages))
+
+
+def publish_removed(order):
+    """Заказ удалён - страницы убирают его из списка"""
+    if get_channel_layer() is None:
+        return
+    payload = {'order_id': order.pk, 'removed': True}
+    messages = [(group, payload) for group in groups_for_order(order)]
+    transaction.on_commit(lambda: _send(messages))
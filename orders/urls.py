@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.order_list, name='order_list'),
     path('create/', views.order_create, name='order_create'),
+    path('create/quote/', views.order_price_quote, name='order_price_quote'),
     path('<int:pk>/', views.order_detail, name='order_detail'),
     path('<int:pk>/delete/', views.order_delete, name='order_delete'),
     path('<int:pk>/assign/', views.assign_order, name='assign_order'),
@@ -14,13 +15,19 @@ urlpatterns = [
     path('documents/<int:pk>/update/', views.document_update, name='document_update'),
     path('documents/<int:pk>/delete/', views.document_delete, name='document_delete'),
     path('documents/<int:pk>/export-pdf/', views.document_export_pdf, name='document_export_pdf'),
+    path('documents/<int:pk>/render-pdf/', views.document_render_pdf, name='document_render_pdf'),
+    path('documents/export/', views.documents_export_batch, name='documents_export_batch'),
+    path('pdf-jobs/<str:job_id>/', views.pdf_job_status, name='pdf_job_status'),
+    path('pdf-jobs/<str:job_id>/download/', views.pdf_job_download, name='pdf_job_download'),
     
     # Отчёты
     path('reports/', views.report_form, name='report_form'),
     path('reports/generate/', views.report_generate, name='report_generate'),
     path('reports/export-pdf/', views.report_export_pdf, name='report_export_pdf'),
+    path('reports/cache-stats/', views.report_cache_stats, name='report_cache_stats'),
     
     path('order/<int:pk>/generate-brief/', views.generate_modeler_brief, name='generate_modeler_brief'),
+    path('order/<int:pk>/render-brief/', views.brief_render_pdf, name='brief_render_pdf'),
     path('collection-order/<int:product_id>/', views.collection_order_create, name='collection_order_create'),
     
     path('orders/export-csv/', views.export_orders_csv, name='export_orders_csv')
@@ -1,26 +1,40 @@
 
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import transaction
 from .models import Order, Product, OrderProduct
-from .forms import OrderCreateForm, OrderUpdateForm
+from .forms import OrderCreateForm, OrderUpdateForm, PriceQuoteForm
 from accounts.models import Customer, User
-from accounts.decorators import client_required, manager_required
+from accounts.decorators import aload_user, client_required, manager_required
+from accounts.profile import customer_for
 from .models import Document
 from .forms import DocumentCreateForm, DocumentUpdateForm
 from datetime import datetime
-from .document_generator import generate_invoice_pdf, generate_act_pdf, generate_contract_pdf, generate_receipt_pdf
-from django.http import FileResponse
-from .reports import generate_report_data, generate_report_pdf
+from .document_generator import generate_brief_pdf, brief_filename, document_filename
+from . import pdf_jobs
+from . import pricing
+from . import batch_export
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
+from .analytics import cycle_time_report
+from .reports import generate_period_report, generate_report_pdf
+from .rollup import day_bounds
+from . import report_cache
+from .pagination import akeyset_paginate, parse_page_size
 from datetime import datetime, timedelta
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from .forms import CollectionOrderForm
+from catalog import catalogue
 from accounts.models import Customer  # ← Исправленный импорт
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 import csv
+import zlib
 
 
 # ========================================
@@ -30,91 +44,42 @@ def calculate_order_price(order):
     """
     Рассчитывает estimated_price для заказа
     на основе материала, типа и параметров
+    (тарифы и формула - в orders.pricing)
     """
-    PRICING_CONFIG = {
-        'materials': {
-            'gold_585': 3500,
-            'gold_750': 4200,
-            'silver_925': 45,
-            'platinum': 8500
-        },
-        'product_complexity': {
-            'ring': 1.0,
-            'brooch': 1.3,
-            'bracelet': 1.1,
-            'earrings': 0.9
-        },
-        'labor_cost': 0.35
-    }
-
-    # Проверка наличия необходимых данных
-    if not order.material or not order.product_type:
-        return None
-
-    material_price = PRICING_CONFIG['materials'].get(order.material)
-    if not material_price:
-        return None
-
-    complexity = PRICING_CONFIG['product_complexity'].get(order.product_type, 1.0)
-
-    try:
-        if order.order_type == 'template':
-            # Расчет для шаблонного заказа
-            if order.product_type == 'ring':
-                # Примерный вес по размеру кольца
-                ring_size = float(order.ring_size or 17)
-                weight = max(2, ring_size * 0.4)
-            elif order.product_type == 'brooch':
-                weight = 8
-            elif order.product_type == 'bracelet':
-                weight = 12
-            elif order.product_type == 'earrings':
-                weight = 2
-            else:
-                weight = 3
-
-            # Коэффициент шаблона (упрощенно)
-            coefficient = 1.5
-            base_cost = weight * material_price * coefficient
-
-        elif order.order_type == 'custom':
-            # Расчет для индивидуального заказа
-            weight = float(order.desired_weight or 5)
-            if weight <= 0:
-                return None
-            base_cost = weight * material_price
-        else:
-            return None
+    return pricing.calculate_price(order)
 
-        # Применяем коэффициент сложности и трудозатраты (35%)
-        final_price = base_cost * complexity * (1 + PRICING_CONFIG['labor_cost'])
-        return round(final_price, 2)
 
-    except (ValueError, TypeError):
-        return None
+# Колонки, которые реально выводятся в order_list.html
+ORDER_LIST_FIELDS = (
+    'order_id', 'order_type', 'product_type', 'order_status',
+    'final_price', 'estimated_price', 'budget', 'collection_product_price',
+    'created_at',
+    'customer__customer_id', 'customer__name', 'customer__surname',
+    'user__user_id', 'user__username',
+)
 
 
 @login_required
-def order_list(request):
-    """Список заказов (доступно всем авторизованным)"""
-    if request.user.role == 'client':
-        customer = Customer.objects.filter(user=request.user).first()
-        if customer:
-            orders = Order.objects.filter(customer=customer).order_by('-order_id')
-        else:
-            orders = []
-    elif request.user.role == 'manager':
-        orders = Order.objects.all().order_by('-order_id')
-    else:  # modeler, jeweler
-        orders = Order.objects.filter(user=request.user).order_by('-order_id')
-
-    return render(request, 'orders/order_list.html', {'orders': orders})
+async def order_list(request):
+    """Список заказов (доступно всем авторизованным) с keyset-пагинацией"""
+    user = await aload_user(request)
+    orders = Order.objects.for_user(user)
+    orders = orders.select_related('customer', 'user').only(*ORDER_LIST_FIELDS)
+
+    page_size = parse_page_size(request.GET.get('per_page'))
+    page = await akeyset_paginate(orders, request.GET.get('cursor'), page_size)
+
+    return render(request, 'orders/order_list.html', {
+        'orders': page,
+        'page': page,
+        'page_size': page_size,
+    })
 
 
 @client_required
 def order_create(request):
     """Создание заказа - ТОЛЬКО ДЛЯ КЛИЕНТОВ"""
-    customer = Customer.objects.filter(user=request.user).first()
+    customer = customer_for(request)
     if not customer:
         messages.error(request, 'Профиль клиента не найден. Обратитесь к администратору.')
         return redirect('home')
@@ -146,62 +111,79 @@ def order_create(request):
 
 
 @login_required
-def order_detail(request, pk):
+def order_price_quote(request):
+    """
+    Предполагаемая цена по параметрам формы заказа (JSON). Повторный расчёт
+    для тех же параметров не читает тарифы из БД - берётся из памяти процесса
+    """
+    form = PriceQuoteForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    estimated_price = pricing.quote(**form.cleaned_data)
+    response = JsonResponse({'price': estimated_price})
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
+
+
+@login_required
+async def order_detail(request, pk):
     """Детали заказа - с проверкой прав доступа"""
-    order = get_object_or_404(Order, pk=pk)
+    # Клиент видит только свои заказы, модельер/ювелир - назначенные ему,
+    # менеджер - все. Чужой заказ для пользователя не существует (404)
+    user = await aload_user(request)
+    order = await aget_object_or_404(
+        Order.objects.for_user(user).select_related('customer', 'user'), pk=pk,
+    )
 
-    # ПРОВЕРКА ПРАВ ДОСТУПА
-    if request.user.role == 'client':
-        # Клиент видит только свои заказы
-        if not order.customer or order.customer.user != request.user:
-            messages.error(request, 'У вас нет доступа к этому заказу.')
-            return redirect('order_list')
-
-    elif request.user.role in ['modeler', 'jeweler']:
-        # Модельер/Ювелир видит только назначенные ему заказы
-        if order.user != request.user:
-            messages.error(request, 'Этот заказ не назначен вам.')
-            return redirect('order_list')
-
-    # Менеджер видит все заказы
-
-    # Форма редактирования ТОЛЬКО ДЛЯ МЕНЕДЖЕРА
-    update_form = None
-    if request.user.role == 'manager':
-        if request.method == 'POST':
-            update_form = OrderUpdateForm(request.POST, instance=order)
-            if update_form.is_valid():
-                order = update_form.save(commit=False)
-                
-                # ✅ ЯВНО СОХРАНЯЕМ ВСЕ ПАРАМЕТРЫ ИЗ ФОРМЫ
-                order.ring_size = update_form.cleaned_data.get('ring_size')
-                order.thickness = update_form.cleaned_data.get('thickness')
-                order.width = update_form.cleaned_data.get('width')
-                order.stone_size = update_form.cleaned_data.get('stone_size')
-                order.desired_weight = update_form.cleaned_data.get('desired_weight')
-                
-                # 🔴 ПЕРЕСЧИТЫВАЕМ ЦЕНУ ПРИ ОБНОВЛЕНИИ
-                estimated_price = calculate_order_price(order)
-                if estimated_price:
-                    order.estimated_price = estimated_price
-                # 🔴 НОВОЕ: ПРОВЕРЯЕМ БЫЛА ЛИ ЦЕНА УСТАНОВЛЕНА
-                if order.final_price and order.final_price > 0:
-                    order.price_confirmed = True
-                    messages.success(
-                        request,
-                        f'✅ Цена установлена: {order.final_price:.0f} ₽'
-                    )
-                order.save()
-                messages.success(request, 'Заказ обновлен!')
-                return redirect('order_detail', pk=pk)
-        else:
-            update_form = OrderUpdateForm(instance=order)
+    # Форма редактирования ТОЛЬКО ДЛЯ МЕНЕДЖЕРА (формы, сигналы и
+    # сохранение синхронные - выполняются в потоке)
+    if user.role == 'manager':
+        return await sync_to_async(_manager_order_detail)(request, order)
 
-    order_products = order.order_products.all()
+    return render(request, 'orders/order_detail.html', {
+        'order': order,
+        'order_products': order.order_products.all(),
+        'update_form': None
+    })
+
+
+def _manager_order_detail(request, order):
+    """Детали заказа с формой редактирования для менеджера"""
+    pk = order.pk
+    if request.method == 'POST':
+        update_form = OrderUpdateForm(request.POST, instance=order)
+        if update_form.is_valid():
+            order = update_form.save(commit=False)
+            
+            # ✅ ЯВНО СОХРАНЯЕМ ВСЕ ПАРАМЕТРЫ ИЗ ФОРМЫ
+            order.ring_size = update_form.cleaned_data.get('ring_size')
+            order.thickness = update_form.cleaned_data.get('thickness')
+            order.width = update_form.cleaned_data.get('width')
+            order.stone_size = update_form.cleaned_data.get('stone_size')
+            order.desired_weight = update_form.cleaned_data.get('desired_weight')
+            
+            # 🔴 ПЕРЕСЧИТЫВАЕМ ЦЕНУ ПРИ ОБНОВЛЕНИИ
+            estimated_price = calculate_order_price(order)
+            if estimated_price:
+                order.estimated_price = estimated_price
+            # 🔴 НОВОЕ: ПРОВЕРЯЕМ БЫЛА ЛИ ЦЕНА УСТАНОВЛЕНА
+            if order.final_price and order.final_price > 0:
+                order.price_confirmed = True
+                messages.success(
+                    request,
+                    f'✅ Цена установлена: {order.final_price:.0f} ₽'
+                )
+            order.changed_by_id = request.user.pk  # для журнала изменений
+            order.save()
+            messages.success(request, 'Заказ обновлен!')
+            return redirect('order_detail', pk=pk)
+    else:
+        update_form = OrderUpdateForm(instance=order)
 
     return render(request, 'orders/order_detail.html', {
         'order': order,
-        'order_products': order_products,
+        'order_products': order.order_products.all(),
         'update_form': update_form
     })
 
@@ -209,28 +191,20 @@ def order_detail(request, pk):
 @login_required
 def order_delete(request, pk):
     """Удаление заказа - клиент или менеджер"""
-    order = get_object_or_404(Order, pk=pk)
-
     # ПРОВЕРКА ПРАВ
-    if request.user.role == 'client':
-        # Клиент может удалять ТОЛЬКО свои новые заказы
-        if not order.customer or order.customer.user != request.user:
-            messages.error(request, 'У вас нет прав на удаление этого заказа.')
-            return redirect('order_list')
-
-        if order.order_status != 'new':
-            messages.error(request, 'Можно удалять только новые заказы.')
-            return redirect('order_detail', pk=pk)
-
-    elif request.user.role == 'manager':
-        # Менеджер может удалять любые заказы
-        pass
-
-    else:
+    if request.user.role not in ('client', 'manager'):
         # Модельер/Ювелир не может удалять заказы
         messages.error(request, 'У вас нет прав на удаление заказов.')
         return redirect('order_list')
 
+    # Клиент находит только свои заказы, менеджер - любые
+    order = get_object_or_404(Order.objects.for_user(request.user), pk=pk)
+
+    if request.user.role == 'client' and order.order_status != 'new':
+        # Клиент может удалять ТОЛЬКО новые заказы
+        messages.error(request, 'Можно удалять только новые заказы.')
+        return redirect('order_detail', pk=pk)
+
     if request.method == 'POST':
         order_id = order.order_id
         order.delete()
@@ -251,6 +225,7 @@ def assign_order(request, pk):
             worker = get_object_or_404(User, user_id=worker_id, role__in=['modeler', 'jeweler'])
             order.user = worker
             order.order_status = 'in_work'
+            order.changed_by_id = request.user.pk  # для журнала изменений
             order.save()
             messages.success(request, f'Заказ назначен исполнителю {worker.username}')
         return redirect('order_detail', pk=pk)
@@ -265,13 +240,8 @@ def assign_order(request, pk):
 @login_required
 def document_list(request, order_id):
     """Список документов заказа"""
-    order = get_object_or_404(Order, pk=order_id)
-
-    # Проверка прав доступа
-    if request.user.role == 'client':
-        if not order.customer or order.customer.user != request.user:
-            messages.error(request, 'У вас нет доступа к этому заказу.')
-            return redirect('order_list')
+    # Проверка прав доступа - в том же запросе, что и выборка заказа
+    order = get_object_or_404(Order.objects.for_user(request.user), pk=order_id)
 
     documents = Document.objects.filter(order=order).order_by('-document_date')
 
@@ -289,66 +259,9 @@ def collection_order_create(request, product_id):
         messages.error(request, 'Только клиенты могут оформлять заказы из коллекции.')
         return redirect('collection')
     
-    # Данные товаров из коллекции
-    products = {
-        1: {
-            'id': 1, 
-            'name': 'Étoile', 
-            'category': 'ring',  # ← Английское название для БД
-            'category_display': 'Кольцо',
-            'price': 385000,
-            'materials': 'Платина 950, бриллианты 1.2 ct', 
-            'tagline': 'Где вечность встречается с элегантностью'
-        },
-        2: {
-            'id': 2, 
-            'name': 'Aurora', 
-            'category': 'earring',
-            'category_display': 'Серьги',
-            'price': 520000,
-            'materials': 'Белое золото 750, изумруды, бриллианты', 
-            'tagline': 'Танец изумрудного пламени'
-        },
-        3: {
-            'id': 3, 
-            'name': 'Céleste', 
-            'category': 'necklace',
-            'category_display': 'Колье',
-            'price': 1250000,
-            'materials': 'Белое золото 750, сапфир 15 ct', 
-            'tagline': 'Небесная симфония сапфиров'
-        },
-        4: {
-            'id': 4, 
-            'name': 'Harmonie', 
-            'category': 'bracelet',
-            'category_display': 'Браслет',
-            'price': 245000,
-            'materials': 'Розовое золото 585, бриллианты', 
-            'tagline': 'Ритм изящества'
-        },
-        5: {
-            'id': 5, 
-            'name': 'Lumière', 
-            'category': 'pendant',
-            'category_display': 'Подвеска',
-            'price': 195000,
-            'materials': 'Белое золото 750, бриллиант 0.8 ct', 
-            'tagline': 'Капля света'
-        },
-        6: {
-            'id': 6, 
-            'name': 'Impérial', 
-            'category': 'ring',
-            'category_display': 'Кольцо',
-            'price': 890000,
-            'materials': 'Платина 950, рубин 2.5 ct', 
-            'tagline': 'Царственное великолепие'
-        },
-    }
-    
-    product = products.get(product_id)
-    if not product:
+    # Изделие из каталога коллекции (кэш процесса, без запроса к БД)
+    product = catalogue.get_item(product_id)
+    if product is None:
         messages.error(request, 'Товар не найден')
         return redirect('collection')
     
@@ -357,29 +270,30 @@ def collection_order_create(request, product_id):
         if form.is_valid():
             order = form.save(commit=False)
             
-            # Получаем или создаем Customer для текущего пользователя
-            from accounts.models import Customer
-            customer, created = Customer.objects.get_or_create(
-                user=request.user,
-                defaults={
-                    'first_name': request.user.first_name or 'Клиент',
-                    'last_name': request.user.last_name or '',
-                    'phone': '',
-                    'email': request.user.email or ''
-                }
-            )
+            # Профиль клиента из сессии (CustomerProfileMiddleware); создаём, если его нет
+            customer = customer_for(request)
+            if not customer:
+                customer, created = Customer.objects.get_or_create(
+                    user=request.user,
+                    defaults={
+                        'name': request.user.first_name or 'Клиент',
+                        'surname': request.user.last_name or '',
+                        'phone': '',
+                        'email': request.user.email or ''
+                    }
+                )
             
             # Заполняем основные поля заказа
             order.customer = customer
             order.order_type = 'collection'  # Тип заказа: "Предзаказ"
-            order.product_type = product['category']  # Тип изделия из словаря
+            order.product_type = product.product_type  # Тип изделия из каталога
             
             # Информация о товаре из коллекции
-            order.collection_product_id = product['id']
-            order.collection_product_name = product['name']
-            order.collection_product_price = product['price']
-            order.estimated_price = product['price']
-            order.material = product['materials']
+            order.collection_product_id = product.item_id
+            order.collection_product_name = product.name
+            order.collection_product_price = product.price
+            order.estimated_price = product.price
+            order.material = product.materials_summary
             
             # Размер изделия (если указан)
             ring_size = form.cleaned_data.get('ring_size')
@@ -398,7 +312,7 @@ def collection_order_create(request, product_id):
                 order.save()
                 messages.success(
                     request, 
-                    f'✨ Заказ на "{product["name"]}" успешно оформлен! '
+                    f'✨ Заказ на "{product.name}" успешно оформлен! '
                     f'Наш менеджер свяжется с вами в ближайшее время.'
                 )
                 return redirect('order_detail', pk=order.order_id)
@@ -456,28 +370,23 @@ def document_create(request, order_id):
     })
 
 def document_export_pdf(request, pk):
-    """Экспорт документа в PDF"""
-    document = get_object_or_404(Document, pk=pk)
-    order = document.order
+    """
+    Экспорт документа в PDF.
+    Готовый файл берётся из хранилища по отпечатку документа/заказа/клиента;
+    повторная загрузка неизменённого документа отвечает 304 по If-None-Match.
+    """
+    document = get_object_or_404(Document.objects.select_related('order__customer'), pk=pk)
 
-    # Выбираем генератор по типу документа
-    if document.document_type == 'invoice':
-        pdf_buffer = generate_invoice_pdf(order, document)
-        filename = f"Счёт_{document.document_number}.pdf"
-    elif document.document_type == 'act':
-        pdf_buffer = generate_act_pdf(order, document)
-        filename = f"Акт_{document.document_number}.pdf"
-    elif document.document_type == 'contract':
-        pdf_buffer = generate_contract_pdf(order, document)
-        filename = f"Договор_{document.document_number}.pdf"
-    elif document.document_type == 'contract':
-        pdf_buffer = generate_receipt_pdf(order, document)
-        filename = f"Чек_{document.document_number}.pdf"
-    else:
-        filename = f"Документ_{document.document_number}.pdf"
-        pdf_buffer = generate_invoice_pdf(order, document)
+    job_id = pdf_jobs.document_job_id(document)
+    etag = pdf_jobs.etag(job_id)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
 
-    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
+    response = FileResponse(pdf_jobs.render_now(job_id), as_attachment=True, filename=document_filename(document))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @manager_required
@@ -517,10 +426,17 @@ def document_delete(request, pk):
     })
 
 
+# Сколько последних заказов периода показывать в таблице отчёта
+REPORT_RECENT_ORDERS_LIMIT = 100
+
+
 @manager_required
 def report_form(request):
     """Форма для выбора периода отчёта - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА"""
-    return render(request, 'orders/report_form.html')
+    return render(request, 'orders/report_form.html', {
+        'document_types': Document.DOCUMENT_TYPE_CHOICES,
+        'batch_merge_available': batch_export.merge_available(),
+    })
 
 
 @manager_required
@@ -541,21 +457,29 @@ def report_generate(request):
     # Вычисляем количество дней
     period_days = (end_date - start_date).days + 1
 
-    # Получаем заказы за период
-    orders = Order.objects.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    )
+    # Генерируем данные отчёта по дневной сводке (через кэш отчётов)
+    report_data = report_cache.get_report(start_date, end_date, generate_period_report)
 
-    # Генерируем данные отчёта
-    report_data = generate_report_data(orders)
+    # Сроки выполнения зависят от переходов статусов, а не от дня создания
+    # заказа, поэтому в кэш отчётов не попадают (три запроса по индексам)
+    cycle_report = cycle_time_report(start_date, end_date)
+
+    # В таблицу выводим только последние заказы периода, а не весь queryset
+    period_start, period_end = day_bounds(start_date, end_date)
+    orders = Order.objects.filter(created_at__gte=period_start, created_at__lt=period_end)
+    recent_orders = orders.select_related('customer').only(
+        'order_id', 'product_type', 'order_status', 'final_price', 'price_confirmed',
+        'created_at', 'customer__customer_id', 'customer__name', 'customer__surname',
+    ).order_by('-order_id')[:REPORT_RECENT_ORDERS_LIMIT]
 
     return render(request, 'orders/report_view.html', {
         'start_date': start_date,
         'end_date': end_date,
         'period_days': period_days,
         'report_data': report_data,
-        'orders': orders,
+        'cycle_report': cycle_report,
+        'orders': recent_orders,
+        'recent_orders_limit': REPORT_RECENT_ORDERS_LIMIT,
         'now': datetime.now(),
     })
 
@@ -573,65 +497,247 @@ def report_export_pdf(request):
         messages.error(request, 'Неверный формат дат.')
         return redirect('report_form')
 
-    # Получаем заказы
-    orders = Order.objects.filter(
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date
-    )
-
-    # Генерируем данные
-    report_data = generate_report_data(orders)
+    # Генерируем данные по дневной сводке (тот же кэш, что и для просмотра)
+    report_data = report_cache.get_report(start_date, end_date, generate_period_report)
 
     # Генерируем PDF
-    pdf_buffer = generate_report_pdf(start_date, end_date, report_data)
+    pdf_buffer = generate_report_pdf(
+        start_date, end_date, report_data, cycle_time_report(start_date, end_date),
+    )
 
     filename = f"Отчёт_{start_date.strftime('%d.%m.%Y')}-{end_date.strftime('%d.%m.%Y')}.pdf"
     return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
 
+@manager_required
+def documents_export_batch(request):
+    """
+    Пакетная выгрузка документов за период - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА
+    Параметры: start_date, end_date (ГГГГ-ММ-ДД), document_type, format=zip|pdf
+    """
+    try:
+        start_date = datetime.strptime(request.GET['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.GET['end_date'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        messages.error(request, 'Неверный формат дат.')
+        return redirect('report_form')
+
+    document_type = request.GET.get('document_type') or None
+    if document_type and document_type not in dict(Document.DOCUMENT_TYPE_CHOICES):
+        messages.error(request, 'Неизвестный тип документа.')
+        return redirect('report_form')
+
+    export_format = request.GET.get('format', batch_export.FORMAT_ZIP)
+    if export_format == batch_export.FORMAT_PDF and not batch_export.merge_available():
+        messages.error(request, 'Объединение в один PDF недоступно, выберите ZIP-архив.')
+        return redirect('report_form')
+
+    documents = batch_export.batch_documents(start_date, end_date, document_type)
+    if not documents.exists():
+        messages.info(request, 'За выбранный период документов нет.')
+        return redirect('report_form')
+
+    name = f"Документы_{start_date.strftime('%d.%m.%Y')}-{end_date.strftime('%d.%m.%Y')}"
+    items = batch_export.render_documents(documents.iterator(chunk_size=200))
+
+    if export_format == batch_export.FORMAT_PDF:
+        return FileResponse(batch_export.merged_pdf(items), as_attachment=True, filename=f'{name}.pdf')
+
+    response = StreamingHttpResponse(batch_export.zip_stream(items), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, f'{name}.zip')
+    return response
+
+@manager_required
+def report_cache_stats(request):
+    """Счётчики кэша отчётов для мониторинга - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА"""
+    return JsonResponse(report_cache.cache_stats())
+
 @manager_required
 def generate_modeler_brief(request, pk):
     """
     Генерация ТЗ для модельера - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА
     """
     order = get_object_or_404(Order, pk=pk)
-    
-    # Импортируем функцию генерации
-    from .document_generator import generate_brief_pdf
-    
+
     # Генерируем PDF
     pdf_buffer = generate_brief_pdf(order)
-    
-    # Формируем имя файла
-    filename = f"ТЗ_Заказ_{order.order_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
-    
+
     # Возвращаем PDF для скачивания
-    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
+    return FileResponse(pdf_buffer, as_attachment=True, filename=brief_filename(order))
+
+
+# ========================================
+# ФОНОВАЯ ГЕНЕРАЦИЯ PDF
+# ========================================
+def _can_access_document(user, document):
+    """Менеджер - любой документ, клиент - свой заказ, исполнитель - назначенный"""
+    order = document.order
+    if user.role == 'manager':
+        return True
+    if user.role == 'client':
+        return order.customer is not None and order.customer.user_id == user.pk
+    return order.user_id == user.pk
+
+
+def _pdf_job_response(job_id, status):
+    return JsonResponse({
+        'job_id': job_id,
+        'status': status,
+        'status_url': reverse('pdf_job_status', args=[job_id]),
+        'download_url': reverse('pdf_job_download', args=[job_id]),
+    }, status=200 if status == pdf_jobs.STATUS_READY else 202)
+
+
+def _pdf_job_target(request, job_id):
+    """Проверяет идентификатор задания и права. Возвращает (тип, объект) или None"""
+    parsed = pdf_jobs.parse_job_id(job_id)
+    if parsed is None:
+        return None
+    kind, object_id = parsed
+    if kind == 'brief':
+        if request.user.role != 'manager':
+            return None
+        return kind, Order.objects.filter(pk=object_id).first()
+
+    document = Document.objects.select_related('order__customer').filter(pk=object_id).first()
+    if document is None or not _can_access_document(request.user, document):
+        return None
+    return kind, document
+
+
+@login_required
+def document_render_pdf(request, pk):
+    """Ставит генерацию PDF документа в очередь и сразу отвечает ссылкой для опроса"""
+    document = get_object_or_404(Document.objects.select_related('order__customer'), pk=pk)
+    if not _can_access_document(request.user, document):
+        return JsonResponse({'error': 'Нет доступа к документу'}, status=403)
+
+    job_id = pdf_jobs.document_job_id(document)
+    return _pdf_job_response(job_id, pdf_jobs.submit(job_id))
+
+
+@manager_required
+def brief_render_pdf(request, pk):
+    """Ставит генерацию ТЗ для модельера в очередь - ТОЛЬКО ДЛЯ МЕНЕДЖЕРА"""
+    order = get_object_or_404(Order.objects.select_related('customer'), pk=pk)
+    job_id = pdf_jobs.brief_job_id(order)
+    return _pdf_job_response(job_id, pdf_jobs.submit(job_id))
+
+
+@login_required
+def pdf_job_status(request, job_id):
+    """Статус задания генерации PDF"""
+    if _pdf_job_target(request, job_id) is None:
+        raise Http404
+    return _pdf_job_response(job_id, pdf_jobs.job_status(job_id))
+
+
+@login_required
+def pdf_job_download(request, job_id):
+    """Скачивание готового PDF"""
+    target = _pdf_job_target(request, job_id)
+    if target is None or target[1] is None:
+        raise Http404
+    if pdf_jobs.job_status(job_id) != pdf_jobs.STATUS_READY:
+        return _pdf_job_response(job_id, pdf_jobs.job_status(job_id))
+
+    try:
+        pdf = open(pdf_jobs.result_path(job_id), 'rb')
+    except FileNotFoundError:
+        # Версию успела удалить очистка - клиент запросит PDF заново
+        return _pdf_job_response(job_id, pdf_jobs.job_status(job_id))
+
+    kind, obj = target
+    filename = brief_filename(obj) if kind == 'brief' else document_filename(obj)
+    response = FileResponse(pdf, as_attachment=True, filename=filename)
+    response['ETag'] = pdf_jobs.etag(job_id)
+    return response
+
+
+class Echo:
+    """Псевдо-буфер для csv.writer: возвращает строку вместо записи"""
+
+    def write(self, value):
+        return value
+
+
+# Поля выгрузки в порядке колонок CSV (клиент - через JOIN, без запроса на строку)
+CSV_EXPORT_FIELDS = (
+    'order_id', 'product_type', 'order_type', 'customer__name', 'customer__surname',
+    'order_status', 'budget', 'created_at',
+)
+CSV_EXPORT_CHUNK_SIZE = 2000
+
+
+def _csv_rows(rows):
+    """Генерирует строки CSV из кортежей values_list без загрузки всего результата"""
+    product_types = dict(Order.PRODUCT_TYPE_CHOICES)
+    order_types = dict(Order.ORDER_TYPE_CHOICES)
+    statuses = dict(Order.ORDER_STATUS_CHOICES)
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(['ID', 'Тип изделия', 'Тип заказа', 'Клиент', 'Статус', 'Бюджет', 'Дата создания'])
+
+    for order_id, product_type, order_type, name, surname, status, budget, created_at in rows:
+        yield writer.writerow([
+            order_id,
+            product_types.get(product_type, product_type or ''),
+            order_types.get(order_type, order_type or ''),
+            f'{name or ""} {surname or ""}'.strip(),
+            statuses.get(status, status),
+            budget or '',
+            created_at.strftime('%d.%m.%Y') if created_at else '',
+        ])
+
+
+def _gzip_stream(chunks):
+    """Сжимает поток строк gzip'ом по мере генерации"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
 
 def export_orders_csv(request):
+    """
+    Потоковая выгрузка заказов в CSV.
+    Параметры: start_date, end_date (ГГГГ-ММ-ДД), status, gzip=1
+    """
     if not request.user.is_authenticated:
         return HttpResponse('Unauthorized', status=401)
 
-    # Для менеджера - все заказы, для клиента - только его заказы
-    if request.user.role == 'manager':
-        orders = Order.objects.all()
+    # Для менеджера - все заказы, для клиента - его, для исполнителя - назначенные
+    orders = Order.objects.for_user(request.user)
+
+    # Фильтры
+    try:
+        start_date = request.GET.get('start_date')
+        end_date = request.GET.get('end_date')
+        if start_date:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            orders = orders.filter(created_at__gte=day_bounds(start_date, start_date)[0])
+        if end_date:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            orders = orders.filter(created_at__lt=day_bounds(end_date, end_date)[1])
+    except ValueError:
+        return HttpResponse('Неверный формат дат', status=400)
+
+    status = request.GET.get('status')
+    if status:
+        orders = orders.filter(order_status=status)
+
+    rows = orders.order_by('order_id').values_list(
+        *CSV_EXPORT_FIELDS
+    ).iterator(chunk_size=CSV_EXPORT_CHUNK_SIZE)
+
+    content = _csv_rows(rows)
+    filename = 'orders_export.csv'
+    if request.GET.get('gzip') == '1':
+        response = StreamingHttpResponse(_gzip_stream(content), content_type='application/gzip')
+        filename += '.gz'
     else:
-        orders = Order.objects.filter(customer__user=request.user)
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="orders_export.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Тип изделия', 'Тип заказа', 'Клиент', 'Статус', 'Бюджет', 'Дата создания'])
-
-    for order in orders:
-        writer.writerow([
-            order.order_id,
-            order.get_product_type_display() if hasattr(order, 'get_product_type_display') else order.product_type,
-            order.get_order_type_display() if hasattr(order, 'get_order_type_display') else order.order_type,
-            f'{order.customer.name} {order.customer.surname}',
-            order.get_status_display_ru(),
-            order.budget or '',
-            order.created_at.strftime('%d.%m.%Y'),
-        ])
+        response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
 
-    return response
\ No newline at end of file
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
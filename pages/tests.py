@@ -1,3 +1,28 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+
+class AnonymousPageCacheTests(TestCase):
+    """Публичные страницы: кэш для анонимных посетителей и условный GET"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_headers(self):
+        response = self.client.get(reverse('about'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get(reverse('about'))['ETag']
+        response = self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_contact_page_is_not_cached_whole(self):
+        response = self.client.get(reverse('contact'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
@@ -1,7 +1,16 @@
 from django.shortcuts import render
 
+from jewelry_crm.page_cache import cached_page
+
+PAGE_CACHE_NAMESPACE = 'pages'
+
+
+@cached_page(PAGE_CACHE_NAMESPACE)
 def about_view(request):
     return render(request, 'pages/about.html')
 
+
 def contact_view(request):
-    return render(request, 'pages/contact.html')
\ No newline at end of file
+    # Форма содержит CSRF-токен посетителя, поэтому страница целиком
+    # не кэшируется - статичные блоки кэшируются фрагментами в шаблоне
+    return render(request, 'pages/contact.html')
@@ -11,5 +11,75 @@ DATABASES = {
         'PASSWORD': 'your_password',
         'HOST': 'localhost',
         'PORT': '5434',
+        # Под ASGI (gunicorn -k uvicorn.workers.UvicornWorker) оставьте 0:
+        # async ORM работает через потоки, постоянные соединения в них копятся
+        'CONN_MAX_AGE': 0,
     }
 }
+
+# Кэш (по умолчанию локальная память процесса).
+# Для нескольких воркеров укажите общий бэкенд, например Redis.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Алиас кэша и время жизни (сек) для результатов отчётов
+REPORT_CACHE_ALIAS = 'default'
+REPORT_CACHE_TIMEOUT = 60 * 60
+
+# Фоновая генерация PDF: каталог результатов (общий для всех воркеров) и число потоков
+PDF_RENDER_DIR = '/var/lib/jewelry_crm/pdf'
+PDF_RENDER_WORKERS = 2
+# Через сколько секунд незавершённое задание (воркер перезапущен) ставится заново
+PDF_RENDER_TIMEOUT = 300
+
+# Шрифт с кириллицей для PDF (обычный, жирный). Если не задан,
+# ищутся DejaVu Sans / Liberation Sans / Arial в стандартных каталогах
+# PDF_FONT_PATHS = ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+#                   '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf')
+
+# Пакетная выгрузка документов: число процессов рендеринга (0/1 - без пула)
+BATCH_EXPORT_WORKERS = 2
+
+# Кэш страниц витрины для анонимных посетителей: алиас кэша и время жизни (сек)
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = 10 * 60
+# max-age (сек) публичных страниц для браузеров и CDN
+PAGE_CACHE_MAX_AGE = 60
+
+# Профиль клиента (request.customer) кэшируется в сессии. Добавьте в MIDDLEWARE
+# после 'django.contrib.auth.middleware.AuthenticationMiddleware':
+#     'accounts.middleware.CustomerProfileMiddleware',
+# Алиас кэша с версиями профилей (должен быть общим для всех воркеров)
+PROFILE_CACHE_ALIAS = 'default'
+
+# Алиас кэша с версией тарифов (orders.pricing)
+PRICING_CACHE_ALIAS = 'default'
+
+# Websocket изменений заказов (orders.consumers, /ws/orders/).
+# ASGI-приложение с маршрутами websocket - jewelry_crm.asgi.
+# Для runserver с websocket установите daphne и поставьте 'daphne' первым в INSTALLED_APPS.
+ASGI_APPLICATION = 'jewelry_crm.asgi.application'
+# Слой в памяти процесса - для одного процесса (один ASGI-воркер) и тестов.
+# При нескольких воркерах/серверах нужен общий слой, например channels_redis:
+#     'BACKEND': 'channels_redis.core.RedisChannelLayer',
+#     'CONFIG': {'hosts': [('127.0.0.1', 6379)]},
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
+
+# REST API (jewelry_crm.api, /api/). Добавьте 'rest_framework' в INSTALLED_APPS
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
+# Размер страницы API по умолчанию и наибольший ?page_size=
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 10000
@@ -0,0 +1,71 @@
+/**
+ * JEWEllUX - Изменения заказов без перезагрузки страницы
+ * Подписка на websocket /ws/orders/: статус, цена и исполнитель заказа
+ * обновляются в элементах [data-order-id] с полями [data-live="..."].
+ * При обрыве соединение восстанавливается с нарастающей паузой.
+ */
+
+const ORDER_UPDATES_RETRY_MIN = 1000;
+const ORDER_UPDATES_RETRY_MAX = 30000;
+// Сервер закрыл соединение: нет доступа (сессия истекла, нет профиля клиента)
+const ORDER_UPDATES_FORBIDDEN = 4403;
+
+document.addEventListener('DOMContentLoaded', function() {
+    if (document.querySelector('[data-order-id]') && 'WebSocket' in window) {
+        connectOrderUpdates(ORDER_UPDATES_RETRY_MIN);
+    }
+});
+
+function connectOrderUpdates(retryDelay) {
+    const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${scheme}://${window.location.host}/ws/orders/`);
+
+    socket.addEventListener('open', function() {
+        retryDelay = ORDER_UPDATES_RETRY_MIN;
+    });
+
+    socket.addEventListener('message', function(e) {
+        applyOrderUpdate(JSON.parse(e.data));
+    });
+
+    socket.addEventListener('close', function(e) {
+        if (e.code === ORDER_UPDATES_FORBIDDEN) {
+            return;
+        }
+        setTimeout(() => connectOrderUpdates(Math.min(retryDelay * 2, ORDER_UPDATES_RETRY_MAX)), retryDelay);
+    });
+}
+
+function formatRubles(value) {
+    return `${Math.round(parseFloat(value)).toLocaleString('ru-RU')} ₽`;
+}
+
+function setLive(container, field, text) {
+    container.querySelectorAll(`[data-live="${field}"]`).forEach(element => {
+        element.textContent = text;
+    });
+}
+
+/**
+ * Применяет сообщение об изменении заказа к странице
+ */
+function applyOrderUpdate(order) {
+    document.querySelectorAll(`[data-order-id="${order.order_id}"]`).forEach(container => {
+        if (order.removed) {
+            container.classList.add('order-removed');
+            if (container.tagName === 'TR') {
+                container.remove();
+            }
+            return;
+        }
+
+        container.querySelectorAll('[data-live="status"]').forEach(badge => {
+            badge.className = `status-badge status-${order.status}`;
+            badge.textContent = order.status_display;
+        });
+        if (order.final_price !== null) {
+            setLive(container, 'final_price', formatRubles(order.final_price));
+        }
+        setLive(container, 'assignee', order.assignee || 'Не назначен');
+    });
+}
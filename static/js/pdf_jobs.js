@@ -0,0 +1,58 @@
+/**
+ * JEWEllUX - Фоновая генерация PDF
+ * Ссылки с data-render-url ставят PDF в очередь, опрашивают статус
+ * и начинают скачивание, когда файл готов. Без JS работает обычная ссылка.
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('a[data-render-url]').forEach(link => {
+        link.addEventListener('click', function(e) {
+            e.preventDefault();
+            renderPdf(link);
+        });
+    });
+});
+
+const PDF_POLL_INTERVAL = 1000;
+const PDF_POLL_ATTEMPTS = 60;
+
+/**
+ * Запускает генерацию и ждёт готовности файла
+ */
+async function renderPdf(link) {
+    if (link.classList.contains('is-loading')) {
+        return;
+    }
+    link.classList.add('is-loading');
+
+    try {
+        let job = await fetchJob(link.dataset.renderUrl);
+
+        for (let attempt = 0; job.status === 'pending' && attempt < PDF_POLL_ATTEMPTS; attempt++) {
+            await new Promise(resolve => setTimeout(resolve, PDF_POLL_INTERVAL));
+            job = await fetchJob(job.status_url);
+        }
+
+        if (job.status === 'ready') {
+            window.location.href = job.download_url;
+        } else {
+            // Очередь не справилась - используем синхронную выгрузку
+            window.location.href = link.href;
+        }
+    } catch (error) {
+        window.location.href = link.href;
+    } finally {
+        link.classList.remove('is-loading');
+    }
+}
+
+async function fetchJob(url) {
+    const response = await fetch(url, {
+        headers: {'X-Requested-With': 'XMLHttpRequest'},
+        credentials: 'same-origin',
+    });
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    return response.json();
+}
@@ -0,0 +1,118 @@
+/**
+ * JEWEllUX - Предложенная цена в формах заказа (создание и редактирование менеджером)
+ * Цена запрашивается у сервера (тарифы и формула - те же, что при сохранении
+ * заказа). Запросы откладываются, пока пользователь печатает, устаревшие
+ * отменяются, а ответы для уже встречавшихся параметров берутся из памяти.
+ *
+ * Разметка: элемент с data-quote-url, внутри него [data-quote-value] для цены.
+ *   data-order-type-field - id поля типа заказа (по умолчанию id_order_type)
+ *   data-price-field      - id поля формы, в которое записывается цена (необязательно)
+ */
+
+const PRICE_QUOTE_DELAY = 250;
+
+const priceQuotes = new Map();
+let priceQuoteTimer = null;
+let priceQuoteRequest = null;
+
+function formatPrice(price) {
+    return new Intl.NumberFormat('ru-RU', {
+        style: 'currency',
+        currency: 'RUB',
+        minimumFractionDigits: 0,
+        maximumFractionDigits: 2
+    }).format(price);
+}
+
+function fieldValue(id) {
+    const field = document.getElementById(id);
+    return field ? field.value.trim() : '';
+}
+
+function priceQuoteContainer() {
+    return document.querySelector('[data-quote-url]');
+}
+
+/**
+ * Параметры расчёта из формы или null, если цену пока не рассчитать
+ */
+function priceQuoteParams(container) {
+    const params = new URLSearchParams({
+        order_type: fieldValue(container.dataset.orderTypeField || 'id_order_type'),
+        product_type: fieldValue('id_product_type'),
+        material: fieldValue('id_material'),
+    });
+    if (!params.get('order_type') || !params.get('product_type') || !params.get('material')) {
+        return null;
+    }
+    if (params.get('order_type') === 'template') {
+        params.set('ring_size', fieldValue('id_ring_size'));
+    } else {
+        params.set('desired_weight', fieldValue('id_desired_weight'));
+    }
+    return params;
+}
+
+function showProposedPrice(price) {
+    const container = priceQuoteContainer();
+    if (!container) {
+        return;
+    }
+    const priceValue = container.querySelector('[data-quote-value]');
+    if (priceValue) {
+        priceValue.textContent = price === null ? '—' : formatPrice(price);
+        priceValue.dataset.value = price === null ? '' : price;
+    }
+    const formField = container.dataset.priceField && document.getElementById(container.dataset.priceField);
+    if (formField) {
+        formField.value = price === null ? '' : price;
+    }
+}
+
+async function fetchPriceQuote(url) {
+    if (priceQuoteRequest) {
+        priceQuoteRequest.abort();
+    }
+    priceQuoteRequest = new AbortController();
+
+    try {
+        const response = await fetch(url, {
+            headers: {'Accept': 'application/json'},
+            credentials: 'same-origin',
+            signal: priceQuoteRequest.signal,
+        });
+        // 400 - параметры ещё не заполнены до конца
+        const price = response.ok ? (await response.json()).price : null;
+        if (response.ok || response.status === 400) {
+            priceQuotes.set(url, price);
+        }
+        showProposedPrice(price);
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            showProposedPrice(null);
+        }
+    }
+}
+
+/**
+ * Обновляет предложенную цену (вызывается при изменении полей формы)
+ */
+function updateProposedPrice() {
+    const container = priceQuoteContainer();
+    clearTimeout(priceQuoteTimer);
+    if (!container) {
+        return;
+    }
+    const params = priceQuoteParams(container);
+    if (!params) {
+        showProposedPrice(0);
+        return;
+    }
+
+    const url = `${container.dataset.quoteUrl}?${params}`;
+    if (priceQuotes.has(url)) {
+        showProposedPrice(priceQuotes.get(url));
+        return;
+    }
+    priceQuoteTimer = setTimeout(() => fetchPriceQuote(url), PRICE_QUOTE_DELAY);
+}